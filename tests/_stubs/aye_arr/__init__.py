@@ -0,0 +1,7 @@
+"""
+``aye_arr`` stub for desktop emulation (the badge firmware's IR library).
+
+Only the NEC receiver the quest app uses is provided. There is no IR
+hardware on the desktop; ``NECReceiver.receive`` queues a code as if a
+beacon had sent it, and the next ``decode()`` delivers it.
+"""
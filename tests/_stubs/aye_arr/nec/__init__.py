@@ -0,0 +1,32 @@
+class NECReceiver:
+    """NEC IR receiver on a PIO state machine; codes arrive via ``receive``."""
+
+    def __init__(self, pin, pio=0, sm=0):
+        self.pin = pin
+        self.pio = pio
+        self.sm = sm
+        self.running = False
+        self._descriptors = []
+        self._queue = []
+
+    def bind(self, descriptor):
+        self._descriptors.append(descriptor)
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def receive(self, address, command):
+        """Queue an ``(address, command)`` frame as if a remote had sent it."""
+        self._queue.append((address, command))
+
+    def decode(self):
+        """Deliver queued frames to the bound descriptors."""
+        if not self.running:
+            return
+        queue, self._queue = self._queue, []
+        for address, command in queue:
+            for descriptor in self._descriptors:
+                descriptor.handle(address, command)
@@ -0,0 +1,28 @@
+from typing import ClassVar
+
+
+class RemoteDescriptor:
+    """Maps one remote's NEC commands to button ids.
+
+    Subclasses set ``ADDRESS`` and ``BUTTON_CODES`` (``{button: command}``);
+    ``on_known(button)`` and ``on_unknown(address, command)`` are optional
+    callbacks.
+    """
+
+    NAME = "Remote"
+    ADDRESS = 0
+    BUTTON_CODES: ClassVar[dict[int, int]] = {}
+
+    def __init__(self):
+        self.on_known = None
+        self.on_unknown = None
+
+    def handle(self, address, command):
+        if address == self.ADDRESS:
+            for button, code in self.BUTTON_CODES.items():
+                if code == command:
+                    if self.on_known is not None:
+                        self.on_known(button)
+                    return
+        if self.on_unknown is not None:
+            self.on_unknown(address, command)
@@ -2,89 +2,173 @@
 Test stubs for the 'badgeware' API used by apps so we can run smoke tests
 on desktop Python without hardware or asset files.
 """
+import math
 from types import SimpleNamespace
 
+from . import _brushes, _geometry, _paths, _pixelfont
+from ._brushes import pack_color
+from ._framebuffer import Framebuffer, _span_bounds
+from ._image import PixelData, image_cache
+from ._matrix import Matrix as _Matrix
+
 
 class _Screen:
-    def __init__(self):
-        self.width = 160
-        self.height = 120
+    def __init__(self, width=160, height=120, framebuffer=None):
+        self.width = width
+        self.height = height
         self.brush = None
         self.font = None
-
-    def draw(self, _shape):
-        # no-op for tests
-        return None
+        # supersampling factor for shapes (Image.OFF, Image.X2 or Image.X4)
+        self.antialias = 0
+        # Real RGBA pixels so desktop runs show (and tests can inspect) output
+        self.framebuffer = Framebuffer(width, height) if framebuffer is None else framebuffer
+        self._windows = {}
+
+    def draw(self, shape):
+        if self.brush is None or not isinstance(shape, _Shapes._Shape):
+            return
+        rgba = pack_color(self.brush)
+        fb = self.framebuffer
+        args = shape.args
+        m = shape.transform
+        samples = max(1, self.antialias or 1)
+        if samples == 1 and shape.kind == "rectangle" and (m is None or m.axis_aligned):
+            # aliased axis-aligned rectangles are a plain block fill
+            x, y, w, h = args[:4]
+            if m is not None:
+                (x, y), (x1, y1) = m.transform_points(((x, y), (x + w, y + h)))
+                w, h = x1 - x, y1 - y
+            fb.rectangle(x, y, w, h, rgba)
+        elif samples == 1 and shape.kind == "circle" and (m is None or m.uniform_scale is not None):
+            cx, cy, r = args[:3]
+            if m is not None:
+                cx, cy = m.apply(cx, cy)
+                r *= m.uniform_scale
+            fb.circle(cx, cy, r, rgba)
+        else:
+            scale = 1.0 if m is None else math.sqrt(abs(m.a * m.d - m.b * m.c))
+            points = _geometry.outline(shape.kind, args, scale)
+            if m is not None:
+                points = m.transform_points(points)
+            fb.polygon(points, rgba, samples)
 
     def clear(self):
-        return None
+        if self.brush is not None:
+            self.framebuffer.clear(pack_color(self.brush))
 
-    def text(self, _text: str, _x: int, _y: int):
-        return None
+    def text(self, text: str, x: int, y: int):
+        if self.brush is not None:
+            self.framebuffer.text(str(text), x, y, pack_color(self.brush), self._pixel_font())
 
     def measure_text(self, text: str):
-        # simple fixed-size metrics
-        return (max(0, len(text)) * 6, 10)
-
-    def blit(self, _img, _x: int, _y: int):
-        return None
-
-    def scale_blit(self, _img, _x: int, _y: int, _w: int, _h: int):
-        return None
+        font = self._pixel_font()
+        if font is None:
+            return _pixelfont.measure_builtin(str(text))
+        return font.measure(str(text))
+
+    def _pixel_font(self):
+        # fonts that failed to load render with the built-in fallback font
+        font = self.font
+        return font if isinstance(font, _pixelfont.PixelFont) else None
+
+    def blit(self, img, x: int, y: int):
+        if img.data is not None:
+            self.framebuffer.blit(img.data, x, y, img.alpha)
+        elif self.brush is not None:
+            # placeholder images (asset not found) outline where they would land
+            self.framebuffer.outline(x, y, img.width, img.height, pack_color(self.brush))
+
+    def scale_blit(self, img, x: int, y: int, w: int, h: int):
+        if img.data is None:
+            if self.brush is not None:
+                self.framebuffer.outline(x, y, w, h, pack_color(self.brush))
+            return
+        # negative sizes mirror the image within the same box (x, y stay top-left)
+        x0, x1 = _span_bounds(x, abs(w))
+        y0, y1 = _span_bounds(y, abs(h))
+        if x1 <= x0 or y1 <= y0:
+            return
+        scaled = img.data.scaled(x1 - x0 if w >= 0 else x0 - x1, y1 - y0 if h >= 0 else y0 - y1)
+        self.framebuffer.blit(scaled, x0, y0, img.alpha)
 
     def window(self, _x, _y, _w, _h):
-        # Return a lightweight view with same API
-        view = _Screen()
-        view.width = _w
-        view.height = _h
+        # a screen drawing into a clipped view of this one's pixels (no copy);
+        # one per rectangle, reused while the framebuffer stays the same
+        fb = self.framebuffer.view(_x, _y, _w, _h)
+        view = self._windows.get((_x, _y, _w, _h))
+        if view is None or view.framebuffer is not fb:
+            view = self._windows[(_x, _y, _w, _h)] = _Screen(_w, _h, fb)
+        view.font = self.font
+        view.antialias = self.antialias
         return view
 
-    def load_into(self, _filename: str):
-        # No-op for tests
-        return None
-
-
-def _color(r, g=None, b=None, a=255):
-    # Accept either (r,g,b[,a]) or grayscale style when only 'r' provided
-    if g is None and b is None:
-        g = b = r
-    return (int(r), int(g), int(b), int(a))
+    def load_into(self, filename: str):
+        # Decode straight onto the screen; missing files are ignored in tests
+        try:
+            data = image_cache.load(_paths.resolve(filename))
+        except OSError:
+            return
+        self.framebuffer.blit(data, 0, 0)
 
 
 class _Shapes:
     class _Shape:
-        def __init__(self, *args, **kwargs):
-            self.transform = SimpleNamespace(scale=lambda x, y: self, translate=lambda x, y: self)
+        def __init__(self, kind: str, *args, **kwargs):
+            self.kind = kind
+            self.args = args
+            # a Matrix applied when drawing; None draws the shape as defined
+            self.transform = None
 
     def rectangle(self, *args, **kwargs):
-        return self._Shape()
+        return self._Shape("rectangle", *args)
 
     def rounded_rectangle(self, *args, **kwargs):
-        return self._Shape()
+        return self._Shape("rounded_rectangle", *args)
 
     def circle(self, *args, **kwargs):
-        return self._Shape()
+        return self._Shape("circle", *args)
 
     def pie(self, *args, **kwargs):
-        return self._Shape()
+        return self._Shape("pie", *args)
 
     def squircle(self, *args, **kwargs):
-        return self._Shape()
+        return self._Shape("squircle", *args)
 
     def line(self, *args, **kwargs):
-        return self._Shape()
+        return self._Shape("line", *args)
+
+    def regular_polygon(self, *args, **kwargs):
+        return self._Shape("regular_polygon", *args)
 
 
 class _Image:
-    def __init__(self, width=24, height=24):
+    def __new__(cls, *args, **kwargs):
+        # the firmware's Image(x, y, w, h) is a blank image apps draw into
+        if cls is _Image and len(args) == 4:
+            return _Canvas(*args)
+        return super().__new__(cls)
+
+    def __init__(self, width=24, height=24, data=None):
         self.width = width
         self.height = height
         self.alpha = 255
-    # Provide antialias constant used by some apps
+        # decoded pixels (shared with the image cache); None for placeholders
+        self.data = data
+    # antialias levels (the supersampling factor used by the stub rasterizer)
+    OFF = 0
     X2 = 2
+    X4 = 4
 
     @classmethod
     def load(cls, _path: str):
+        try:
+            data = image_cache.load(_paths.resolve(_path))
+        except OSError:
+            return cls._placeholder(_path)
+        return cls(data.width, data.height, data)
+
+    @classmethod
+    def _placeholder(cls, _path: str):
         # Heuristic sizes for a couple known assets; otherwise default 24x24
         name = _path.lower()
         if "background" in name:
@@ -98,58 +182,96 @@ class _Image:
         return cls()
 
 
+class _Canvas(_Screen):
+    """A blank image drawn into like the screen (sketch's canvas) and blitted.
+
+    ``data`` is an immutable snapshot of the pixels, taken again only after
+    they change, so blitting an unchanged canvas reuses its cached runs.
+    """
+
+    def __init__(self, _x, _y, _w, _h):
+        super().__init__(int(_w), int(_h))
+        self.alpha = 255
+        self._data = None
+
+    @property
+    def data(self) -> PixelData:
+        pixels = self.framebuffer.pixels
+        if self._data is None or self._data.pixels != pixels:
+            self._data = PixelData(self.width, self.height, bytes(pixels))
+        return self._data
+
+
 class _SpriteSheet:
+    """A grid of ``cols`` x ``rows`` equally sized frames in one image.
+
+    Frames are zero-copy views into the decoded sheet, created once and
+    handed out again on every call, so animating costs no allocation.
+    """
+
     def __init__(self, _path: str, _cols: int, _rows: int):
         self._path = _path
         self._cols = _cols
         self._rows = _rows
+        try:
+            self._data = image_cache.load(_paths.resolve(_path))
+        except OSError:
+            self._data = None
+        self._sprites: dict[tuple[int, int], _Image] = {}
+        self._animations: dict[tuple[int, int, int | None], _Animation] = {}
 
     def animation(self, start_x: int = 0, start_y: int = 0, count: int | None = None):
-        """Return a lightweight animation object.
+        """Frames read along the sheet from ``start_x``, ``start_y``.
 
-        Some apps call animation() with (start_x, start_y, count). We only need to
-        support .frame(i) and .count() for smoke tests.
+        ``count`` defaults to the rest of the starting row.
         """
+        key = (start_x, start_y, count)
+        anim = self._animations.get(key)
+        if anim is None:
+            if count is None:
+                count = max(1, self._cols - start_x)
+            first = start_y * self._cols + start_x
+            frames = [self.sprite(*divmod(first + i, self._cols)[::-1]) for i in range(count)]
+            anim = self._animations[key] = _Animation(frames)
+        return anim
 
-        class _Anim:
-            def __init__(self, _count: int | None):
-                # default to 1 if unknown; tests only check type/availability
-                self._count = _count if _count is not None else 1
+    def sprite(self, _x: int, _y: int):
+        img = self._sprites.get((_x, _y))
+        if img is None:
+            data = self._data
+            if data is None:
+                img = _Image(16, 16)
+            else:
+                w, h = data.width // self._cols, data.height // self._rows
+                img = _Image(w, h, data.view(_x * w, _y * h, w, h))
+            self._sprites[(_x, _y)] = img
+        return img
 
-            def frame(self, _i: int):
-                # Return a simple sprite image; size is arbitrary for tests
-                return _Image(16, 16)
 
-            def count(self) -> int:
-                return int(self._count)
+class _Animation:
+    def __init__(self, frames):
+        self._frames = frames
 
-            def draw(self, *args, **kwargs):
-                # Some apps might try to call draw on the animation
-                return None
+    def frame(self, _i) -> _Image:
+        # apps pass float timers (``io.ticks / 100``); indices wrap around
+        return self._frames[int(_i) % len(self._frames)]
 
-        return _Anim(count)
+    def count(self) -> int:
+        return len(self._frames)
 
-    def sprite(self, _x: int, _y: int):
-        # Return a simple image-like object
-        img = _Image(16, 16)
-        return img
+    def draw(self, *args, **kwargs):
+        # Some apps might try to call draw on the animation
+        return None
 
 
 class _PixelFont:
     @classmethod
     def load(cls, _path: str):
-        return SimpleNamespace(path=_path)
-
-
-class _Matrix:
-    def __init__(self):
-        pass
-
-    def translate(self, *_):
-        return self
-
-    def scale(self, *_):
-        return self
+        font = _pixelfont.load(_path)
+        if font is None:
+            # missing font: text falls back to the built-in 5x7 font
+            return SimpleNamespace(path=_path, name=_path, height=_pixelfont.measure_builtin("")[1])
+        return font
 
 
 class _IO:
@@ -170,14 +292,16 @@ class _IO:
         return None
 
 
+def clamp(value, minimum, maximum):
+    return max(minimum, min(maximum, value))
+
+
 def is_dir(_path: str) -> bool:
-    # We can safely say false to avoid filesystem work during tests
-    return False
+    return _paths.vfs.isdir(_path)
 
 
 def file_exists(_path: str) -> bool:
-    # Similarly, pretend files don't exist; apps should handle fallbacks
-    return False
+    return _paths.vfs.exists(_path)
 
 
 def get_battery_level() -> float:
@@ -225,7 +349,7 @@ def is_charging():
 
 # Public API objects
 screen = _Screen()
-brushes = SimpleNamespace(color=_color)
+brushes = SimpleNamespace(color=_brushes.color, xor=_brushes.xor)
 shapes = _Shapes()
 Image = _Image
 SpriteSheet = _SpriteSheet
@@ -0,0 +1,92 @@
+"""
+Brushes for the desktop stub and the lookup tables used to composite them.
+
+``brushes.color`` returns an ``(r, g, b, a)`` tuple and ``brushes.xor`` an
+``XorBrush``; ``pack_color`` turns either into the 4 bytes the framebuffer
+fills with (an ``XorColor`` for XOR brushes).
+
+Compositing a span works a channel at a time on whole byte strings: every
+output channel is a function of the input channel alone (for a fixed brush),
+so it is a 256-entry table applied with ``bytes.translate`` to the strided
+slice ``pixels[start + c:end:4]``. A full-screen translucent overlay is four
+C-level passes instead of a Python loop per pixel.
+"""
+from __future__ import annotations
+
+# distinct brushes remembered before the pack / table caches are reset
+CACHE_SIZE = 1024
+
+_OPAQUE = b"\xff" * 256
+
+
+class XorBrush(tuple):
+    """An ``(r, g, b)`` brush that XORs its colour into the framebuffer."""
+
+    __slots__ = ()
+
+
+class XorColor(bytes):
+    """Packed ``XorBrush``: ``r, g, b, 255`` but composited with XOR."""
+
+    __slots__ = ()
+
+
+def color(r, g=None, b=None, a=255):
+    # Accept either (r,g,b[,a]) or grayscale style when only 'r' provided
+    if g is None and b is None:
+        g = b = r
+    return (int(r), int(g), int(b), int(a))
+
+
+def xor(r, g=None, b=None):
+    if g is None and b is None:
+        g = b = r
+    return XorBrush((int(r), int(g), int(b)))
+
+
+_packed: dict = {}
+
+
+def pack_color(brush) -> bytes:
+    """Convert a brush into 4 clamped RGBA bytes (an ``XorColor`` for XOR)."""
+    key = (type(brush), tuple(brush))
+    packed = _packed.get(key)
+    if packed is not None:
+        return packed
+    r, g, b = brush[0], brush[1], brush[2]
+    a = brush[3] if len(brush) > 3 else 255
+    packed = bytes(max(0, min(255, int(c))) for c in (r, g, b, a))
+    if isinstance(brush, XorBrush):
+        packed = XorColor(packed)
+    if len(_packed) >= CACHE_SIZE:
+        _packed.clear()
+    _packed[key] = packed
+    return packed
+
+
+_tables: dict = {}
+
+
+def channel_tables(rgba: bytes) -> tuple:
+    """Per-channel ``translate`` tables that composite ``rgba`` over a pixel."""
+    key = (type(rgba), rgba)
+    tables = _tables.get(key)
+    if tables is not None:
+        return tables
+    if isinstance(rgba, XorColor):
+        tables = tuple(bytes(v ^ c for v in range(256)) for c in rgba[:3]) + (None,)
+    else:
+        alpha = rgba[3]
+        inv = 255 - alpha
+        tables = tuple(bytes((c * alpha + v * inv) // 255 for v in range(256)) for c in rgba[:3]) + (_OPAQUE,)
+    if len(_tables) >= CACHE_SIZE:
+        _tables.clear()
+    _tables[key] = tables
+    return tables
+
+
+def composite(pixels: bytearray, start: int, end: int, rgba: bytes) -> None:
+    """Blend (or XOR) ``rgba`` into the whole pixels in ``pixels[start:end]``."""
+    for channel, table in enumerate(channel_tables(rgba)):
+        if table is not None:
+            pixels[start + channel:end:4] = pixels[start + channel:end:4].translate(table)
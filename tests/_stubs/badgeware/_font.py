@@ -0,0 +1,71 @@
+"""
+Built-in 5x7 fallback font used by the desktop stub screen.
+
+Glyphs are stored column-major (one byte per column, least significant bit is
+the top row) for printable ASCII. Text is laid out on a fixed 6x10 cell so it
+matches the metrics returned by the stub ``measure_text``.
+"""
+
+GLYPH_WIDTH = 5
+GLYPH_HEIGHT = 7
+ADVANCE = 6
+LINE_HEIGHT = 10
+
+_FIRST = 0x20
+_DATA = bytes.fromhex(
+    "0000000000" "00005f0000" "0007000700" "147f147f14"  # space ! " #
+    "242a7f2a12" "2313086462" "3649552250" "0005030000"  # $ % & '
+    "001c224100" "0041221c00" "082a1c2a08" "08083e0808"  # ( ) * +
+    "0050300000" "0808080808" "0060600000" "2010080402"  # , - . /
+    "3e5149453e" "00427f4000" "4261514946" "2141454b31"  # 0 1 2 3
+    "1814127f10" "2745454539" "3c4a494930" "0171090503"  # 4 5 6 7
+    "3649494936" "064949291e" "0036360000" "0056360000"  # 8 9 : ;
+    "0008142241" "1414141414" "4122140800" "0201510906"  # < = > ?
+    "324979413e" "7e1111117e" "7f49494936" "3e41414122"  # @ A B C
+    "7f4141221c" "7f49494941" "7f09090101" "3e41415132"  # D E F G
+    "7f0808087f" "00417f4100" "2040413f01" "7f08142241"  # H I J K
+    "7f40404040" "7f0204027f" "7f0408107f" "3e4141413e"  # L M N O
+    "7f09090906" "3e4151215e" "7f09192946" "4649494931"  # P Q R S
+    "01017f0101" "3f4040403f" "1f2040201f" "7f2018207f"  # T U V W
+    "6314081463" "0304780403" "6151494543" "00007f4141"  # X Y Z [
+    "0204081020" "41417f0000" "0402010204" "4040404040"  # \ ] ^ _
+    "0001020400" "2054545478" "7f48444438" "3844444420"  # ` a b c
+    "384444487f" "3854545418" "087e090102" "081454543c"  # d e f g
+    "7f08040478" "00447d4000" "2040443d00" "007f102844"  # h i j k
+    "00417f4000" "7c04180478" "7c08040478" "3844444438"  # l m n o
+    "7c14141408" "081414187c" "7c08040408" "4854545420"  # p q r s
+    "043f444020" "3c4040207c" "1c2040201c" "3c4030403c"  # t u v w
+    "4428102844" "0c5050503c" "4464544c44" "0008364100"  # x y z {
+    "00007f0000" "0041360800" "08082a1c08"               # | } ~
+)
+
+_span_cache: dict[str, tuple[tuple[int, int, int], ...]] = {}
+
+
+def glyph_spans(ch: str) -> tuple[tuple[int, int, int], ...]:
+    """Return the horizontal runs ``(dx, dy, length)`` that make up ``ch``.
+
+    Unknown characters render as a hollow box so missing glyphs are visible.
+    """
+    spans = _span_cache.get(ch)
+    if spans is not None:
+        return spans
+    code = ord(ch) - _FIRST
+    if 0 <= code < len(_DATA) // GLYPH_WIDTH:
+        columns = _DATA[code * GLYPH_WIDTH:(code + 1) * GLYPH_WIDTH]
+    else:
+        columns = b"\x7f\x41\x41\x41\x7f"
+    runs = []
+    for dy in range(GLYPH_HEIGHT):
+        dx = 0
+        while dx < GLYPH_WIDTH:
+            if columns[dx] >> dy & 1:
+                start = dx
+                while dx < GLYPH_WIDTH and columns[dx] >> dy & 1:
+                    dx += 1
+                runs.append((start, dy, dx - start))
+            else:
+                dx += 1
+    spans = tuple(runs)
+    _span_cache[ch] = spans
+    return spans
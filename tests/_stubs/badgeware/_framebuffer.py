@@ -0,0 +1,311 @@
+"""
+RGBA framebuffer used by the desktop stub screen.
+
+Pixels live in a single ``bytearray`` (4 bytes per pixel, row-major) so opaque
+spans can be filled with one slice assignment instead of per-pixel Python.
+The desktop emulators present this buffer once per frame as a single image.
+
+``Framebuffer.view`` returns a window onto the same ``bytearray``: its own
+origin and size, the parent's row stride, and a clip rectangle, so drawing
+into ``screen.window(...)`` writes straight into the screen without a copy.
+"""
+from __future__ import annotations
+
+import math
+
+from . import _font
+from ._brushes import XorColor, composite
+
+
+def _span_bounds(start: float, length: float) -> tuple[int, int]:
+    """Pixels whose centres fall inside ``[start, start + length)``."""
+    if length < 0:
+        start, length = start + length, -length
+    return math.ceil(start - 0.5), math.ceil(start + length - 0.5)
+
+
+def _crossings(edges, y: float) -> list[float]:
+    """Sorted x positions where the scanline ``y`` crosses polygon edges."""
+    return sorted(x0 + (y - y0) * slope for y0, y1, x0, slope in edges if y0 <= y < y1)
+
+
+class Framebuffer:
+    """A ``width`` x ``height`` RGBA pixel buffer with clipped fill helpers."""
+
+    def __init__(self, width: int, height: int):
+        self.width = int(width)
+        self.height = int(height)
+        self.pixels = bytearray(self.width * self.height * 4)
+        # top-left corner in the root buffer, bytes per row, byte index of
+        # (0, 0) and the drawable ``(x0, y0, x1, y1)`` in local coordinates
+        self.origin = (0, 0)
+        self.stride = self.width * 4
+        self.offset = 0
+        self.clip = (0, 0, self.width, self.height)
+        self._views: dict[tuple[int, int, int, int], Framebuffer] = {}
+
+    def view(self, x: int, y: int, width: int, height: int) -> Framebuffer:
+        """A ``width`` x ``height`` window at ``x``, ``y`` sharing these pixels.
+
+        Drawing is clipped to both the window and this buffer. Views are
+        cached per rectangle.
+        """
+        key = (int(x), int(y), int(width), int(height))
+        found = self._views.get(key)
+        if found is not None:
+            return found
+        x, y, width, height = key
+        view = object.__new__(Framebuffer)
+        view.width = width
+        view.height = height
+        view.pixels = self.pixels
+        view.origin = (self.origin[0] + x, self.origin[1] + y)
+        view.stride = self.stride
+        view.offset = self.offset + y * self.stride + x * 4
+        cx0, cy0, cx1, cy1 = self.clip
+        view.clip = (max(0, cx0 - x), max(0, cy0 - y), min(width, cx1 - x), min(height, cy1 - y))
+        view._views = {}
+        self._views[key] = view
+        return view
+
+    # --- span primitives -------------------------------------------------
+    def fill_span(self, y: int, x0: int, x1: int, rgba: bytes) -> None:
+        """Fill pixels ``x0 <= x < x1`` on row ``y`` (clipped) with ``rgba``."""
+        cx0, cy0, cx1, cy1 = self.clip
+        if y < cy0 or y >= cy1:
+            return
+        x0 = max(cx0, x0)
+        x1 = min(cx1, x1)
+        if x1 <= x0:
+            return
+        alpha = rgba[3]
+        if alpha == 0:
+            return
+        row = self.offset + y * self.stride
+        start = row + x0 * 4
+        end = row + x1 * 4
+        if alpha == 255 and type(rgba) is not XorColor:
+            self.pixels[start:end] = rgba * (x1 - x0)
+            return
+        # translucent and XOR brushes depend on the existing contents
+        composite(self.pixels, start, end, rgba)
+
+    def fill_rect(self, x0: int, y0: int, x1: int, y1: int, rgba: bytes) -> None:
+        """Fill the half-open rectangle ``[x0, x1) x [y0, y1)`` (clipped)."""
+        cx0, cy0, cx1, cy1 = self.clip
+        y0 = max(cy0, y0)
+        y1 = min(cy1, y1)
+        x0 = max(cx0, x0)
+        x1 = min(cx1, x1)
+        if x1 <= x0 or y1 <= y0:
+            return
+        if (x1 - x0) * 4 == self.stride and rgba[3]:
+            # rows as wide as the whole buffer are one contiguous block
+            start = self.offset + y0 * self.stride + x0 * 4
+            end = start + (y1 - y0) * self.stride
+            if rgba[3] == 255 and type(rgba) is not XorColor:
+                self.pixels[start:end] = rgba * ((x1 - x0) * (y1 - y0))
+            else:
+                composite(self.pixels, start, end, rgba)
+            return
+        for y in range(y0, y1):
+            self.fill_span(y, x0, x1, rgba)
+
+    def clear(self, rgba: bytes) -> None:
+        self.fill_rect(0, 0, self.width, self.height, rgba)
+
+    # --- shapes ----------------------------------------------------------
+    def rectangle(self, x: float, y: float, w: float, h: float, rgba: bytes) -> None:
+        x0, x1 = _span_bounds(x, w)
+        y0, y1 = _span_bounds(y, h)
+        self.fill_rect(x0, y0, x1, y1, rgba)
+
+    def outline(self, x: float, y: float, w: float, h: float, rgba: bytes) -> None:
+        x0, x1 = _span_bounds(x, w)
+        y0, y1 = _span_bounds(y, h)
+        if x1 <= x0 or y1 <= y0:
+            return
+        self.fill_span(y0, x0, x1, rgba)
+        if y1 - 1 > y0:
+            self.fill_span(y1 - 1, x0, x1, rgba)
+        for row in range(y0 + 1, y1 - 1):
+            self.fill_span(row, x0, x0 + 1, rgba)
+            if x1 - 1 > x0:
+                self.fill_span(row, x1 - 1, x1, rgba)
+
+    def circle(self, cx: float, cy: float, r: float, rgba: bytes) -> None:
+        r = abs(r)
+        y0, y1 = _span_bounds(cy - r, 2 * r)
+        for y in range(max(self.clip[1], y0), min(self.clip[3], y1)):
+            dy = y + 0.5 - cy
+            half = r * r - dy * dy
+            if half <= 0:
+                continue
+            half = math.sqrt(half)
+            x0, x1 = _span_bounds(cx - half, 2 * half)
+            self.fill_span(y, x0, x1, rgba)
+
+    def polygon(self, points, rgba: bytes, samples: int = 1) -> None:
+        """Fill a closed polygon (even-odd rule).
+
+        With ``samples`` == 1 pixels are filled when their centre is inside.
+        Otherwise each row is sampled on ``samples`` sub-scanlines, with exact
+        horizontal coverage, and edge pixels are blended by coverage. Fully
+        covered stretches of a row are still filled as one span.
+        """
+        if len(points) < 3:
+            return
+        edges = []
+        for i, (x0, y0) in enumerate(points):
+            x1, y1 = points[i - 1]
+            if y0 != y1:
+                if y0 > y1:
+                    x0, y0, x1, y1 = x1, y1, x0, y0
+                edges.append((y0, y1, x0, (x1 - x0) / (y1 - y0)))
+        if not edges:
+            return
+        if samples <= 1:
+            top, _ = _span_bounds(min(e[0] for e in edges), 0)
+            bottom, _ = _span_bounds(max(e[1] for e in edges), 0)
+            for y in range(max(self.clip[1], top), min(self.clip[3], bottom)):
+                xs = _crossings(edges, y + 0.5)
+                for i in range(0, len(xs) - 1, 2):
+                    x0, x1 = _span_bounds(xs[i], xs[i + 1] - xs[i])
+                    self.fill_span(y, x0, x1, rgba)
+            return
+        left, top, right, bottom = self.clip
+        top = max(top, math.floor(min(e[0] for e in edges)))
+        bottom = min(bottom, math.ceil(max(e[1] for e in edges)))
+        for y in range(top, bottom):
+            full: dict[int, int] = {}
+            partial: dict[int, float] = {}
+            for k in range(samples):
+                xs = _crossings(edges, y + (k + 0.5) / samples)
+                for i in range(0, len(xs) - 1, 2):
+                    xl, xr = max(left, xs[i]), min(right, xs[i + 1])
+                    if xr <= xl:
+                        continue
+                    il, ir = math.floor(xl), math.floor(xr)
+                    if il == ir:
+                        partial[il] = partial.get(il, 0.0) + xr - xl
+                        continue
+                    partial[il] = partial.get(il, 0.0) + il + 1 - xl
+                    if ir > il + 1:
+                        full[il + 1] = full.get(il + 1, 0) + 1
+                        full[ir] = full.get(ir, 0) - 1
+                    if xr > ir:
+                        partial[ir] = partial.get(ir, 0.0) + xr - ir
+            self._fill_coverage(y, full, partial, samples, rgba)
+
+    def _fill_coverage(self, y: int, full: dict, partial: dict, samples: int, rgba: bytes) -> None:
+        # sweep the row's events: spans between events share one coverage
+        stops = sorted(set(full) | set(partial) | {x + 1 for x in partial})
+        count = 0
+        alpha = rgba[3]
+        for i, x in enumerate(stops[:-1]):
+            count += full.get(x, 0)
+            covered = count + partial.get(x, 0.0)
+            if covered <= 0:
+                continue
+            a = round(alpha * min(1.0, covered / samples))
+            end = x + 1 if x in partial else stops[i + 1]
+            if a == alpha or type(rgba) is XorColor:
+                # XOR has no partial coverage: any covered pixel flips
+                self.fill_span(y, x, end, rgba)
+            else:
+                self.fill_span(y, x, end, rgba[:3] + bytes((a,)))
+
+    # --- images ----------------------------------------------------------
+    def blit(self, data, x: float, y: float, alpha: int = 255) -> None:
+        """Composite ``PixelData`` with its top-left corner at ``x``, ``y``.
+
+        Each clipped run of visible source pixels goes through ``blit_span``.
+        """
+        if alpha <= 0:
+            return
+        ox = math.ceil(x - 0.5)
+        oy = math.ceil(y - 0.5)
+        src = data.pixels
+        src_stride = data.stride
+        cx0, cy0, cx1, cy1 = self.clip
+        runs = data.runs
+        for sy in range(max(0, cy0 - oy), min(data.height, cy1 - oy)):
+            src_row = data.offset + sy * src_stride
+            for x0, x1, opaque in runs[sy]:
+                x0 = max(x0, cx0 - ox)
+                x1 = min(x1, cx1 - ox)
+                if x1 > x0:
+                    self.blit_span(oy + sy, ox + x0, ox + x1, src, src_row + x0 * 4, alpha, opaque)
+
+    def blit_span(self, y: int, x0: int, x1: int, src, start: int, alpha: int = 255, opaque: bool = False) -> None:
+        """Draw source pixels from byte ``start`` of ``src`` onto ``x0 <= x < x1`` of row ``y``.
+
+        The span must already be clipped. ``opaque`` spans at full ``alpha``
+        are copied with one slice assignment; others are blended per pixel.
+        """
+        px = self.pixels
+        row = self.offset + y * self.stride
+        if opaque and alpha >= 255:
+            px[row + x0 * 4:row + x1 * 4] = src[start:start + (x1 - x0) * 4]
+            return
+        d = row + x0 * 4
+        for s in range(start, start + (x1 - x0) * 4, 4):
+            a = src[s + 3] * alpha // 255
+            if a:
+                inv = 255 - a
+                px[d] = (src[s] * a + px[d] * inv) // 255
+                px[d + 1] = (src[s + 1] * a + px[d + 1] * inv) // 255
+                px[d + 2] = (src[s + 2] * a + px[d + 2] * inv) // 255
+                px[d + 3] = 255
+            d += 4
+
+    # --- text ------------------------------------------------------------
+    def text(self, message: str, x: float, y: float, rgba: bytes, font=None) -> None:
+        """Render ``message`` at ``x``, ``y`` in ``font`` (a ``.ppf`` font).
+
+        Without a font the built-in 5x7 font is used.
+        """
+        if font is not None:
+            ox = math.ceil(x - 0.5)
+            oy = math.ceil(y - 0.5)
+            for ch in message:
+                if ox >= self.width:
+                    break
+                advance, spans = font.glyph(ch)
+                if ox + font.width > 0:
+                    for dx, dy, length in spans:
+                        self.fill_span(oy + dy, ox + dx, ox + dx + length, rgba)
+                ox += advance
+            return
+        ox = math.ceil(x - 0.5)
+        oy = math.ceil(y - 0.5) + 1
+        for ch in message:
+            if ox >= self.width:
+                break
+            if ox + _font.GLYPH_WIDTH > 0:
+                for dx, dy, length in _font.glyph_spans(ch):
+                    self.fill_span(oy + dy, ox + dx, ox + dx + length, rgba)
+            ox += _font.ADVANCE
+
+    # --- presentation ----------------------------------------------------
+    def rgb_bytes(self, x0: int = 0, y0: int = 0, x1: int | None = None, y1: int | None = None) -> bytes:
+        """Return packed RGB (alpha dropped) for the frame or a sub-rectangle."""
+        x1 = self.width if x1 is None else x1
+        y1 = self.height if y1 is None else y1
+        stride = self.stride
+        base = self.offset
+        if (x1 - x0) * 4 == stride:
+            rgb = self.pixels[base + y0 * stride:base + y1 * stride]
+        else:
+            rgb = bytearray()
+            for y in range(y0, y1):
+                rgb += self.pixels[base + y * stride + x0 * 4:base + y * stride + x1 * 4]
+        del rgb[3::4]
+        return bytes(rgb)
+
+    def to_ppm(self, x0: int = 0, y0: int = 0, x1: int | None = None, y1: int | None = None) -> bytes:
+        """Encode the frame (or a sub-rectangle) as a binary PPM for Tk."""
+        x1 = self.width if x1 is None else x1
+        y1 = self.height if y1 is None else y1
+        header = f"P6 {x1 - x0} {y1 - y0} 255\n".encode()
+        return header + self.rgb_bytes(x0, y0, x1, y1)
@@ -0,0 +1,125 @@
+"""
+Outlines of the stub vector shapes as polygons.
+
+Every ``shapes.*`` primitive is flattened into a list of ``(x, y)`` vertices
+in shape space; ``screen.draw`` transforms them with the shape's ``Matrix``
+and hands them to ``Framebuffer.polygon``. Curves are split finely enough
+that each segment is about a pixel and a half long once drawn, so pass the
+matrix scale as ``scale``.
+
+Angles for ``pie`` follow the badge API: degrees, 0 pointing straight down,
+increasing clockwise.
+"""
+from __future__ import annotations
+
+import math
+
+# target length (in pixels) of one flattened curve segment
+SEGMENT_PX = 1.5
+MAX_SEGMENTS = 256
+
+
+def _segments(radius: float, sweep: float, scale: float) -> int:
+    length = abs(radius * sweep * scale)
+    return max(4, min(MAX_SEGMENTS, math.ceil(length / SEGMENT_PX)))
+
+
+def _arc(cx, cy, rx, ry, start, sweep, scale, points) -> None:
+    # screen-space angles (0 = +x, clockwise on a y-down screen), end included
+    n = _segments(max(rx, ry), sweep, scale)
+    for i in range(n + 1):
+        a = start + sweep * i / n
+        points.append((cx + rx * math.cos(a), cy + ry * math.sin(a)))
+
+
+def rectangle(x, y, w, h, *_, scale=1.0):
+    return [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+
+
+def rounded_rectangle(x, y, w, h, *radii, scale=1.0):
+    if not radii:
+        return rectangle(x, y, w, h)
+    if len(radii) < 4:
+        radii = (radii[0],) * 4
+    if w < 0:
+        x, w = x + w, -w
+    if h < 0:
+        y, h = y + h, -h
+    limit = min(w, h) / 2
+    tl, tr, br, bl = (max(0.0, min(limit, r)) for r in radii[:4])
+    half = math.pi / 2
+    points: list[tuple[float, float]] = []
+    # clockwise from the top-left corner; zero radii collapse to a vertex
+    for cx, cy, r, start in (
+        (x + tl, y + tl, tl, math.pi),
+        (x + w - tr, y + tr, tr, -half),
+        (x + w - br, y + h - br, br, 0.0),
+        (x + bl, y + h - bl, bl, half),
+    ):
+        if r:
+            _arc(cx, cy, r, r, start, half, scale, points)
+        else:
+            points.append((cx, cy))
+    return points
+
+
+def circle(x, y, r, *_, scale=1.0):
+    points: list[tuple[float, float]] = []
+    _arc(x, y, r, r, 0.0, 2 * math.pi, scale, points)
+    points.pop()  # the closing vertex repeats the first
+    return points
+
+
+def squircle(x, y, r, n=4, *_, scale=1.0):
+    # superellipse |dx|^n + |dy|^n = r^n
+    e = 2 / n
+    count = _segments(r, 2 * math.pi, scale)
+    points = []
+    for i in range(count):
+        a = 2 * math.pi * i / count
+        c, s = math.cos(a), math.sin(a)
+        points.append((x + r * math.copysign(abs(c) ** e, c), y + r * math.copysign(abs(s) ** e, s)))
+    return points
+
+
+def pie(x, y, r, start, end, *_, scale=1.0):
+    sweep = math.radians(end - start)
+    if sweep == 0:
+        return []
+    points = [(x, y)]
+    # badge angles point down at 0 and run clockwise: screen angle = 90 + a
+    _arc(x, y, r, r, math.radians(90 + start), sweep, scale, points)
+    return points
+
+
+def line(x1, y1, x2, y2, thickness=1, *_, scale=1.0):
+    dx, dy = x2 - x1, y2 - y1
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return []
+    nx, ny = -dy / length * thickness / 2, dx / length * thickness / 2
+    return [(x1 + nx, y1 + ny), (x2 + nx, y2 + ny), (x2 - nx, y2 - ny), (x1 - nx, y1 - ny)]
+
+
+def regular_polygon(x, y, r, sides, *_, scale=1.0):
+    sides = max(3, int(sides))
+    return [
+        (x + r * math.sin(2 * math.pi * i / sides), y - r * math.cos(2 * math.pi * i / sides))
+        for i in range(sides)
+    ]
+
+
+OUTLINES = {
+    "rectangle": rectangle,
+    "rounded_rectangle": rounded_rectangle,
+    "circle": circle,
+    "squircle": squircle,
+    "pie": pie,
+    "line": line,
+    "regular_polygon": regular_polygon,
+}
+
+
+def outline(kind: str, args, scale: float = 1.0) -> list[tuple[float, float]]:
+    """Polygon vertices of a ``kind`` shape built from ``args``."""
+    return OUTLINES[kind](*args, scale=scale)
@@ -0,0 +1,169 @@
+"""
+Decoded image data and the asset cache behind the stub ``Image.load``.
+
+Apps load the same assets over and over (gallery's ``load_image``, menu's
+``load_page_icons`` on every page flip, monapet's sprite sheets), so decoded
+PNGs are kept in a bounded LRU cache keyed by path and modification time.
+Every ``Image`` loaded from the same file shares one immutable ``PixelData``.
+
+``PixelData.runs`` splits each row into opaque and translucent runs (fully
+transparent pixels are skipped), so blitting a typical cut-out sprite is a
+handful of slice copies per row instead of per-pixel blending.
+
+``PixelData.view`` returns a sub-rectangle that shares the parent's buffer
+(a ``memoryview`` plus byte offset and row stride), which is how sprite
+sheet frames are represented without copying pixels.
+"""
+from __future__ import annotations
+
+import os
+import re
+from collections import OrderedDict
+
+from ._png import decode_png
+
+_OPAQUE = re.compile(rb"\xff+")
+_VISIBLE = re.compile(rb"[\x01-\xff]+")
+
+
+class PixelData:
+    """``width`` x ``height`` RGBA pixels plus cached blit metadata."""
+
+    __slots__ = ("_runs", "_scaled", "height", "offset", "pixels", "stride", "width")
+
+    def __init__(self, width: int, height: int, pixels, offset: int = 0, stride: int | None = None):
+        self.width = int(width)
+        self.height = int(height)
+        self.pixels = pixels
+        # byte position of the top-left pixel and bytes per row in ``pixels``
+        self.offset = offset
+        self.stride = self.width * 4 if stride is None else stride
+        self._runs = None
+        self._scaled: OrderedDict | None = None
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.pixels)
+
+    def row(self, y: int):
+        """Bytes of row ``y`` (a zero-copy slice for views)."""
+        start = self.offset + y * self.stride
+        return self.pixels[start:start + self.width * 4]
+
+    def view(self, x: int, y: int, width: int, height: int) -> PixelData:
+        """A ``width`` x ``height`` window at ``x``, ``y`` sharing this buffer."""
+        pixels = self.pixels if isinstance(self.pixels, memoryview) else memoryview(self.pixels)
+        return PixelData(width, height, pixels, self.offset + y * self.stride + x * 4, self.stride)
+
+    @property
+    def runs(self) -> list[tuple[tuple[int, int, bool], ...]]:
+        """Per row, ``(x0, x1, opaque)`` runs of non-transparent pixels."""
+        if self._runs is not None:
+            return self._runs
+        rows = []
+        for y in range(self.height):
+            row = bytes(self.row(y)[3::4])
+            runs = []
+            for visible in _VISIBLE.finditer(row):
+                start, end = visible.span()
+                pos = start
+                # opaque stretches inside the visible run copy straight through
+                for opaque in _OPAQUE.finditer(row, start, end):
+                    if opaque.start() > pos:
+                        runs.append((pos, opaque.start(), False))
+                    runs.append((opaque.start(), opaque.end(), True))
+                    pos = opaque.end()
+                if pos < end:
+                    runs.append((pos, end, False))
+            rows.append(tuple(runs))
+        self._runs = rows
+        return rows
+
+    def scaled(self, width: int, height: int) -> PixelData:
+        """Nearest-neighbour resize; negative sizes mirror. Results are cached."""
+        key = (width, height)
+        cache = self._scaled
+        if cache is None:
+            cache = self._scaled = OrderedDict()
+        found = cache.get(key)
+        if found is not None:
+            cache.move_to_end(key)
+            return found
+        dw, dh = abs(width), abs(height)
+        xs = [min(self.width - 1, int((i + 0.5) * self.width / dw)) for i in range(dw)]
+        ys = [min(self.height - 1, int((j + 0.5) * self.height / dh)) for j in range(dh)]
+        if width < 0:
+            xs.reverse()
+        if height < 0:
+            ys.reverse()
+        rows = {}
+        out = bytearray()
+        for sy in ys:
+            row = rows.get(sy)
+            if row is None:
+                src = self.row(sy)
+                row = rows[sy] = b"".join([src[sx * 4:sx * 4 + 4] for sx in xs])
+            out += row
+        found = PixelData(dw, dh, bytes(out))
+        cache[key] = found
+        if len(cache) > 4:
+            cache.popitem(last=False)
+        return found
+
+
+class ImageCache:
+    """LRU cache of decoded images keyed by ``(path, mtime)``, bounded in bytes."""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resident_bytes = 0
+        self._entries: OrderedDict[tuple[str, int], PixelData] = OrderedDict()
+
+    def load(self, path: str) -> PixelData:
+        """Decoded pixels for the PNG at ``path`` (a desktop path)."""
+        path = os.path.abspath(path)
+        key = (path, os.stat(path).st_mtime_ns)
+        data = self._entries.get(key)
+        if data is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return data
+        self.misses += 1
+        # an edited file's older decodes can never be hit again
+        for stale in [k for k in self._entries if k[0] == path]:
+            self.resident_bytes -= self._entries.pop(stale).nbytes
+        with open(path, "rb") as f:
+            width, height, pixels = decode_png(f.read())
+        data = PixelData(width, height, bytes(pixels))
+        self._entries[key] = data
+        self.resident_bytes += data.nbytes
+        while self.resident_bytes > self.max_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self.resident_bytes -= old.nbytes
+            self.evictions += 1
+        return data
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.resident_bytes = 0
+
+    def summary(self) -> str:
+        return (
+            f"images={len(self)} hits={self.hits} misses={self.misses} "
+            f"hit_rate={self.hit_rate:.0%} resident={self.resident_bytes / 1024:.0f}KB "
+            f"evictions={self.evictions}"
+        )
+
+
+image_cache = ImageCache()
@@ -0,0 +1,97 @@
+"""
+2x3 affine transforms for stub shapes.
+
+``Matrix`` follows the badge API: every method returns a new matrix equal to
+the current one multiplied (on the right) by the requested transform, so
+``Matrix().translate(x, y).scale(w, h)`` scales a shape first and then moves
+it to ``x``, ``y``. Angles for ``rotate`` are in degrees.
+
+Most matrices apps build are pure translations (one per grid cell or tile
+every frame), so those are flagged and transform points with two additions
+instead of a full multiply. Derived matrices skip ``__init__`` so profiling
+``Matrix()`` still counts only the matrices apps create.
+"""
+from __future__ import annotations
+
+import math
+
+
+class Matrix:
+    """``x' = a*x + c*y + e``, ``y' = b*x + d*y + f``."""
+
+    __slots__ = ("a", "b", "c", "d", "e", "f", "translate_only")
+
+    def __init__(self):
+        self.a, self.b, self.c, self.d, self.e, self.f = 1.0, 0.0, 0.0, 1.0, 0.0, 0.0
+        self.translate_only = True
+
+    @classmethod
+    def _make(cls, a, b, c, d, e, f, translate_only=False) -> Matrix:
+        m = object.__new__(cls)
+        m.a, m.b, m.c, m.d, m.e, m.f = a, b, c, d, e, f
+        m.translate_only = translate_only
+        return m
+
+    def translate(self, x, y) -> Matrix:
+        if self.translate_only:
+            return self._make(1.0, 0.0, 0.0, 1.0, self.e + x, self.f + y, True)
+        return self._make(
+            self.a, self.b, self.c, self.d,
+            self.a * x + self.c * y + self.e,
+            self.b * x + self.d * y + self.f,
+        )
+
+    def scale(self, x, y=None) -> Matrix:
+        y = x if y is None else y
+        return self._make(self.a * x, self.b * x, self.c * y, self.d * y, self.e, self.f)
+
+    def rotate(self, angle) -> Matrix:
+        return self.rotate_radians(math.radians(angle))
+
+    def rotate_radians(self, angle) -> Matrix:
+        cos, sin = math.cos(angle), math.sin(angle)
+        return self._make(
+            self.a * cos + self.c * sin, self.b * cos + self.d * sin,
+            self.c * cos - self.a * sin, self.d * cos - self.b * sin,
+            self.e, self.f,
+        )
+
+    def multiply(self, other: Matrix) -> Matrix:
+        a, b, c, d = self.a, self.b, self.c, self.d
+        return self._make(
+            a * other.a + c * other.b, b * other.a + d * other.b,
+            a * other.c + c * other.d, b * other.c + d * other.d,
+            a * other.e + c * other.f + self.e, b * other.e + d * other.f + self.f,
+            self.translate_only and other.translate_only,
+        )
+
+    @property
+    def axis_aligned(self) -> bool:
+        """True when rectangles stay rectangles (no rotation or shear)."""
+        return self.b == 0 and self.c == 0
+
+    @property
+    def uniform_scale(self) -> float | None:
+        """The scale factor when this is a similarity (circles stay circles)."""
+        if self.a == self.d and self.b == -self.c:
+            return math.hypot(self.a, self.b)
+        if self.a == -self.d and self.b == self.c:
+            # similarity combined with a reflection
+            return math.hypot(self.a, self.b)
+        return None
+
+    def apply(self, x, y) -> tuple[float, float]:
+        if self.translate_only:
+            return x + self.e, y + self.f
+        return self.a * x + self.c * y + self.e, self.b * x + self.d * y + self.f
+
+    def transform_points(self, points) -> list[tuple[float, float]]:
+        """Transform a sequence of ``(x, y)`` vertices in one pass."""
+        e, f = self.e, self.f
+        if self.translate_only:
+            return [(x + e, y + f) for x, y in points]
+        a, b, c, d = self.a, self.b, self.c, self.d
+        return [(a * x + c * y + e, b * x + d * y + f) for x, y in points]
+
+    def __repr__(self) -> str:
+        return f"Matrix({self.a:g}, {self.b:g}, {self.c:g}, {self.d:g}, {self.e:g}, {self.f:g})"
@@ -0,0 +1,168 @@
+"""
+Opt-in SRAM budget for the desktop stub, built on ``tracemalloc``.
+
+The badge has 512 KB of SRAM; desktop runs have gigabytes and never show an
+app buffering a whole HTTP response or decoding every sprite sheet at
+import. ``MemoryBudget`` traces allocations from ``install()`` on (call it
+before importing the app so import-time allocations count) and, per frame:
+
+- ``heap``: bytes still allocated since tracing started
+- ``peak``: the highest that got during the frame
+- ``app``: the part of ``heap`` allocated from the app's own code (any frame
+  of the allocation's traceback inside the app directory, so sprite sheets
+  the stub decodes for it count too)
+- ``sites``: the app lines holding the most memory at the end of the frame
+  (a buffer freed within the frame shows in ``peak`` only)
+
+Snapshots are slow, so sites are only collected for the import and for
+frames that raise the peak high-water mark by at least ``HIGH_WATER_STEP``.
+A frame whose peak goes over the budget raises ``BudgetExceeded``::
+
+    budget = MemoryBudget("badge/apps/hc911").install()
+    app = importlib.import_module("badge.apps.hc911")
+    budget.end_frame("import")
+    update = budget.wrap(app.update)
+    ...
+    print(budget.report())
+    budget.uninstall()
+
+CPython objects are larger than MicroPython's, so small-object heavy apps
+read high; byte buffers and images are close to their device size. Tracing
+slows every allocation, so expect updates to run several times slower.
+"""
+from __future__ import annotations
+
+import os
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+
+# the badge's SRAM
+DEVICE_BUDGET = 512 * 1024
+# traceback depth kept per allocation; deep enough to reach the app's frame
+# from inside the stub (image decoding, text layout)
+TRACE_FRAMES = 25
+# a frame's sites are collected when its peak beats the high-water mark by
+# this fraction, so slow steady growth does not snapshot every frame
+HIGH_WATER_STEP = 1 / 16
+
+
+class BudgetExceeded(MemoryError):
+    """A frame's peak heap went over the device budget."""
+
+
+@dataclass
+class FrameMemory:
+    """Heap use for one frame (or the import), in bytes."""
+
+    label: str
+    heap: int
+    peak: int
+    app: int | None = None
+    # (site, bytes, allocations) for the app lines holding the most memory
+    sites: list[tuple[str, int, int]] = field(default_factory=list)
+
+
+def _kb(size: int) -> str:
+    return f"{size / 1024:.1f}KB"
+
+
+class MemoryBudget:
+    """Per-frame heap peaks and top app allocation sites against a budget."""
+
+    def __init__(self, app_dir, budget: int = DEVICE_BUDGET, top: int = 5):
+        self.app_dir = os.path.abspath(os.fspath(app_dir))
+        self.budget = int(budget)
+        self.top = top
+        self.frames: list[FrameMemory] = []
+        self.high_water = 0
+        self._started_tracing = False
+
+    # --- installation ----------------------------------------------------
+    def install(self) -> MemoryBudget:
+        """Start tracing (if nobody else is) and open the first frame."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+        tracemalloc.reset_peak()
+        return self
+
+    def uninstall(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    # --- frames ----------------------------------------------------------
+    def end_frame(self, label: str | None = None) -> FrameMemory:
+        """Record the frame that just ran and start measuring the next one.
+
+        Raises ``BudgetExceeded`` (after recording) when the frame's peak is
+        over the budget.
+        """
+        heap, peak = tracemalloc.get_traced_memory()
+        frame = FrameMemory(label or f"frame {len(self.frames)}", heap, peak)
+        if peak > self.high_water * (1 + HIGH_WATER_STEP) or peak > self.budget or label is not None:
+            self.high_water = max(self.high_water, peak)
+            frame.app, frame.sites = self._attribute(tracemalloc.take_snapshot())
+        self.frames.append(frame)
+        tracemalloc.reset_peak()
+        if peak > self.budget:
+            raise BudgetExceeded(
+                f"{frame.label}: peak heap {_kb(peak)} is over the {_kb(self.budget)} budget\n"
+                + self._format_sites(frame)
+            )
+        return frame
+
+    def wrap(self, update):
+        """Return ``update`` measured as one frame per call.
+
+        Exceptions from ``update`` propagate as they are; the budget is only
+        checked after calls that return.
+        """
+
+        def budgeted_update():
+            result = update()
+            self.end_frame()
+            return result
+
+        return budgeted_update
+
+    def _attribute(self, snapshot) -> tuple[int, list[tuple[str, int, int]]]:
+        # charge each allocation to the most recent app line in its traceback
+        prefix = self.app_dir + os.sep
+        root = os.path.dirname(self.app_dir)
+        sizes: Counter = Counter()
+        counts: Counter = Counter()
+        for trace in snapshot.traces:
+            for frame in reversed(trace.traceback):
+                if frame.filename.startswith(prefix):
+                    site = f"{os.path.relpath(frame.filename, root)}:{frame.lineno}"
+                    sizes[site] += trace.size
+                    counts[site] += 1
+                    break
+        sites = [(site, size, counts[site]) for site, size in sizes.most_common(self.top)]
+        return sum(sizes.values()), sites
+
+    # --- reporting -------------------------------------------------------
+    @property
+    def peak(self) -> int:
+        return max((frame.peak for frame in self.frames), default=0)
+
+    def _format_sites(self, frame: FrameMemory) -> str:
+        return "\n".join(f"    {_kb(size):>9} {count:>6} allocs  {site}" for site, size, count in frame.sites)
+
+    def report(self) -> str:
+        worst = max(self.frames, key=lambda f: f.peak, default=None)
+        lines = [
+            f"{len(self.frames)} frames, peak heap {_kb(self.peak)} of {_kb(self.budget)} budget"
+            + (f" ({worst.label})" if worst else "")
+        ]
+        for frame in self.frames:
+            if frame.app is None:
+                continue
+            lines.append(
+                f"  {frame.label}: heap {_kb(frame.heap)} peak {_kb(frame.peak)} app {_kb(frame.app)}"
+            )
+            if frame.sites:
+                lines.append(self._format_sites(frame))
+        return "\n".join(lines)
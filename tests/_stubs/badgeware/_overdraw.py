@@ -0,0 +1,315 @@
+"""
+Overdraw and redundant-draw analysis for the desktop stub.
+
+While installed, every screen call (``clear``, ``draw``, ``text``, ``blit``,
+``scale_blit``) is captured as a command in the frame's display list. Every
+span written to the root framebuffer is attributed to the command that
+produced it. At the end of each frame the analyzer reports:
+
+- how many times each pixel was written (the overdraw heatmap)
+- commands that wrote nothing (clipped, zero alpha, no brush): *invisible*
+- commands whose every pixel was later painted over opaquely: *covered*
+- how much of the finished frame is identical to the previous one
+
+Apps with high overdraw, many covered commands or mostly identical frames
+are the ones that would gain most from layer caching or dirty rectangles.
+"""
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass
+
+from ._brushes import XorColor
+from ._framebuffer import Framebuffer
+
+_SCREEN_METHODS = ("clear", "draw", "text", "blit", "scale_blit")
+# stand-in colours for recording image spans: copied or blended over
+_COPIED = bytes((0, 0, 0, 255))
+_BLENDED = bytes((0, 0, 0, 128))
+# heatmap cell size in pixels
+HEATMAP_TILE = 8
+
+
+class _Command:
+    __slots__ = ("op", "pixels", "site")
+
+    def __init__(self, op: str, site: str):
+        self.op = op
+        self.site = site
+        self.pixels = 0
+
+
+@dataclass
+class FrameOverdraw:
+    """Analysis of one frame's display list."""
+
+    commands: int
+    writes: int  # pixel writes, counting overwrites
+    touched: int  # distinct pixels written at least once
+    max_writes: int  # most writes to a single pixel
+    invisible: int
+    covered: int
+    identical: float  # fraction of pixels unchanged from the previous frame
+
+    @property
+    def overdraw(self) -> float:
+        return self.writes / self.touched if self.touched else 0.0
+
+
+def _call_site() -> str:
+    """``file:line (function)`` of the first caller outside the stub package."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_globals.get("__name__", "").startswith(__package__):
+        frame = frame.f_back
+    if frame is None:
+        return "?"
+    path = frame.f_code.co_filename
+    short = os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+    return f"{short}:{frame.f_lineno} ({frame.f_code.co_name})"
+
+
+class OverdrawAnalyzer:
+    """Captures per-frame display lists and measures wasted drawing."""
+
+    def __init__(self, screen=None):
+        if screen is None:
+            screen = importlib.import_module(__package__).screen
+        self.screen = screen
+        self.fb = screen.framebuffer
+        size = self.fb.width * self.fb.height
+        self.frames: list[FrameOverdraw] = []
+        self.total_counts = [0] * size  # writes per pixel over the whole run
+        self.hidden_sites: Counter = Counter()  # (op, site) -> invisible/covered commands
+        self._patches: list[tuple[type, str, object]] = []
+        self._previous: bytes | None = None
+        self._depth = 0
+        self._begin_frame()
+
+    # --- installation ----------------------------------------------------
+    def install(self) -> OverdrawAnalyzer:
+        if self._patches:
+            return self
+        for method in _SCREEN_METHODS:
+            self._patch(type(self.screen), method, self._command_wrapper(method, vars(type(self.screen))[method]))
+        self._patch(Framebuffer, "fill_span", self._span_wrapper(vars(Framebuffer)["fill_span"]))
+        self._patch(Framebuffer, "fill_rect", self._rect_wrapper(vars(Framebuffer)["fill_rect"]))
+        self._patch(Framebuffer, "blit_span", self._blit_wrapper(vars(Framebuffer)["blit_span"]))
+        return self
+
+    def uninstall(self) -> None:
+        for owner, attr, original in reversed(self._patches):
+            setattr(owner, attr, original)
+        self._patches = []
+
+    def _patch(self, owner, attr, replacement) -> None:
+        self._patches.append((owner, attr, vars(owner)[attr]))
+        setattr(owner, attr, replacement)
+
+    def _command_wrapper(self, op: str, fn):
+        name = f"screen.{op}"
+
+        def wrapper(screen, *args, **kwargs):
+            if self._current is not None:  # nested call, already attributed
+                return fn(screen, *args, **kwargs)
+            self._current = command = _Command(name, _call_site())
+            self._commands.append(command)
+            try:
+                return fn(screen, *args, **kwargs)
+            finally:
+                self._current = None
+
+        return wrapper
+
+    def _span_wrapper(self, fn):
+        def fill_span(fb, y, x0, x1, rgba):
+            if fb.pixels is self.fb.pixels and not self._depth:
+                self._record_view(fb, y, x0, x1, rgba)
+            return fn(fb, y, x0, x1, rgba)
+
+        return fill_span
+
+    def _rect_wrapper(self, fn):
+        def fill_rect(fb, x0, y0, x1, y1, rgba):
+            if fb.pixels is not self.fb.pixels or self._depth:
+                return fn(fb, x0, y0, x1, y1, rgba)
+            for y in range(max(0, y0), min(fb.height, y1)):
+                self._record_view(fb, y, x0, x1, rgba)
+            # the rectangle is recorded; don't count its rows twice
+            self._depth += 1
+            try:
+                return fn(fb, x0, y0, x1, y1, rgba)
+            finally:
+                self._depth -= 1
+
+        return fill_rect
+
+    def _blit_wrapper(self, fn):
+        def blit_span(fb, y, x0, x1, src, start, alpha=255, opaque=False):
+            if fb.pixels is self.fb.pixels and not self._depth:
+                self._record_view(fb, y, x0, x1, _COPIED if opaque and alpha >= 255 else _BLENDED)
+            return fn(fb, y, x0, x1, src, start, alpha, opaque)
+
+        return blit_span
+
+    # --- recording -------------------------------------------------------
+    def _begin_frame(self) -> None:
+        size = self.fb.width * self.fb.height
+        self._commands: list[_Command] = []
+        self._current: _Command | None = None
+        self._direct: _Command | None = None
+        self._counts = [0] * size
+        self._owner: list[_Command | None] = [None] * size
+        self._blended: set[_Command] = set()
+
+    def _record_view(self, fb, y: int, x0: int, x1: int, rgba) -> None:
+        if fb is not self.fb:
+            # a screen.window() view: clip locally, then move to screen space
+            cx0, cy0, cx1, cy1 = fb.clip
+            if y < cy0 or y >= cy1:
+                return
+            ox, oy = fb.origin
+            y, x0, x1 = y + oy, max(cx0, x0) + ox, min(cx1, x1) + ox
+        self._record(y, x0, x1, rgba)
+
+    def _record(self, y: int, x0: int, x1: int, rgba) -> None:
+        fb = self.fb
+        if y < 0 or y >= fb.height or rgba[3] == 0:
+            return
+        x0 = max(0, x0)
+        x1 = min(fb.width, x1)
+        if x1 <= x0:
+            return
+        command = self._current
+        if command is None:
+            # drawn straight into the framebuffer, outside any screen call
+            command = self._current_direct()
+        a = y * fb.width + x0
+        b = a + (x1 - x0)
+        counts = self._counts
+        for i in range(a, b):
+            counts[i] += 1
+        owner = self._owner
+        if rgba[3] != 255 or isinstance(rgba, XorColor):
+            # translucent or XOR: whatever is underneath stays (partly) visible
+            self._blended.update(owner[a:b])
+        owner[a:b] = [command] * (b - a)
+        command.pixels += b - a
+
+    def _current_direct(self) -> _Command:
+        if self._direct is None:
+            self._direct = _Command("framebuffer", _call_site())
+            self._commands.append(self._direct)
+        return self._direct
+
+    def end_frame(self) -> FrameOverdraw:
+        """Analyze the display list captured since the previous frame."""
+        counts = self._counts
+        total = self.total_counts
+        for i, c in enumerate(counts):
+            if c:
+                total[i] += c
+        visible = set(self._owner) | self._blended
+        invisible = covered = 0
+        for command in self._commands:
+            if command.pixels == 0:
+                invisible += 1
+            elif command not in visible:
+                covered += 1
+            else:
+                continue
+            self.hidden_sites[(command.op, command.site)] += 1
+        current = bytes(self.fb.pixels)
+        frame = FrameOverdraw(
+            commands=len(self._commands),
+            writes=sum(counts),
+            touched=len(counts) - counts.count(0),
+            max_writes=max(counts, default=0),
+            invisible=invisible,
+            covered=covered,
+            identical=self._identical(current),
+        )
+        self._previous = current
+        self.frames.append(frame)
+        self._begin_frame()
+        return frame
+
+    def _identical(self, current: bytes) -> float:
+        previous = self._previous
+        if previous is None:
+            return 0.0
+        if previous == current:
+            return 1.0
+        prev = memoryview(previous)
+        cur = memoryview(current)
+        same = 0
+        stride = self.fb.width * 4
+        for row in range(0, len(current), stride):
+            if prev[row:row + stride] == cur[row:row + stride]:
+                same += self.fb.width
+                continue
+            for i in range(row, row + stride, 4):
+                if prev[i:i + 4] == cur[i:i + 4]:
+                    same += 1
+        return same / (len(current) // 4)
+
+    def wrap(self, update):
+        """Return ``update`` with each call analyzed as one frame."""
+
+        def analyzed_update():
+            try:
+                return update()
+            finally:
+                self.end_frame()
+
+        return analyzed_update
+
+    # --- reporting -------------------------------------------------------
+    def heatmap(self, tile: int = HEATMAP_TILE) -> list[str]:
+        """Mean writes per pixel per frame, one character per ``tile`` block."""
+        frames = max(1, len(self.frames))
+        width, height = self.fb.width, self.fb.height
+        rows = []
+        for ty in range(0, height, tile):
+            line = []
+            for tx in range(0, width, tile):
+                cells = [
+                    self.total_counts[y * width + x]
+                    for y in range(ty, min(height, ty + tile))
+                    for x in range(tx, min(width, tx + tile))
+                ]
+                mean = sum(cells) / len(cells) / frames
+                line.append("." if mean == 0 else str(round(mean)) if mean < 9.5 else "+")
+            rows.append("".join(line))
+        return rows
+
+    def report(self, top: int = 10) -> str:
+        frames = self.frames
+        if not frames:
+            return "no frames analyzed"
+        n = len(frames)
+        lines = [
+            f"{n} frames analyzed",
+            (
+                f"commands/frame={sum(f.commands for f in frames) / n:.1f} "
+                f"invisible/frame={sum(f.invisible for f in frames) / n:.1f} "
+                f"covered/frame={sum(f.covered for f in frames) / n:.1f}"
+            ),
+            (
+                f"overdraw mean={sum(f.overdraw for f in frames) / n:.2f} writes/pixel "
+                f"max={max(f.max_writes for f in frames)}"
+            ),
+            (
+                f"identical to previous frame: {sum(f.identical == 1.0 for f in frames) / n:.0%} of frames, "
+                f"{sum(f.identical for f in frames[1:]) / max(1, n - 1):.0%} of pixels"
+            ),
+        ]
+        if self.hidden_sites:
+            lines.append("commands drawing invisible or covered content:")
+            for (op, site), count in self.hidden_sites.most_common(top):
+                lines.append(f"  {count:>8}  {op:<18} {site}")
+        lines.append(f"overdraw heatmap (mean writes per pixel, {HEATMAP_TILE}x{HEATMAP_TILE} cells):")
+        lines.extend("  " + row for row in self.heatmap())
+        return "\n".join(lines)
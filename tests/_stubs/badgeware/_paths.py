@@ -0,0 +1,245 @@
+"""
+Virtual badge filesystem for the desktop stub.
+
+On the device ``badge/`` is installed as ``/system`` and apps read and write
+a few files at the root (``/avatar.png``, ``/contrib_data.json``,
+``/secrets.py``). ``VirtualFS`` maps those paths onto the desktop:
+
+- ``/system/apps`` -> ``badge/apps``
+- ``/system/assets`` -> ``$BADGE_ASSETS`` (default ``badge/assets``)
+- ``/system`` -> ``badge``
+- everything else under ``/`` -> a writable overlay directory,
+  ``$BADGE_ROOT`` (default ``<tmp>/universe-badge-root``)
+
+The overlay is checked first for every path and all writes go there, so
+apps can create and replace files (even under ``/system``) without touching
+the repository. Apps ``os.chdir`` into ``/system/apps/<name>``; the virtual
+working directory is kept here (the process never changes directory) and
+relative paths resolve against it. ``install()`` hands this view of ``os``
+and ``open`` to badge code only.
+
+Absolute paths that exist on the host (``/tmp/...``, the repo itself) pass
+through untouched, so tools and tests keep working with real files.
+
+``exists``/``isdir``/``listdir`` results are cached, because menu and dvd
+repeat the same checks every frame; writes made through the VFS (and
+``invalidate()``) drop the cache.
+"""
+from __future__ import annotations
+
+import builtins
+import os
+import posixpath
+import tempfile
+from pathlib import Path
+from types import ModuleType
+
+SYSTEM_ROOT = Path(__file__).resolve().parents[3] / "badge"
+
+_host_open = builtins.open
+_host_listdir = os.listdir
+_WRITE_MODES = set("wax+")
+
+
+class VirtualFS:
+    """Maps badge paths to host paths, with an overlay and a stat cache."""
+
+    def __init__(self, system: Path | str = SYSTEM_ROOT, assets: Path | str | None = None, root: Path | str | None = None):
+        system = Path(system)
+        assets = assets or os.environ.get("BADGE_ASSETS") or system / "assets"
+        root = root or os.environ.get("BADGE_ROOT") or Path(tempfile.gettempdir()) / "universe-badge-root"
+        self.root = Path(root)
+        # longest prefix first
+        self.mounts = [
+            ("/system/apps", Path(system) / "apps"),
+            ("/system/assets", Path(assets)),
+            ("/system", system),
+        ]
+        self.cwd: str | None = None
+        self._host_top = set(_host_listdir("/")) if os.path.isdir("/") else set()
+        self._hosts: dict[str, str] = {}
+        self._stat: dict[str, tuple[bool, bool]] = {}
+        self._listdir: dict[str, list[str]] = {}
+        self._real_import = None
+
+    # --- paths ---------------------------------------------------------
+    def is_virtual(self, path) -> bool:
+        """True when ``path`` names something on the badge, not the host."""
+        path = os.fspath(path)
+        if not path.startswith("/"):
+            return self.cwd is not None
+        top = path[1:].split("/", 1)[0]
+        return top == "system" or top not in self._host_top
+
+    def absolute(self, path) -> str:
+        """The normalized absolute badge path for ``path``."""
+        path = os.fspath(path)
+        if not path.startswith("/"):
+            path = posixpath.join(self.cwd or "/", path)
+        return posixpath.normpath(path).replace("//", "/")
+
+    def resolve(self, path, write: bool = False) -> str:
+        """Host path for ``path``; non-badge paths are returned unchanged."""
+        if not self.is_virtual(path):
+            return os.fspath(path)
+        vpath = self.absolute(path)
+        overlay = self.root / vpath.lstrip("/")
+        if write:
+            return str(overlay)
+        host = self._hosts.get(vpath)
+        if host is None:
+            mounted = self._mounted(vpath)
+            host = str(overlay if mounted is None or overlay.exists() else mounted)
+            self._hosts[vpath] = host
+        return host
+
+    def _mounted(self, vpath: str) -> Path | None:
+        for prefix, target in self.mounts:
+            if vpath == prefix or vpath.startswith(prefix + "/"):
+                return target / vpath[len(prefix) + 1:]
+        return None
+
+    # --- queries (cached) ----------------------------------------------
+    def _lookup(self, path) -> tuple[bool, bool]:
+        if not self.is_virtual(path):
+            # host files change under us (tests, tools); never cache them
+            return os.path.exists(path), os.path.isdir(path)
+        key = self.absolute(path)
+        found = self._stat.get(key)
+        if found is None:
+            host = self.resolve(path)
+            found = self._stat[key] = (os.path.exists(host), os.path.isdir(host))
+        return found
+
+    def exists(self, path) -> bool:
+        return self._lookup(path)[0]
+
+    def isdir(self, path) -> bool:
+        return self._lookup(path)[1]
+
+    def isfile(self, path) -> bool:
+        exists, is_dir = self._lookup(path)
+        return exists and not is_dir
+
+    def listdir(self, path=".") -> list[str]:
+        if not self.is_virtual(path):
+            return _host_listdir(path)
+        vpath = self.absolute(path)
+        found = self._listdir.get(vpath)
+        if found is None:
+            names: set[str] = set()
+            sources = [self.root / vpath.lstrip("/"), self._mounted(vpath)]
+            if vpath == "/":
+                names.add("system")
+            for source in sources:
+                if source is not None and source.is_dir():
+                    names.update(_host_listdir(source))
+            if not names and not any(s is not None and s.is_dir() for s in sources):
+                raise FileNotFoundError(2, "No such file or directory", vpath)
+            found = self._listdir[vpath] = sorted(names)
+        return list(found)
+
+    def invalidate(self) -> None:
+        """Forget cached stat and listdir results."""
+        self._hosts.clear()
+        self._stat.clear()
+        self._listdir.clear()
+
+    # --- working directory ---------------------------------------------
+    def chdir(self, path) -> None:
+        if not self.is_virtual(path):
+            os.chdir(path)
+            self.cwd = None
+            return
+        if not self.isdir(path):
+            raise FileNotFoundError(2, "No such file or directory", os.fspath(path))
+        self.cwd = self.absolute(path)
+
+    def getcwd(self) -> str:
+        return self.cwd if self.cwd is not None else os.getcwd()
+
+    # --- files ---------------------------------------------------------
+    def open(self, file, mode="r", *args, **kwargs):
+        if isinstance(file, int) or not self.is_virtual(file):
+            return _host_open(file, mode, *args, **kwargs)
+        write = bool(_WRITE_MODES & set(mode))
+        host = self.resolve(file, write=write)
+        if write:
+            src = self.resolve(file)
+            os.makedirs(os.path.dirname(host), exist_ok=True)
+            if ("a" in mode or "+" in mode) and src != host and os.path.exists(src):
+                # first update of a mounted file: copy it up into the overlay
+                with _host_open(src, "rb") as s, _host_open(host, "wb") as d:
+                    d.write(s.read())
+            self.invalidate()
+        return _host_open(host, mode, *args, **kwargs)
+
+    def remove(self, path) -> None:
+        if not self.is_virtual(path):
+            os.remove(path)
+            return
+        # only overlay files can be removed; the mounted repo is read-only
+        os.remove(self.resolve(path, write=True))
+        self.invalidate()
+
+    def mkdir(self, path, *args) -> None:
+        if not self.is_virtual(path):
+            os.mkdir(path, *args)
+            return
+        os.makedirs(self.resolve(path, write=True), exist_ok=False)
+        self.invalidate()
+
+    # --- installation --------------------------------------------------
+    def os_module(self) -> ModuleType:
+        """A stand-in ``os`` module whose file functions go through the VFS."""
+        proxy = ModuleType("os")
+        proxy.__dict__.update(vars(os))
+        path = ModuleType("os.path")
+        path.__dict__.update(vars(posixpath))
+        path.exists = self.exists
+        path.isdir = self.isdir
+        path.isfile = self.isfile
+        proxy.path = path
+        proxy.chdir = self.chdir
+        proxy.getcwd = self.getcwd
+        proxy.listdir = self.listdir
+        proxy.remove = self.remove
+        proxy.mkdir = self.mkdir
+        return proxy
+
+    def install(self) -> None:
+        """Give badge code (modules under ``badge/``) the virtual filesystem.
+
+        ``import os`` in those modules binds ``os_module()`` and their
+        ``open`` becomes ``VirtualFS.open``; every other module, including
+        the tools and the test harness, keeps the real ``os`` and working
+        directory.
+        """
+        if self._real_import is not None:
+            return
+        proxy = self.os_module()
+        real_import = self._real_import = builtins.__import__
+        prefix = str(self.mounts[-1][1]) + os.sep
+        vfs_open = self.open
+
+        def _import(name, globals=None, locals=None, fromlist=(), level=0):
+            if globals is not None and str(globals.get("__file__") or "").startswith(prefix):
+                globals.setdefault("open", vfs_open)
+                if name == "os":
+                    return proxy
+            return real_import(name, globals, locals, fromlist, level)
+
+        builtins.__import__ = _import
+
+    def uninstall(self) -> None:
+        if self._real_import is not None:
+            builtins.__import__ = self._real_import
+            self._real_import = None
+
+
+vfs = VirtualFS()
+
+
+def resolve(path: str) -> str:
+    """Return the desktop path for a badge path (``/system/...`` or relative)."""
+    return vfs.resolve(path)
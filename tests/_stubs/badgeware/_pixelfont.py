@@ -0,0 +1,131 @@
+"""
+``.ppf`` pixel fonts for the desktop stub screen.
+
+A ``.ppf`` file is a 46 byte header (``ppf!``, flags, glyph count, glyph
+cell width and height, 32 byte name), a table of ``(codepoint, advance)``
+pairs and then one 1-bit bitmap per glyph: ``height`` rows of
+``ceil(width / 8)`` bytes, most significant bit leftmost.
+
+The bitmaps are kept as one packed atlas; a glyph is decoded into
+horizontal ``(dx, dy, length)`` spans the first time it is drawn, so
+rendering a string is a handful of ``fill_span`` calls per glyph (the same
+shape as the built-in font in ``_font``). ``measure`` results are memoized
+per string because apps measure the same static labels every frame.
+"""
+from __future__ import annotations
+
+import os
+import struct
+
+from . import _font, _paths
+
+MAGIC = b"ppf!"
+_HEADER = struct.Struct(">4sIHHH32s")
+_GLYPH = struct.Struct(">IH")
+# distinct strings remembered per font before the measure cache is reset
+MEASURE_CACHE_SIZE = 1024
+
+
+class PixelFont:
+    """A parsed pixel font: per-glyph advances plus the packed bitmap atlas."""
+
+    def __init__(self, name: str, width: int, height: int, advances: dict[int, int], atlas: bytes, index: dict[int, int]):
+        self.name = name
+        self.width = width
+        self.height = height
+        self._advances = advances
+        self._atlas = atlas
+        self._index = index
+        self._row_bytes = (width + 7) // 8
+        self._spans: dict[str, tuple[int, tuple[tuple[int, int, int], ...]]] = {}
+        self._measured: dict[str, tuple[int, int]] = {}
+        # the fonts store a zero advance for space; use a third of the cell
+        self._space = max(2, width // 3)
+
+    @classmethod
+    def parse(cls, data: bytes) -> PixelFont:
+        if len(data) < _HEADER.size:
+            raise ValueError("truncated ppf header")
+        magic, _flags, count, width, height, name = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not a ppf font")
+        table = _HEADER.size + count * _GLYPH.size
+        glyph_bytes = (width + 7) // 8 * height
+        if len(data) < table + count * glyph_bytes:
+            raise ValueError("truncated ppf glyph data")
+        advances = {}
+        index = {}
+        for i, (codepoint, advance) in enumerate(_GLYPH.iter_unpack(data[_HEADER.size:table])):
+            advances[codepoint] = advance
+            index[codepoint] = i * glyph_bytes
+        name = name.split(b"\0", 1)[0].decode("utf-8", "replace")
+        return cls(name, width, height, advances, bytes(data[table:table + count * glyph_bytes]), index)
+
+    def glyph(self, ch: str) -> tuple[int, tuple[tuple[int, int, int], ...]]:
+        """``(advance, spans)`` for ``ch``; unknown characters use ``?``."""
+        found = self._spans.get(ch)
+        if found is not None:
+            return found
+        code = ord(ch)
+        if code not in self._index:
+            found = self.glyph("?") if ch != "?" and ord("?") in self._index else (self._space, ())
+            self._spans[ch] = found
+            return found
+        advance = self._advances[code] or (self._space if ch == " " else 0)
+        base = self._index[code]
+        row_bytes = self._row_bytes
+        runs = []
+        for dy in range(self.height):
+            start = base + dy * row_bytes
+            bits = int.from_bytes(self._atlas[start:start + row_bytes], "big")
+            top = row_bytes * 8 - 1
+            dx = 0
+            while dx < self.width:
+                if bits >> (top - dx) & 1:
+                    run = dx
+                    while dx < self.width and bits >> (top - dx) & 1:
+                        dx += 1
+                    runs.append((run, dy, dx - run))
+                else:
+                    dx += 1
+        found = (advance, tuple(runs))
+        self._spans[ch] = found
+        return found
+
+    def measure(self, text: str) -> tuple[int, int]:
+        """Width and height of ``text`` in this font (memoized)."""
+        size = self._measured.get(text)
+        if size is None:
+            if len(self._measured) >= MEASURE_CACHE_SIZE:
+                self._measured.clear()
+            size = self._measured[text] = (sum(self.glyph(ch)[0] for ch in text), self.height)
+        return size
+
+
+_loaded: dict[str, PixelFont | None] = {}
+
+
+def load(path: str) -> PixelFont | None:
+    """Parse the font at badge ``path``; ``None`` when it cannot be found.
+
+    Bare or app-relative names (``"nope.ppf"``, ``"assets/fonts/nope.ppf"``)
+    fall back to the bundled ``/system/assets/fonts`` directory.
+    """
+    path = str(path)
+    if path in _loaded:
+        return _loaded[path]
+    font = None
+    for candidate in (_paths.resolve(path), _paths.resolve("/system/assets/fonts/" + os.path.basename(path))):
+        try:
+            with open(candidate, "rb") as f:
+                font = PixelFont.parse(f.read())
+            break
+        except (OSError, ValueError):
+            continue
+    _loaded[path] = font
+    return font
+
+
+def measure_builtin(text: str) -> tuple[int, int]:
+    """Metrics of the built-in fallback font."""
+    return (len(text) * _font.ADVANCE, _font.LINE_HEIGHT)
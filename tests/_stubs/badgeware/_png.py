@@ -0,0 +1,167 @@
+"""
+Minimal PNG codec built on ``zlib`` (no Pillow on the desktop stub).
+
+``decode_png`` handles the non-interlaced formats the badge assets use
+(greyscale, RGB, palette with ``tRNS``, grey+alpha and RGBA at 1-8 bit
+depths, 16-bit reduced to 8) and always returns RGBA bytes. ``encode_png``
+writes 8-bit RGBA images, e.g. golden test frames.
+"""
+from __future__ import annotations
+
+import struct
+import zlib
+
+SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# channels per pixel for each PNG colour type
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def _chunks(data: bytes):
+    if not data.startswith(SIGNATURE):
+        raise ValueError("not a PNG file")
+    pos = len(SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack_from(">I4s", data, pos)
+        body = data[pos + 8:pos + 8 + length]
+        yield kind, body
+        if kind == b"IEND":
+            return
+        pos += 12 + length
+    raise ValueError("PNG file is truncated")
+
+
+def _paeth(a: int, b: int, c: int) -> int:
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _unfilter(raw: bytes, height: int, stride: int, bpp: int) -> bytearray:
+    """Undo the per-row PNG filters; returns the concatenated scanlines."""
+    out = bytearray(height * stride)
+    prev = bytearray(stride)
+    pos = 0
+    for y in range(height):
+        kind = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if kind == 1:  # sub
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif kind == 2:  # up
+            line = bytearray((a + b) & 0xFF for a, b in zip(line, prev, strict=True))
+        elif kind == 3:  # average
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xFF
+        elif kind == 4:  # paeth
+            for i in range(stride):
+                if i >= bpp:
+                    line[i] = (line[i] + _paeth(line[i - bpp], prev[i], prev[i - bpp])) & 0xFF
+                else:
+                    line[i] = (line[i] + prev[i]) & 0xFF
+        elif kind != 0:
+            raise ValueError(f"bad PNG filter type {kind}")
+        out[y * stride:(y + 1) * stride] = line
+        prev = line
+    return out
+
+
+def _unpack_bits(row: bytes, width: int, depth: int) -> bytes:
+    """Expand 1/2/4-bit samples to one byte each."""
+    per_byte = 8 // depth
+    mask = (1 << depth) - 1
+    samples = bytearray(width)
+    for x in range(width):
+        shift = 8 - depth * (x % per_byte + 1)
+        samples[x] = row[x // per_byte] >> shift & mask
+    return bytes(samples)
+
+
+def decode_png(data: bytes) -> tuple[int, int, bytearray]:
+    """Return ``(width, height, rgba)`` for a PNG file's bytes."""
+    header = None
+    palette = b""
+    transparency = b""
+    idat = []
+    for kind, body in _chunks(data):
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif kind == b"PLTE":
+            palette = body
+        elif kind == b"tRNS":
+            transparency = body
+        elif kind == b"IDAT":
+            idat.append(body)
+    if header is None:
+        raise ValueError("PNG has no IHDR chunk")
+    width, height, depth, color_type, _, _, interlace = header
+    if color_type not in _CHANNELS:
+        raise ValueError(f"unsupported PNG colour type {color_type}")
+    if interlace:
+        raise ValueError("interlaced PNGs are not supported")
+    channels = _CHANNELS[color_type]
+    bits = depth * channels
+    stride = (width * bits + 7) // 8
+    rows = _unfilter(zlib.decompress(b"".join(idat)), height, stride, max(1, bits // 8))
+
+    rgba = bytearray(width * height * 4)
+    if depth == 16:
+        # keep the most significant byte of every sample
+        rows = rows[0::2]
+        stride //= 2
+    n = width * height
+    if color_type == 3:
+        # one 256-entry lookup table per channel maps indices with bytes.translate
+        tables = [bytearray(256) for _ in range(4)]
+        for i in range(min(256, len(palette) // 3)):
+            for c in range(3):
+                tables[c][i] = palette[i * 3 + c]
+        tables[3][:] = b"\xff" * 256
+        tables[3][:len(transparency)] = transparency[:256]
+        if depth == 8:
+            indices = bytes(rows)
+        else:
+            indices = b"".join(_unpack_bits(rows[y * stride:(y + 1) * stride], width, depth) for y in range(height))
+        for c in range(4):
+            rgba[c::4] = indices.translate(tables[c])
+        return width, height, rgba
+    if color_type in (0, 4):
+        if depth < 8:
+            scale = 255 // ((1 << depth) - 1)
+            grey = b"".join(_unpack_bits(rows[y * stride:(y + 1) * stride], width, depth) for y in range(height))
+            grey = bytes(v * scale for v in grey)
+        else:
+            grey = bytes(rows[0::channels])
+        rgba[0::4] = grey
+        rgba[1::4] = grey
+        rgba[2::4] = grey
+        rgba[3::4] = bytes(rows[1::2]) if color_type == 4 else b"\xff" * n
+        return width, height, rgba
+    for c in range(channels):
+        rgba[c::4] = rows[c::channels]
+    if color_type == 2:
+        rgba[3::4] = b"\xff" * n
+    return width, height, rgba
+
+
+def _chunk(kind: bytes, body: bytes) -> bytes:
+    return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+
+def encode_png(width: int, height: int, rgba) -> bytes:
+    """Encode 8-bit RGBA pixels (row-major) as a PNG file."""
+    stride = width * 4
+    raw = bytearray()
+    for y in range(height):
+        raw.append(0)  # filter type: none
+        raw += rgba[y * stride:(y + 1) * stride]
+    return b"".join((
+        SIGNATURE,
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+        _chunk(b"IDAT", zlib.compress(bytes(raw), 9)),
+        _chunk(b"IEND", b""),
+    ))
@@ -0,0 +1,141 @@
+"""
+Opt-in draw-call profiler for the desktop stub.
+
+``Profiler.install()`` wraps the stub's drawing API at class level (so screen
+windows and names apps imported with ``from badgeware import ...`` are
+covered too) and counts calls and inclusive time per primitive, per frame.
+``Profiler.wrap(update, app)`` times each ``update()`` so per-app frame-time
+histograms can be printed next to the call counts::
+
+    profiler = Profiler().install()
+    update = profiler.wrap(app.update, "life")
+    ...
+    print(profiler.report())
+    profiler.uninstall()
+"""
+from __future__ import annotations
+
+import importlib
+import time
+from collections import Counter, defaultdict
+
+_SCREEN_METHODS = ("draw", "text", "measure_text", "blit", "scale_blit")
+_SHAPE_METHODS = ("rectangle", "rounded_rectangle", "circle", "pie", "squircle", "line", "regular_polygon")
+
+# upper bounds (ms) of the update() histogram buckets; the last bucket is open
+HISTOGRAM_MS = (1, 2, 4, 8, 16, 33, 66)
+
+
+class Profiler:
+    """Per-frame call counts and timings for the stub drawing primitives."""
+
+    def __init__(self):
+        self.frames: list[Counter] = []  # call counts, one Counter per frame
+        self.total_time: Counter = Counter()  # seconds spent in each primitive
+        self.update_times: dict[str, list[float]] = defaultdict(list)
+        self._frame: Counter = Counter()
+        self._patches: list[tuple[object, str, object]] = []
+
+    # --- installation ----------------------------------------------------
+    def _counted(self, name: str, fn):
+        perf = time.perf_counter
+        totals = self.total_time
+
+        def wrapper(*args, **kwargs):
+            t0 = perf()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._frame[name] += 1
+                totals[name] += perf() - t0
+
+        wrapper.__wrapped__ = fn
+        return wrapper
+
+    def _patch(self, owner, attr: str, name: str) -> None:
+        # plain functions in a class or namespace __dict__ (no bound methods)
+        original = vars(owner)[attr]
+        self._patches.append((owner, attr, original))
+        setattr(owner, attr, self._counted(name, original))
+
+    def install(self) -> Profiler:
+        """Start counting calls into the stub ``badgeware`` module."""
+        if self._patches:
+            return self
+        bw = importlib.import_module(__package__)
+        for method in _SCREEN_METHODS:
+            self._patch(type(bw.screen), method, f"screen.{method}")
+        for method in _SHAPE_METHODS:
+            self._patch(type(bw.shapes), method, f"shapes.{method}")
+        self._patch(bw.brushes, "color", "brushes.color")
+        self._patch(bw.Matrix, "__init__", "Matrix()")
+        return self
+
+    def uninstall(self) -> None:
+        """Restore the original stub functions."""
+        for owner, attr, original in reversed(self._patches):
+            setattr(owner, attr, original)
+        self._patches = []
+
+    # --- frames ----------------------------------------------------------
+    def end_frame(self) -> Counter:
+        """Close the current frame's counts and start a new frame."""
+        frame, self._frame = self._frame, Counter()
+        self.frames.append(frame)
+        return frame
+
+    def wrap(self, update, app: str = "app"):
+        """Return ``update`` timed into ``app``'s histogram, one frame per call."""
+        perf = time.perf_counter
+        times = self.update_times[app]
+
+        def profiled_update():
+            t0 = perf()
+            try:
+                return update()
+            finally:
+                times.append(perf() - t0)
+                self.end_frame()
+
+        return profiled_update
+
+    # --- reporting -------------------------------------------------------
+    def calls(self) -> dict[str, tuple[int, float, int]]:
+        """Return ``{primitive: (total, mean per frame, max per frame)}``."""
+        totals: Counter = Counter()
+        peaks: Counter = Counter()
+        for frame in self.frames:
+            totals.update(frame)
+            for name, count in frame.items():
+                peaks[name] = max(peaks[name], count)
+        n = max(1, len(self.frames))
+        return {name: (totals[name], totals[name] / n, peaks[name]) for name in sorted(totals)}
+
+    def histogram(self, app: str) -> list[tuple[str, int]]:
+        """Bucket ``app``'s update durations by ``HISTOGRAM_MS``."""
+        counts = [0] * (len(HISTOGRAM_MS) + 1)
+        for seconds in self.update_times.get(app, ()):
+            ms = seconds * 1000
+            bucket = 0
+            while bucket < len(HISTOGRAM_MS) and ms >= HISTOGRAM_MS[bucket]:
+                bucket += 1
+            counts[bucket] += 1
+        labels = []
+        low = 0
+        for high in HISTOGRAM_MS:
+            labels.append(f"{low}-{high}ms")
+            low = high
+        labels.append(f">={low}ms")
+        return list(zip(labels, counts, strict=True))
+
+    def report(self) -> str:
+        lines = [f"{len(self.frames)} frames profiled", f"{'primitive':<26}{'calls':>9}{'/frame':>9}{'max':>7}{'ms':>10}"]
+        for name, (total, mean, peak) in self.calls().items():
+            lines.append(f"{name:<26}{total:>9}{mean:>9.1f}{peak:>7}{self.total_time[name] * 1000:>10.2f}")
+        for app, times in self.update_times.items():
+            lines.append(f"update() histogram for {app} ({len(times)} frames):")
+            width = max(1, max((c for _, c in self.histogram(app)), default=1))
+            for label, count in self.histogram(app):
+                bar = "#" * round(40 * count / width)
+                lines.append(f"  {label:>9} {count:>7} {bar}")
+        return "\n".join(lines)
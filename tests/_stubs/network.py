@@ -5,8 +5,17 @@ Provides working network.WLAN and socket implementations that use
 real network connections on the desktop, allowing WiFi and network
 apps to function in the emulator.
 """
+import asyncio
+import base64
+import builtins
+import io
+import json
+import os
 import socket as _real_socket
+import ssl as _real_ssl
 import time
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
 
 # Mock WLAN status codes (from MicroPython)
 STAT_IDLE = 0
@@ -20,6 +29,11 @@ STAT_GOT_IP = 3
 STA_IF = 0
 AP_IF = 1
 
+# SSIDs WLAN.scan() reports; the desktop runners add the one in secrets.py
+visible_ssids = ["Desktop-Network"]
+# seconds a scan takes (the radio sweeps every channel; ~2s on the badge)
+SCAN_SECONDS = 0.0
+
 
 class WLAN:
     """Mock WLAN interface that simulates WiFi connection using desktop network."""
@@ -73,6 +87,21 @@ class WLAN:
             return self._status
         return self._status
     
+    def scan(self):
+        """Networks in range as MicroPython tuples (ssid, bssid, channel, RSSI, security, hidden).
+
+        Takes ``SCAN_SECONDS``; awaited on the emulator loop when one is attached.
+        """
+        if SCAN_SECONDS:
+            _on_loop(lambda: asyncio.sleep(SCAN_SECONDS), lambda: time.sleep(SCAN_SECONDS))
+        ssids = list(visible_ssids)
+        if self._ssid and self._ssid not in ssids:
+            ssids.append(self._ssid)
+        return [
+            (ssid.encode(), bytes([0x00, 0x11, 0x22, 0x33, 0x44, i]), 6, -45 - 5 * i, 3, False)
+            for i, ssid in enumerate(ssids)
+        ]
+
     def ifconfig(self):
         """Return IP configuration."""
         # Return mock but realistic-looking config
@@ -90,14 +119,380 @@ class WLAN:
 
 
 # Export real socket module functions for desktop use
-socket = _real_socket.socket
 AF_INET = _real_socket.AF_INET
 SOCK_STREAM = _real_socket.SOCK_STREAM
 SOCK_DGRAM = _real_socket.SOCK_DGRAM
 
 
+def socket(family=AF_INET, type=SOCK_STREAM, proto=0):
+    """A desktop socket; while a ``Cassette`` is active it records or replays."""
+    if _cassette is not None and type == SOCK_STREAM:
+        return _cassette.socket(family, type, proto)
+    return _real_socket.socket(family, type, proto)
+
+
+# --- asyncio bridge ----------------------------------------------------
+# The asyncio emulator loop (tools/async_loop.py) runs app updates on worker
+# threads. While it is attached, DNS lookups and WLAN scans made from those
+# threads are awaited on the loop: the app waits, rendering does not.
+_loop = None
+
+
+def attach_loop(loop):
+    """Await blocking stub calls from app threads on ``loop`` (None detaches)."""
+    global _loop
+    _loop = loop
+
+
+def _on_loop(make_coroutine, fallback):
+    loop = _loop
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return fallback()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        # called synchronously from a task on the loop: waiting would deadlock
+        return fallback()
+    return asyncio.run_coroutine_threadsafe(make_coroutine(), loop).result()
+
+
+# Hostnames redirected to a local stand-in server (tools/netserver.py):
+# (host, port) -> loopback address the connection really goes to
+_routes = {}
+# certificate to trust for TLS connections to a routed address
+_trusted = {}
+
+
+def route(host, port, address, cafile=None):
+    """Send connections for ``host:port`` to ``address`` instead.
+
+    ``cafile`` is the certificate the stand-in presents, so routed TLS
+    connections verify against it rather than the system store.
+    """
+    address = (address[0], int(address[1]))
+    _routes[(host.lower(), int(port))] = address
+    if cafile is not None:
+        _trusted[address] = str(cafile)
+
+
+def unroute(host=None):
+    """Forget the routes for ``host`` (every route when ``None``)."""
+    for key in [k for k in _routes if host is None or k[0] == host.lower()]:
+        _trusted.pop(_routes.pop(key), None)
+
+
 def getaddrinfo(host, port, family=0, socktype=0, proto=0, flags=0):
     """Wrapper for socket.getaddrinfo that returns MicroPython-compatible format."""
-    results = _real_socket.getaddrinfo(host, port, family, socktype, proto, flags)
+    if _cassette is not None and _cassette.mode == "replay":
+        # replayed connections never leave the process; skip DNS
+        return [(AF_INET, SOCK_STREAM, _real_socket.IPPROTO_TCP, "", (str(host), int(port)))]
+    target = _routes.get((str(host).lower(), int(port)))
+    if target is not None:
+        return [(AF_INET, SOCK_STREAM, _real_socket.IPPROTO_TCP, "", target)]
+    results = _on_loop(
+        lambda: _loop.getaddrinfo(host, port, family=family, type=socktype, proto=proto, flags=flags),
+        lambda: _real_socket.getaddrinfo(host, port, family, socktype, proto, flags),
+    )
     # Return in format compatible with MicroPython: [(family, type, proto, canonname, sockaddr)]
     return results
+
+
+def wrap_socket(sock, server_hostname=None, **kwargs):
+    """MicroPython-style ``ssl.wrap_socket`` that trusts routed stand-ins."""
+    if isinstance(sock, _CassetteSocket):
+        return sock.wrap(server_hostname)
+    try:
+        cafile = _trusted.get(sock.getpeername()[:2])
+    except OSError:
+        cafile = None
+    context = _real_ssl.create_default_context(cafile=cafile)
+    if server_hostname is None:
+        # MicroPython clients often skip SNI; they never check the name
+        context.check_hostname = False
+    return context.wrap_socket(sock, server_hostname=server_hostname)
+
+
+def _module(name, real, **overrides):
+    proxy = ModuleType(name)
+    proxy.__dict__.update(vars(real))
+    proxy.__dict__.update(overrides)
+    return proxy
+
+
+_real_import = None
+
+
+def install():
+    """Give badge code (modules under ``badge/``) the routed network.
+
+    Their ``socket``, ``ssl`` and ``urllib.urequest`` imports resolve through
+    the routes above; every other module keeps the real modules. Routes
+    only take effect once ``route`` is called, so installing is harmless.
+    """
+    global _real_import
+    if _real_import is not None:
+        return
+    import urequest
+    from badgeware._paths import SYSTEM_ROOT
+
+    proxies = {
+        "socket": _module("socket", _real_socket, getaddrinfo=getaddrinfo, socket=socket),
+        "ssl": _module("ssl", _real_ssl, wrap_socket=wrap_socket),
+        "urllib.urequest": urequest,
+    }
+    real_import = _real_import = builtins.__import__
+    prefix = str(SYSTEM_ROOT) + os.sep
+
+    def _import(name, globals=None, locals=None, fromlist=(), level=0):
+        proxy = proxies.get(name) if level == 0 else None
+        if proxy is not None and globals is not None and str(globals.get("__file__") or "").startswith(prefix):
+            if name == "urllib.urequest" and not fromlist:
+                return SimpleNamespace(urequest=proxy)
+            return proxy
+        return real_import(name, globals, locals, fromlist, level)
+
+    builtins.__import__ = _import
+
+
+def uninstall():
+    global _real_import
+    if _real_import is not None:
+        builtins.__import__ = _real_import
+        _real_import = None
+
+
+# --- cassettes ---------------------------------------------------------
+# HTTP exchanges recorded once and replayed byte for byte. A cassette file
+# holds one interaction per request: its Host and request line (headers are
+# left out so tokens never land on disk) and every recv() the client saw,
+# stamped with seconds since connect(). Replay hands back the same recv()
+# boundaries, never merging two, at the recorded pace or at full speed.
+
+class CassetteError(OSError):
+    """A replayed request has no recorded response."""
+
+
+_cassette = None
+
+
+class Cassette:
+    """Record or replay the network for badge code inside a ``with`` block.
+
+    ``mode`` is ``"once"`` (replay ``path`` if it exists, otherwise record
+    it), ``"record"`` or ``"replay"``. ``realtime`` replays with the recorded
+    timing instead of as fast as the client reads.
+    """
+
+    def __init__(self, path, mode="once", realtime=False):
+        if mode not in ("once", "record", "replay"):
+            raise ValueError("unknown cassette mode: " + str(mode))
+        self.path = Path(path)
+        if mode == "once":
+            mode = "replay" if self.path.exists() else "record"
+        self.mode = mode
+        self.realtime = realtime
+        self.interactions = json.loads(self.path.read_text())["interactions"] if mode == "replay" else []
+        self._plays = {}
+
+    def __enter__(self):
+        global _cassette
+        if _cassette is not None:
+            raise RuntimeError("another cassette is already in use")
+        _cassette = self
+        return self
+
+    def __exit__(self, *exc):
+        global _cassette
+        _cassette = None
+        if self.mode == "record":
+            self.save()
+
+    def save(self):
+        # one recv() per line keeps re-recorded cassettes diffable
+        entries = []
+        for item in self.interactions:
+            recv = ",\n    ".join(json.dumps(r) for r in item["recv"])
+            host, request = json.dumps(item["host"]), json.dumps(item["request"])
+            entries.append(f'  {{"host": {host}, "request": {request}, "recv": [\n    {recv}\n  ]}}')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text('{"interactions": [\n' + ",\n".join(entries) + "\n]}\n")
+
+    def socket(self, family, type, proto):
+        if self.mode == "record":
+            return _RecordingSocket(self, _real_socket.socket(family, type, proto))
+        return _ReplaySocket(self)
+
+    def find(self, host, request):
+        """The next recorded interaction for ``request``; the last one repeats."""
+        matches = [i for i in self.interactions if i["host"] == host and i["request"] == request]
+        if not matches:
+            raise CassetteError(f"no recorded response for {request!r} on {host} in {self.path}")
+        played = self._plays.get((host, request), 0)
+        self._plays[(host, request)] = played + 1
+        return matches[min(played, len(matches) - 1)]
+
+
+def _request_head(sent):
+    """``(host, request line)`` once a whole request head has been sent."""
+    end = sent.find(b"\r\n\r\n")
+    if end < 0:
+        return None
+    lines = sent[:end].decode("latin-1").split("\r\n")
+    host = ""
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "host":
+            host = value.strip().split(":", 1)[0].lower()
+    return host, lines[0]
+
+
+class _SocketReader(io.RawIOBase):
+    # lets makefile() readers pull through the cassette socket's recv()
+    def __init__(self, sock):
+        self._sock = sock
+
+    def readable(self):
+        return True
+
+    def readinto(self, buf):
+        data = self._sock.recv(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+
+class _CassetteSocket:
+    def __init__(self, cassette):
+        self._cassette = cassette
+        self._sent = b""
+        self._started = time.perf_counter()
+
+    def connect(self, address):
+        self._started = time.perf_counter()
+
+    def send(self, data):
+        self._sent += bytes(data)
+        return len(data)
+
+    def sendall(self, data):
+        self.send(data)
+
+    def write(self, data):
+        return self.send(data)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            out = b""
+            while chunk := self.recv(4096):
+                out += chunk
+            return out
+        return self.recv(size)
+
+    def readinto(self, buf, nbytes=None):
+        data = self.recv(nbytes or len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+    def makefile(self, mode="rb", *args, **kwargs):
+        return io.BufferedReader(_SocketReader(self))
+
+    def settimeout(self, timeout):
+        pass
+
+    def setblocking(self, flag):
+        pass
+
+    def wrap(self, server_hostname=None):
+        return self
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _RecordingSocket(_CassetteSocket):
+    def __init__(self, cassette, sock):
+        super().__init__(cassette)
+        self._sock = sock
+        self._interaction = None
+
+    def connect(self, address):
+        self._sock.connect(address)
+        super().connect(address)
+
+    def getpeername(self):
+        return self._sock.getpeername()
+
+    def wrap(self, server_hostname=None):
+        self._sock = wrap_socket(self._sock, server_hostname=server_hostname)
+        return self
+
+    def send(self, data):
+        sent = self._sock.send(data)
+        self._sent += bytes(data[:sent])
+        return sent
+
+    def sendall(self, data):
+        self._sock.sendall(data)
+        self._sent += bytes(data)
+
+    def recv(self, bufsize):
+        data = self._sock.recv(bufsize)
+        if self._interaction is None:
+            host, request = _request_head(self._sent) or ("", "")
+            self._interaction = {"host": host, "request": request, "recv": []}
+            self._cassette.interactions.append(self._interaction)
+        offset = round(time.perf_counter() - self._started, 4)
+        self._interaction["recv"].append([offset, base64.b64encode(data).decode("ascii")])
+        return data
+
+    def settimeout(self, timeout):
+        self._sock.settimeout(timeout)
+
+    def setblocking(self, flag):
+        self._sock.setblocking(flag)
+
+    def close(self):
+        self._sock.close()
+
+
+class _ReplaySocket(_CassetteSocket):
+    def __init__(self, cassette):
+        super().__init__(cassette)
+        self._address = None
+        self._segments = None
+        self._pending = b""
+
+    def connect(self, address):
+        self._address = address
+        super().connect(address)
+
+    def getpeername(self):
+        return self._address
+
+    def recv(self, bufsize):
+        if not self._pending:
+            if self._segments is None:
+                head = _request_head(self._sent)
+                if head is None:
+                    raise CassetteError("recv() before a whole request was sent")
+                self._segments = iter(self._cassette.find(*head)["recv"])
+            segment = next(self._segments, None)
+            if segment is None:
+                return b""
+            offset, data = segment
+            if self._cassette.realtime:
+                delay = self._started + offset - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self._pending = base64.b64decode(data)
+            if not self._pending:
+                return b""
+        data, self._pending = self._pending[:bufsize], self._pending[bufsize:]
+        return data
@@ -0,0 +1,64 @@
+"""
+``urllib.urequest`` stub for desktop emulation.
+
+Follows the badge firmware's ``urlopen``: an HTTP/1.0 request over a raw
+socket (TLS for ``https``), the status line and headers consumed, and the
+socket's file object returned positioned at the body so apps can
+``read``/``readinto`` it. Like the firmware it does not follow redirects or
+decode chunked bodies. Connections go through ``network.socket``,
+``network.getaddrinfo`` and ``network.wrap_socket``, so routed stand-in
+servers and cassettes apply.
+"""
+import network
+
+
+def urlopen(url, data=None, method="GET", headers=None):
+    if data is not None and method == "GET":
+        method = "POST"
+    try:
+        proto, _, host, path = url.split("/", 3)
+    except ValueError:
+        proto, _, host = url.split("/", 2)
+        path = ""
+    if proto == "http:":
+        port = 80
+    elif proto == "https:":
+        port = 443
+    else:
+        raise ValueError("Unsupported protocol: " + proto)
+
+    if ":" in host:
+        host, port = host.split(":", 1)
+        port = int(port)
+
+    ai = network.getaddrinfo(host, port, 0, network.SOCK_STREAM)[0]
+    s = network.socket(ai[0], ai[1], ai[2])
+    try:
+        s.connect(ai[-1])
+        if proto == "https:":
+            s = network.wrap_socket(s, server_hostname=host)
+        request = [f"{method} /{path} HTTP/1.0", f"Host: {host}"]
+        for key, value in (headers or {}).items():
+            request.append(f"{key}: {value}")
+        if data:
+            request.append(f"Content-Length: {len(data)}")
+        s.sendall(("\r\n".join(request) + "\r\n\r\n").encode())
+        if data:
+            s.sendall(data)
+
+        f = s.makefile("rb")
+        status = f.readline().split(None, 2)
+        if len(status) < 2:
+            raise OSError("Malformed response")
+        while True:
+            line = f.readline()
+            if not line or line == b"\r\n":
+                break
+            if line.lower().startswith(b"transfer-encoding:") and b"chunked" in line:
+                raise ValueError("Unsupported " + line.decode())
+            if line.lower().startswith(b"location:"):
+                raise OSError("Redirects not yet supported")
+    except Exception:
+        s.close()
+        raise
+    return f
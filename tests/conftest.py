@@ -1,9 +1,11 @@
 import importlib
-import os as _real_os
-import sys
-from types import ModuleType
 import importlib.util
+import sys
+import tempfile
 from pathlib import Path
+from types import ModuleType
+
+import pytest
 
 
 def _install_badgeware_stub():
@@ -17,22 +19,25 @@ def _install_badgeware_stub():
     if str(repo_root) not in sys.path:
         sys.path.insert(0, str(repo_root))
 
+    # The desktop tools (headless runner, loaders, servers) are tested directly
+    tools_dir = repo_root / "tools"
+    if str(tools_dir) not in sys.path:
+        sys.path.insert(0, str(tools_dir))
+
 
-def _install_os_chdir_noop():
-    # Create a proxy module for os that no-ops chdir to avoid FileNotFoundError
+def _install_virtual_fs():
+    # Route the apps' os/open calls through the stub's virtual /system
+    # filesystem, with a throwaway overlay for files they write
     if getattr(sys, "_badge_tests_os_stub", None):
         return
-    proxy = ModuleType("os")
-    # Copy attributes from real os
-    for name in dir(_real_os):
-        setattr(proxy, name, getattr(_real_os, name))
+    import network
+    from badgeware._paths import vfs
 
-    # Override chdir to noop
-    def _noop_chdir(_path):
-        return None
+    # badge code's socket/ssl imports resolve through network.route
+    network.install()
 
-    proxy.chdir = _noop_chdir  # type: ignore[attr-defined]
-    sys.modules["os"] = proxy
+    vfs.root = Path(tempfile.mkdtemp(prefix="badge-root-"))
+    vfs.install()
     sys._badge_tests_os_stub = True  # type: ignore[attr-defined]
 
 
@@ -81,16 +86,37 @@ def _preload_sibling_modules(app_name: str):
             # If a sibling fails to import it's fine; the top-level import may not need it
 
 
-def pytest_sessionstart(session):  # noqa: D401
+@pytest.fixture
+def standin_server():
+    """A local stand-in for the apps' web services, with their hostnames routed to it.
+
+    Shape the network per test with ``standin_server.shape(latency=...)``.
+    """
+    import network
+    from netserver import StandInServer
+
+    server = StandInServer().start()
+    for host in server.hosts:
+        network.route(host, 80, server.http_address)
+        network.route(host, 443, server.https_address, cafile=server.certfile)
+    try:
+        yield server
+    finally:
+        for host in server.hosts:
+            network.unroute(host)
+        server.stop()
+
+
+def pytest_sessionstart(session):
     """Session start hook to install stubs before any tests import the apps."""
     _install_badgeware_stub()
-    _install_os_chdir_noop()
+    _install_virtual_fs()
 
 
 def prepare_app_import(app_name: str):
     """Utility for tests to ready the environment before importing an app."""
     _install_badgeware_stub()
-    _install_os_chdir_noop()
+    _install_virtual_fs()
     _preload_sibling_modules(app_name)
     # Provide minimal UI shims for apps that expect a local 'ui' module (e.g., menu)
     if app_name == "menu":
@@ -0,0 +1,116 @@
+"""
+Render badge apps into the stub framebuffer for the golden-image suite.
+
+``render_app`` runs in a fresh worker process (see ``test_golden_images``):
+it seeds ``random``, imports the app, drives ``update()`` on a simulated
+clock with a scripted input sequence and returns the framebuffer at the
+requested frames. Apps that use the web are answered by ``netserver``'s
+stand-in services. Keeping each app in its own process means import-time
+state from one app (or from other tests) cannot leak into another's frames.
+"""
+from __future__ import annotations
+
+import importlib
+import random
+import sys
+from pathlib import Path
+from types import ModuleType
+
+REPO = Path(__file__).resolve().parents[1]
+
+# app -> (frames to run, frames to capture, {frame: buttons pressed})
+# Buttons use the stub codes: A=1, B=2, C=3, UP=4, DOWN=5
+CASES = {
+    "hello": (30, (1, 30), {}),
+    "life": (90, (1, 45, 90), {}),
+    "commits": (60, (1, 60), {20: {3}}),
+    "snake": (90, (1, 45, 90), {10: {1}, 30: {4}, 50: {5}}),
+    "dvd": (90, (1, 45, 90), {}),
+    "flappy": (90, (1, 30, 90), {5: {1}, 25: {1}, 45: {1}, 65: {1}}),
+    "menu": (30, (1, 15, 30), {10: {5}, 20: {5}}),
+    "startup": (30, (1, 30), {}),
+    "gallery": (30, (1, 15, 30), {10: {3}, 20: {3}}),
+    "wifi": (60, (1, 30, 60), {10: {1}}),
+    "hc911": (60, (1, 30, 60), {5: {2}, 40: {1}}),
+    # until its data arrives badge shows placeholder numbers drawn after
+    # reseeding random from the OS, so only the loaded frames are compared
+    "badge": (120, (60, 120), {}),
+    "camera": (60, (1, 30, 60), {10: {5}}),
+    "monapet": (60, (1, 30, 60), {10: {2}, 40: {1}}),
+    "quest": (30, (1, 30), {}),
+    "sketch": (30, (1, 15, 30), {5: {3}, 6: {3}, 7: {3}, 10: {5}, 11: {5}}),
+}
+
+# credentials the apps read from /secrets.py
+SECRETS = {"WIFI_SSID": "golden", "WIFI_PASSWORD": "golden", "GITHUB_USERNAME": "octocat"}
+# apps whose frames depend on web services: netserver's stand-ins answer them
+NETWORKED = ("badge", "hc911")
+
+
+def scripted_inputs(frames: int, presses: dict[int, set[int]]) -> list[tuple[set[int], set[int]]]:
+    """Per-frame ``(pressed, held)`` sets; ``presses`` is keyed by 1-based frame."""
+    return [(set(presses.get(i + 1, ())), set()) for i in range(frames)]
+
+
+def render_app(app: str, seed: int = 0) -> dict[int, tuple[int, int, bytes]]:
+    """Run ``app``'s scripted case; return ``{frame: (width, height, rgba)}``."""
+    tests_dir = str(REPO / "tests")
+    tools_dir = str(REPO / "tools")
+    for path in (tests_dir, tools_dir):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    import headless
+    from conftest import prepare_app_import
+
+    # sibling modules run as they are preloaded (menu's ui.py draws random
+    # terminal lines), so seed first
+    random.seed(seed)
+    prepare_app_import(app)
+    import badgeware as bw  # type: ignore
+
+    _install_secrets()
+    if app in NETWORKED:
+        _serve_standins()
+
+    frames, capture, presses = CASES[app]
+    random.seed(seed)
+    bw.io.ticks = 0
+    mod = importlib.import_module(f"badge.apps.{app}")
+
+    fb = bw.screen.framebuffer
+    shots: dict[int, tuple[int, int, bytes]] = {}
+    count = 0
+
+    def update():
+        nonlocal count
+        result = mod.update()
+        count += 1
+        if count in capture:
+            shots[count] = (fb.width, fb.height, bytes(fb.pixels))
+        return result
+
+    headless.run_headless(update, bw.io, frames, inputs=scripted_inputs(frames, presses))
+    return shots
+
+
+def _install_secrets() -> None:
+    import network
+
+    secrets = ModuleType("secrets")
+    vars(secrets).update(SECRETS)
+    sys.modules["secrets"] = secrets
+    network.visible_ssids.append(SECRETS["WIFI_SSID"])
+
+
+def _serve_standins() -> None:
+    """Route the apps' web hosts to a stand-in server for this worker's lifetime."""
+    import network
+    from netserver import StandInServer
+
+    server = StandInServer().start()
+    for host in server.hosts:
+        network.route(host, 80, server.http_address)
+        network.route(host, 443, server.https_address, cafile=server.certfile)
+    # fetch on the update() thread (hc911's fallback without _thread), so a
+    # response lands on the same frame every run
+    sys.modules["_thread"] = None  # type: ignore[assignment]
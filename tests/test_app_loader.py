@@ -0,0 +1,69 @@
+import sys
+
+import headless
+from app_loader import AppLoader, discover_apps
+from badgeware import io, screen
+
+
+def _make_apps(tmp_path, monkeypatch):
+    root = tmp_path / "fakeapps"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    for name in ("alpha", "beta"):
+        app = root / name
+        app.mkdir()
+        # both apps define a bare-name sibling called "ui"
+        (app / "ui.py").write_text(f"NAME = {name!r}\nimports = []\n")
+        (app / "__init__.py").write_text("import ui\nui.imports.append(1)\ndef update():\n    return ui.NAME\n")
+    (root / "notes").mkdir()  # not an app: no __init__.py
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return root
+
+
+def test_discovery_skips_system_apps_and_plain_dirs(tmp_path, monkeypatch):
+    root = _make_apps(tmp_path, monkeypatch)
+    (root / "menu").mkdir()
+    (root / "menu" / "__init__.py").write_text("")
+    assert discover_apps(root) == ["alpha", "beta"]
+
+
+def test_apps_get_their_own_siblings_and_are_cached(tmp_path, monkeypatch):
+    root = _make_apps(tmp_path, monkeypatch)
+    loader = AppLoader(root, package="fakeapps")
+    try:
+        alpha = loader.activate("alpha")
+        assert alpha.update() == "alpha"
+        beta = loader.activate("beta")
+        assert beta.update() == "beta"
+        assert sys.modules["ui"] is beta.ui
+
+        # switching back reuses the cached module graph: no re-import
+        assert loader.activate("alpha") is alpha
+        assert sys.modules["ui"] is alpha.ui
+        assert alpha.ui.imports == [1]
+
+        loader.deactivate()
+        assert "ui" not in sys.modules
+        assert str(root / "alpha") not in sys.path
+    finally:
+        loader.deactivate()
+        for name in [n for n in sys.modules if n.startswith("fakeapps")]:
+            del sys.modules[name]
+
+
+def test_every_app_loads_and_runs_headless(monkeypatch):
+    # apps set screen state at import (fonts, antialiasing)
+    for name in ("antialias", "font", "brush"):
+        monkeypatch.setattr(screen, name, getattr(screen, name))
+    loader = AppLoader()
+    failures = []
+    try:
+        for name in discover_apps(exclude=()):
+            try:
+                app = loader.activate(name)
+                headless.run_headless(app.update, io, 3)
+            except Exception as exc:  # noqa: BLE001 - report every app that fails, not just the first
+                failures.append(f"{name}: {exc!r}")
+    finally:
+        loader.deactivate()
+    assert not failures, "\n".join(failures)
@@ -1,6 +1,7 @@
 import importlib
 from pathlib import Path
 
+from badgeware import screen
 from conftest import prepare_app_import
 
 
@@ -26,7 +27,6 @@ def test_each_app_runs_one_update():
         "badge",   # requires network/machine/powman
         "quest",   # IR beacon and external libs
         "tv-remote",  # IR beacon and external libs
-        "gallery",  # file system expectations
         "monapet",  # heavy sprite/UI coupling
         "sketch",  # UI module coupling
         "hc911",  # requires network for HTTP requests
@@ -45,6 +45,10 @@ def test_each_app_runs_one_update():
                 assert ret is None or isinstance(ret, (str, bytes))
         except Exception as e:
             failures.append((app, repr(e)))
+        finally:
+            # apps set screen state at import (gallery turns on antialiasing)
+            screen.antialias = 0
+            screen.font = None
 
     if failures:
         msgs = "\n".join([f"{a}: {m}" for a, m in failures])
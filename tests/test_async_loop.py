@@ -0,0 +1,122 @@
+import asyncio
+import time
+from itertools import pairwise
+from types import SimpleNamespace
+
+import network
+import pytest
+from async_loop import AsyncLoop
+
+
+def _io():
+    return SimpleNamespace(ticks=0, ticks_delta=0, pressed=set(), held=set())
+
+
+def test_updates_run_off_the_loop_on_the_simulated_clock():
+    io = _io()
+    seen = []
+    finished = []
+    runner = AsyncLoop(frame_ms=20, time_scale=4)
+    runner.add("app", lambda: seen.append(io.ticks), io, after_update=lambda: finished.append(io.ticks))
+
+    (stats,) = asyncio.run(runner.run(frames=10))
+
+    assert seen[:10] == [20 * i for i in range(1, 11)]
+    assert finished == seen
+    assert stats.frames == len(seen) and stats.stalled == 0
+
+
+def test_a_blocking_update_stalls_frames_but_not_presenting():
+    io = _io()
+    presents = []
+    calls = []
+    block = 0.4  # 40 frame periods
+
+    def update():
+        calls.append(io.ticks)
+        if len(calls) == 2:
+            time.sleep(block)  # a synchronous fetch on the "UI thread"
+
+    runner = AsyncLoop(frame_ms=10)
+    runner.add("slow", update, io)
+    (stats,) = asyncio.run(runner.run(frames=4, present=lambda: presents.append(time.perf_counter())))
+
+    assert stats.stalled >= 5 and stats.longest_stall == stats.stalled
+    assert stats.max_ms >= block * 1000
+    # the loop kept presenting while update() was blocked
+    assert len(presents) >= 10
+    assert max(b - a for a, b in pairwise(presents)) < block / 2
+    # simulated time keeps passing while the app is stalled
+    assert calls[:2] == [10, 20]
+    assert calls[2] == 20 + 10 * (stats.longest_stall + 1)
+    assert io.ticks_delta == calls[3] - calls[2]
+
+
+def test_scans_and_dns_are_awaited_on_the_loop(monkeypatch):
+    monkeypatch.setattr(network, "SCAN_SECONDS", 0.1)
+    io = _io()
+    found = []
+    presents = []
+    wlan = network.WLAN(network.STA_IF)
+
+    def update():
+        if not found:
+            found.append([s[0] for s in wlan.scan()])
+            found.append(network.getaddrinfo("localhost", 80)[0][-1][1])
+
+    runner = AsyncLoop(frame_ms=10)
+    runner.add("scanner", update, io)
+    asyncio.run(runner.run(frames=3, present=lambda: presents.append(1)))
+
+    assert found == [[b"Desktop-Network"], 80]
+    assert len(presents) >= 5
+    assert network._loop is None  # detached when the run ends
+
+
+def test_errors_in_update_end_the_run():
+    io = _io()
+    runner = AsyncLoop(frame_ms=10, time_scale=10)
+    runner.add("broken", lambda: 1 / 0, io)
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(runner.run(frames=5))
+
+
+def test_apps_share_one_clock():
+    io = _io()
+    seen: dict[str, list[tuple[int, int]]] = {"a": [], "b": []}
+    runner = AsyncLoop(frame_ms=20, time_scale=4)
+    for name, ticks in seen.items():
+        runner.add(name, lambda ticks=ticks: ticks.append((io.ticks, io.ticks_delta)), io)
+
+    a, b = asyncio.run(runner.run(frames=8))
+
+    # time moves one frame per frame (each app ran or stalled in every one),
+    # however many apps run
+    assert io.ticks == 20 * (a.frames + a.stalled) == 20 * (b.frames + b.stalled)
+    for ticks in seen.values():
+        # and each update sees the time since its app's last one
+        assert [t - dt for t, dt in ticks] == [0] + [t for t, _ in ticks[:-1]]
+    with pytest.raises(ValueError):
+        runner.add("c", lambda: None, _io())
+
+
+def test_apps_run_concurrently():
+    io = _io()
+    spans: dict[str, list[tuple[float, float]]] = {"a": [], "b": []}
+
+    def sleeper(name):
+        def update():
+            started = time.perf_counter()
+            time.sleep(0.05)
+            spans[name].append((started, time.perf_counter()))
+
+        return update
+
+    runner = AsyncLoop(frame_ms=10)
+    runner.add("a", sleeper("a"), io)
+    runner.add("b", sleeper("b"), io)
+    a, b = asyncio.run(runner.run(frames=3))
+
+    # each app's updates are serial, but the two apps overlap
+    assert any(a0 < b1 and b0 < a1 for a0, a1 in spans["a"] for b0, b1 in spans["b"])
+    assert a.frames >= 3 and b.frames >= 3
@@ -0,0 +1,73 @@
+import base64
+import json
+import socket
+from types import ModuleType, SimpleNamespace
+
+from badgeware._framebuffer import Framebuffer
+from control_socket import Controller, ControlServer
+
+
+def _app():
+    io = SimpleNamespace(BUTTON_A=1, BUTTON_UP=4, ticks=0, ticks_delta=0, pressed=set(), held=set())
+    fb = Framebuffer(16, 8)
+    mod = ModuleType("demo")
+    mod.score = 0
+    mod.seen = []
+    mod.sprite = object()
+
+    def update():
+        mod.seen.append((io.ticks, sorted(io.pressed), sorted(io.held)))
+        if io.BUTTON_A in io.pressed:
+            mod.score += 1
+            fb.rectangle(0, 0, 16, 8, bytes((255, 0, 0, 255)))
+
+    mod.update = update
+    return mod, io, fb
+
+
+def test_batches_run_in_one_round_trip():
+    mod, io, fb = _app()
+    controller = Controller(mod, io, fb, frame_ms=10)
+    with ControlServer(controller) as server:
+        with socket.create_connection(server.address, timeout=5) as conn:
+            stream = conn.makefile("rwb")
+
+            def call(request):
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+                return json.loads(stream.readline())
+
+            replies = call([
+                {"cmd": "press", "button": "A"},
+                {"cmd": "hold", "button": "up"},
+                {"cmd": "step", "frames": 3},
+                {"cmd": "hold", "button": "UP", "down": False},
+                {"cmd": "step", "frames": 1000, "id": "soak"},
+                {"cmd": "get_state"},
+                {"cmd": "screenshot", "format": "rgb"},
+            ])
+            assert all(reply["ok"] for reply in replies)
+            assert replies[2]["frames"] == 3 and replies[2]["ticks"] == 30
+            assert replies[4] == {**replies[4], "frames": 1003, "ticks": 10030, "id": "soak"}
+            assert replies[5]["state"]["score"] == 1 and "sprite" not in replies[5]["state"]
+            assert base64.b64decode(replies[6]["data"])[:3] == bytes((255, 0, 0))
+
+            # a batch stops at its first failing command
+            replies = call([{"cmd": "get_state", "names": ["sprite", "nope"]}, {"cmd": "step"}])
+            assert len(replies) == 1 and "no global 'nope'" in replies[0]["error"]
+            assert call({"cmd": "jump"}) == {"ok": False, "error": "unknown command 'jump'"}
+            assert call({"cmd": "quit"}) == {"ok": True}
+        assert server.wait(1)
+
+    # presses land on one frame; holds repeat as presses until released
+    assert mod.seen[:4] == [(10, [1, 4], [4]), (20, [4], [4]), (30, [4], [4]), (40, [], [])]
+    assert len(mod.seen) == 1003
+
+
+def test_errors_in_update_are_reported():
+    mod, io, fb = _app()
+    mod.update = lambda: 1 / 0
+    controller = Controller(mod, io, fb)
+    reply = controller.execute({"cmd": "step", "frames": 5})
+    assert reply["ok"] is False and "ZeroDivisionError" in reply["error"]
+    assert controller.execute({"cmd": "press"})["error"].startswith("press: ")
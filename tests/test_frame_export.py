@@ -0,0 +1,120 @@
+import random
+import threading
+
+from frame_export import FrameExporter, GifEncoder
+
+
+class RecordingEncoder:
+    def __init__(self, gate=None):
+        self.frames = []
+        self.closed = False
+        self.gate = gate
+
+    def write(self, rgba):
+        if self.gate is not None:
+            self.gate.wait()
+        self.frames.append(rgba)
+
+    def close(self):
+        self.closed = True
+
+
+def test_frames_are_copied_and_flushed_on_close():
+    encoder = RecordingEncoder()
+    exporter = FrameExporter(encoder)
+    pixels = bytearray(b"\x01\x02\x03\xff")
+    exporter.submit(pixels)
+    pixels[0] = 9  # the app keeps drawing into the same buffer
+    exporter.submit(pixels)
+    exporter.close()
+
+    assert encoder.frames == [b"\x01\x02\x03\xff", b"\x09\x02\x03\xff"]
+    assert encoder.closed
+    assert (exporter.written, exporter.dropped) == (2, 0)
+
+
+def test_full_queue_drops_instead_of_blocking():
+    gate = threading.Event()  # encoder is stuck until released
+    encoder = RecordingEncoder(gate)
+    exporter = FrameExporter(encoder, max_queue=2)
+
+    results = [exporter.submit(bytes([i])) for i in range(10)]
+    gate.set()
+    exporter.close()
+
+    assert results.count(False) == exporter.dropped
+    assert exporter.dropped >= 10 - 3  # queue of 2 plus the frame being encoded
+    assert exporter.written == 10 - exporter.dropped
+
+
+def _unlzw(data, min_size):
+    clear = 1 << min_size
+    bits = int.from_bytes(data, "little")
+    pos = 0
+    out = bytearray()
+    table: list[bytes] = []
+    size = min_size + 1
+    prev = None
+    while True:
+        code = bits >> pos & ((1 << size) - 1)
+        pos += size
+        if code == clear:
+            table = [bytes([i]) for i in range(clear)] + [b"", b""]
+            size = min_size + 1
+            prev = None
+            continue
+        if code == clear + 1:
+            return bytes(out)
+        entry = table[code] if code < len(table) else table[prev] + table[prev][:1]
+        out += entry
+        if prev is not None and len(table) < 4096:
+            table.append(table[prev] + entry[:1])
+            if len(table) == 1 << size and size < 12:
+                size += 1
+        prev = code
+
+
+def _decode_gif(data):
+    """``(width, height, [rgb frames])`` from a GIF written by ``GifEncoder``."""
+    assert data[:6] == b"GIF89a" and data[-1:] == b"\x3b"
+    width, height = int.from_bytes(data[6:8], "little"), int.from_bytes(data[8:10], "little")
+    pos = 13 + 19  # screen descriptor, looping extension
+    frames = []
+    while data[pos] == 0x21:
+        pos += 8  # graphic control extension
+        assert data[pos] == 0x2C and data[pos + 9] == 0x87
+        palette = data[pos + 10:pos + 10 + 768]
+        pos += 10 + 768
+        min_size = data[pos]
+        pos += 1
+        stream = bytearray()
+        while data[pos]:
+            stream += data[pos + 1:pos + 1 + data[pos]]
+            pos += 1 + data[pos]
+        pos += 1
+        frames.append(b"".join(palette[i * 3:i * 3 + 3] for i in _unlzw(stream, min_size)))
+    return width, height, frames
+
+
+def test_gif_frames_are_streamed_to_the_file(tmp_path):
+    rng = random.Random(1)
+    colours = [bytes((rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)) for _ in range(200)]
+    # noisy enough to fill the 4096-code LZW table several times
+    noisy = b"".join(rng.choice(colours) for _ in range(64 * 48))
+    # more than 256 colours: mapped to a fixed palette (Pillow is optional)
+    gradient = b"".join(bytes((x * 4, y * 5, (x + y) * 2, 255)) for y in range(48) for x in range(64))
+
+    path = tmp_path / "out.gif"
+    encoder = GifEncoder(path, 64, 48, frame_ms=40)
+    encoder.write(noisy)
+    encoder.write(gradient)
+    encoder.close()
+
+    width, height, (first, second) = _decode_gif(path.read_bytes())
+    assert (width, height) == (64, 48)
+    rgb = bytearray(noisy)
+    del rgb[3::4]
+    assert first == rgb
+    rgb = bytearray(gradient)
+    del rgb[3::4]
+    assert max(abs(a - b) for a, b in zip(second, rgb, strict=True)) < 64
@@ -0,0 +1,53 @@
+
+import pytest
+from frame_scheduler import FrameScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_paces_to_absolute_deadlines():
+    clock = FakeClock()
+    sched = FrameScheduler(frame_ms=20, clock=clock, sleep=clock.sleep)
+
+    assert sched.wait() == 1  # first frame runs immediately
+    clock.now += 0.005  # frame work takes 5 ms
+    assert sched.wait() == 1
+    # the sleep absorbed the work time: deadlines stay on the 20 ms grid
+    assert clock.now == pytest.approx(0.020)
+
+
+def test_catches_up_then_drops_backlog():
+    clock = FakeClock()
+    sched = FrameScheduler(frame_ms=20, max_lag=0.1, clock=clock, sleep=clock.sleep)
+    sched.wait()
+
+    clock.now += 0.065  # a slow frame: three deadlines missed
+    assert sched.wait() == 3
+
+    clock.now += 1.0  # a long stall is not replayed in full
+    assert sched.wait() == sched.max_steps == 5
+    assert sched.dropped > 0
+
+
+def test_time_scale_runs_more_frames_per_second():
+    clock = FakeClock()
+    sched = FrameScheduler(frame_ms=33, time_scale=10, clock=clock, sleep=clock.sleep)
+    frames = 0
+    while clock.now < 1.0:
+        frames += sched.wait()
+    assert 300 <= frames <= 305
+    assert sched.dropped == 0
+
+
+def test_rejects_non_positive_time_scale():
+    with pytest.raises(ValueError):
+        FrameScheduler(time_scale=0)
@@ -0,0 +1,23 @@
+
+from badgeware._framebuffer import Framebuffer
+from framebuffer_view import dirty_rects
+
+
+def test_static_frame_has_no_dirty_rects():
+    fb = Framebuffer(160, 120)
+    assert dirty_rects(bytes(fb.pixels), fb.pixels, 160, 120) == []
+
+
+def test_dirty_rects_merge_rows_and_trim_to_changed_tiles():
+    fb = Framebuffer(160, 120)
+    before = bytes(fb.pixels)
+    fb.rectangle(40, 10, 5, 3, bytes((255, 255, 255, 255)))
+    fb.rectangle(150, 50, 10, 1, bytes((255, 255, 255, 255)))
+    assert dirty_rects(before, fb.pixels, 160, 120) == [(32, 10, 48, 13), (144, 50, 160, 51)]
+
+
+def test_region_ppm_matches_rect_size():
+    fb = Framebuffer(160, 120)
+    ppm = fb.to_ppm(32, 10, 48, 13)
+    assert ppm.startswith(b"P6 16 3 255\n")
+    assert len(ppm) == len(b"P6 16 3 255\n") + 16 * 3 * 3
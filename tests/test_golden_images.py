@@ -0,0 +1,77 @@
+"""
+Golden-image regression suite: every app in ``golden_render.CASES`` is
+rendered for a scripted set of frames and compared against the PNGs in
+``tests/golden``. Apps render in parallel worker processes, so the suite
+stays fast and app import state stays isolated.
+
+After an intentional rendering change, or to add frames for a new app,
+regenerate the goldens with::
+
+    UPDATE_GOLDENS=1 python -m pytest tests/test_golden_images.py
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import golden_render
+import pytest
+from app_loader import discover_apps
+from badgeware._png import decode_png, encode_png
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+UPDATE = os.environ.get("UPDATE_GOLDENS") == "1"
+
+# a pixel differs if any channel is off by more than CHANNEL_TOLERANCE, and a
+# frame fails if more than PIXEL_TOLERANCE of its pixels differ
+CHANNEL_TOLERANCE = 8
+PIXEL_TOLERANCE = 0.002
+
+
+@pytest.fixture(scope="module")
+def rendered():
+    apps = sorted(golden_render.CASES)
+    # spawn gives every app a clean interpreter (no modules shared via fork),
+    # and one app per worker keeps it clean when there are fewer CPUs than apps
+    context = multiprocessing.get_context("spawn")
+    workers = min(len(apps), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1) as pool:
+        return dict(zip(apps, pool.map(golden_render.render_app, apps), strict=True))
+
+
+def test_every_app_has_golden_frames():
+    assert sorted(golden_render.CASES) == discover_apps(exclude=())
+
+
+def _differing_pixels(expected: bytes, actual: bytes) -> int:
+    if expected == actual:
+        return 0
+    diff = 0
+    for i in range(0, len(expected), 4):
+        if any(abs(a - b) > CHANNEL_TOLERANCE for a, b in zip(expected[i:i + 4], actual[i:i + 4], strict=True)):
+            diff += 1
+    return diff
+
+
+@pytest.mark.parametrize("app", sorted(golden_render.CASES))
+def test_app_matches_golden_frames(app, rendered, tmp_path):
+    failures = []
+    for frame, (width, height, pixels) in sorted(rendered[app].items()):
+        golden = GOLDEN_DIR / f"{app}-{frame:04d}.png"
+        if UPDATE:
+            GOLDEN_DIR.mkdir(exist_ok=True)
+            golden.write_bytes(encode_png(width, height, pixels))
+            continue
+        if not golden.exists():
+            failures.append(f"{golden.name}: missing golden, rerun with UPDATE_GOLDENS=1")
+            continue
+        g_width, g_height, expected = decode_png(golden.read_bytes())
+        if (g_width, g_height) != (width, height):
+            failures.append(f"{golden.name}: size {width}x{height}, golden is {g_width}x{g_height}")
+            continue
+        diff = _differing_pixels(bytes(expected), pixels)
+        if diff > PIXEL_TOLERANCE * width * height:
+            actual = tmp_path / golden.name
+            actual.write_bytes(encode_png(width, height, pixels))
+            failures.append(f"{golden.name}: {diff} pixels differ (actual frame saved to {actual})")
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+import headless
+import pytest
+
+
+def test_run_headless_drives_simulated_clock():
+    io = SimpleNamespace(ticks=0, ticks_delta=0, pressed={1}, held={2})
+    seen = []
+
+    def update():
+        seen.append((io.ticks, io.ticks_delta, set(io.pressed), set(io.held)))
+
+    stats = headless.run_headless(update, io, frames=3, frame_ms=20)
+
+    assert [s[0] for s in seen] == [20, 40, 60]
+    assert all(s[1] == 20 and not s[2] and not s[3] for s in seen)
+    assert stats.frames == 3
+    assert len(stats.update_times) == 3
+
+
+def test_run_stats_percentiles():
+    stats = headless.RunStats(frames=100, wall_time=2.0, update_times=[i / 1000 for i in range(1, 101)])
+    assert stats.fps == 50
+    assert stats.mean_ms == pytest.approx(50.5)
+    assert stats.p99_ms == pytest.approx(100)
+    assert "p99=100.000ms" in stats.summary()
@@ -0,0 +1,32 @@
+
+import headless
+from app_loader import AppLoader
+from badgeware import io, screen
+
+
+def test_feeding_plays_the_eating_animation_from_sheet_views(monkeypatch):
+    # the app sets screen state at import (font, antialiasing)
+    for name in ("antialias", "font", "brush"):
+        monkeypatch.setattr(screen, name, getattr(screen, name))
+    loader = AppLoader()
+    try:
+        monapet = loader.activate("monapet")
+        mona = monapet.mona
+        mona._hunger = 50
+        headless.run_headless(monapet.update, io, 1, 33, [({io.BUTTON_B}, set())])
+        assert mona.current_action() == "eating"
+        assert mona.hunger() > 75
+        headless.run_headless(monapet.update, io, 20)
+
+        # animation frames are windows into one decoded sprite sheet
+        eating = type(mona)._animations["eating"]
+        first, second = eating.frame(0).data, eating.frame(1).data
+        assert first.pixels.obj is second.pixels.obj
+        assert second.offset == first.width * 4
+        # the floor is drawn through one cached screen.window per floor height
+        floor_y = mona.position()[1] - 5
+        assert screen.window(0, floor_y, 160, 120) is screen.window(0, floor_y, 160, 120)
+        i = (119 * 160 + 1) * 4
+        assert screen.framebuffer.pixels[i:i + 3] != bytes(3)
+    finally:
+        loader.deactivate()
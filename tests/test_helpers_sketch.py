@@ -0,0 +1,40 @@
+
+import headless
+from app_loader import AppLoader
+from badgeware import io, screen
+
+
+def _pixel(fb, x, y):
+    i = (y * fb.width + x) * 4
+    return bytes(fb.pixels[i:i + 3])
+
+
+def test_drawing_on_the_canvas_and_the_xor_cursor(monkeypatch):
+    # the app sets screen state at import (font, antialiasing)
+    for name in ("antialias", "font", "brush"):
+        monkeypatch.setattr(screen, name, getattr(screen, name))
+    loader = AppLoader()
+    try:
+        sketch = loader.activate("sketch")
+        ui = sketch.ui
+        left, top = ui.canvas_area[:2]
+        start = tuple(int(v) for v in sketch.cursor)
+        # hold "right" (C) to draw a 10 pixel line
+        held = {io.BUTTON_C}
+        headless.run_headless(sketch.update, io, 10, 33, [(set(), held)] * 10)
+        x, y = (int(v) for v in sketch.cursor)
+        assert (x, y) == (start[0] + 10, start[1])
+
+        grey = bytes((105, 105, 105))
+        for px in range(start[0] + 1, x + 1):
+            assert _pixel(sketch.canvas.framebuffer, px, y) == grey
+        # blitted to the screen, clear of the cursor's arms
+        for px in range(start[0] + 1, x - 3):
+            assert _pixel(screen.framebuffer, left + px, top + y) == grey
+
+        # the cursor's arms XOR the canvas background under them
+        background = _pixel(screen.framebuffer, left + x + 2, top + y + 6)
+        shade = int(ui.math.sin(io.ticks / 250) * 127 + 127)
+        assert _pixel(screen.framebuffer, left + x + 2, top + y) == bytes(c ^ shade for c in background)
+    finally:
+        loader.deactivate()
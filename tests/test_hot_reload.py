@@ -0,0 +1,120 @@
+import importlib
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import headless
+import pytest
+from app_loader import AppLoader
+from badgeware import _paths, io, screen
+from badgeware._paths import VirtualFS
+from hot_reload import AppReloader
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+def _write(path, text):
+    path.write_text(text)
+    # make the change visible even on filesystems with coarse mtimes
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _make_app(tmp_path, monkeypatch):
+    app = tmp_path / "hotapp"
+    app.mkdir()
+    (app / "helper.py").write_text("def label():\n    return 'v1'\n")
+    (app / "__init__.py").write_text(
+        "from helper import label\n"
+        "class Game:\n"
+        "    def speed(self):\n"
+        "        return 1\n"
+        "game = Game()\n"
+        "frames = 0\n"
+        "def update():\n"
+        "    global frames\n"
+        "    frames += 1\n"
+        "    return label(), game.speed(), frames\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.syspath_prepend(str(app))
+    for name in ("hotapp", "helper"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return app, importlib.import_module("hotapp")
+
+
+def test_reloads_changed_sibling_and_keeps_state(tmp_path, monkeypatch):
+    app, mod = _make_app(tmp_path, monkeypatch)
+    reloader = AppReloader(mod, keep_state=True, interval=0)
+    mod.update()
+    mod.update()
+    game = mod.game
+    assert not reloader.poll()
+
+    _write(app / "helper.py", "def label():\n    return 'v2'\n")
+    _write(app / "__init__.py", (app / "__init__.py").read_text().replace("return 1", "return 5"))
+    assert reloader.poll()
+
+    # new code, old state: the same game object now runs the edited method
+    assert mod.update() == ("v2", 5, 3)
+    assert mod.game is game
+
+
+def test_failed_reload_keeps_previous_code(tmp_path, monkeypatch, capsys):
+    app, mod = _make_app(tmp_path, monkeypatch)
+    reloader = AppReloader(mod, interval=0)
+
+    _write(app / "__init__.py", "def update(:\n")
+    assert not reloader.poll()
+    assert "failed" in capsys.readouterr().out
+    assert mod.update() == ("v1", 1, 1)
+
+
+@pytest.fixture
+def flappy_copy(tmp_path, monkeypatch):
+    """A copy of flappy, imported as ``copiedapps.flappy`` and served as
+    ``/system/apps/flappy``, so edits never touch the repository."""
+    system = tmp_path / "system"
+    apps = system / "copiedapps"
+    shutil.copytree(REPO / "badge" / "apps" / "flappy", apps / "flappy", ignore=shutil.ignore_patterns("__pycache__"))
+    (apps / "__init__.py").write_text("")
+    monkeypatch.syspath_prepend(str(system))
+    # siblings other tests loaded by their bare names would shadow the copy's
+    for py in (apps / "flappy").glob("*.py"):
+        monkeypatch.delitem(sys.modules, py.stem, raising=False)
+
+    real = _paths.vfs
+    copy = VirtualFS(system=system, assets=real.mounts[1][1], root=tmp_path / "root")
+    copy.mounts[0] = ("/system/apps", apps)
+    real.uninstall()
+    monkeypatch.setattr(_paths, "vfs", copy)
+    copy.install()
+    try:
+        yield apps
+    finally:
+        copy.uninstall()
+        real.install()
+
+
+def test_edited_sibling_of_a_real_app_takes_effect(flappy_copy, monkeypatch):
+    # the app sets screen state at import (font, antialiasing)
+    for name in ("antialias", "font", "brush"):
+        monkeypatch.setattr(screen, name, getattr(screen, name))
+    loader = AppLoader(flappy_copy, package="copiedapps")
+    try:
+        flappy = loader.activate("flappy")
+        headless.run_headless(flappy.update, io, 3, 33, [({io.BUTTON_A}, set())] + [(set(), set())] * 2)
+        mona = flappy.mona
+        reloader = AppReloader(flappy, keep_state=True, interval=0)
+
+        source = flappy_copy / "flappy" / "mona.py"
+        _write(source, source.read_text().replace("self.velocity = -2", "self.velocity = -5"))
+        assert reloader.poll()
+
+        # the running game's mona jumps with the edited method
+        headless.run_headless(flappy.update, io, 1, 33, [({io.BUTTON_A}, set())])
+        assert flappy.mona is mona
+        assert mona.velocity < -4
+    finally:
+        loader.forget("flappy")
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+import headless
+import pytest
+from input_trace import InputTrace, pack_buttons, unpack_buttons
+
+
+def test_button_masks_round_trip():
+    assert unpack_buttons(pack_buttons({1, 4, 5})) == {1, 4, 5}
+    with pytest.raises(ValueError):
+        pack_buttons({16})
+
+
+def test_trace_round_trip_is_run_length_encoded(tmp_path):
+    trace = InputTrace(seed=1234, frame_ms=20)
+    for _ in range(10_000):
+        trace.record(set(), set())
+    trace.record({1}, set())
+    trace.record({4}, {4})
+
+    path = tmp_path / "session.trace"
+    trace.save(path)
+    # 10,000 idle frames collapse into a single record
+    assert path.stat().st_size < 64
+
+    loaded = InputTrace.load(path)
+    assert (loaded.seed, loaded.frame_ms) == (1234, 20)
+    assert loaded.frames == trace.frames
+
+
+def test_rejects_corrupt_trace():
+    data = InputTrace().to_bytes()
+    with pytest.raises(ValueError):
+        InputTrace.from_bytes(b"nope" + data[4:])
+    with pytest.raises(ValueError):
+        InputTrace.from_bytes(data + b"\x00")
+
+
+def test_replay_feeds_recorded_input():
+    trace = InputTrace()
+    trace.record({1}, set())
+    trace.record(set(), set())
+    trace.record({4}, {4})
+
+    io = SimpleNamespace(ticks=0, ticks_delta=0, pressed=set(), held=set())
+    seen = []
+    headless.run_headless(lambda: seen.append((set(io.pressed), set(io.held))), io, len(trace), inputs=trace.inputs())
+
+    assert seen == [({1}, set()), (set(), set()), ({4}, {4})]
@@ -0,0 +1,84 @@
+import importlib
+import json
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import network
+import pytest
+import urequest
+from conftest import prepare_app_import
+
+CASSETTES = Path(__file__).resolve().parent / "cassettes"
+
+
+def _exchange(host, path, port=443):
+    """Send one raw HTTP/1.1 GET through network.socket; return each recv()."""
+    s = network.socket()
+    s.connect(network.getaddrinfo(host, port)[0][-1])
+    if port == 443:
+        s = network.wrap_socket(s, server_hostname=host)
+    s.send(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    pieces = []
+    while piece := s.recv(1024):
+        pieces.append(piece)
+    s.close()
+    return pieces
+
+
+def test_hc911_replays_recorded_chunked_responses_offline():
+    prepare_app_import("hc911")
+    hc911 = importlib.import_module("badge.apps.hc911")
+    hc911.wlan = SimpleNamespace(isconnected=lambda: True)
+    hc911.yearly_total = hc911.daily_total = hc911.active_incidents = None
+
+    started = time.perf_counter()
+    with network.Cassette(CASSETTES / "hc911.json", mode="replay"):
+        hc911.fetch_incidents()
+    assert time.perf_counter() - started < 0.25  # recorded over ~0.6s
+
+    assert (hc911.yearly_total, hc911.daily_total, hc911.active_incidents) == (412873, 1096, 37)
+
+
+def test_contrib_payload_replays_through_urlopen():
+    with network.Cassette(CASSETTES / "github.json", mode="replay"):
+        response = urequest.urlopen("https://github.com/octocat.contribs", headers={"User-Agent": "test"})
+        data = json.loads(response.read())
+    assert len(data["weeks"]) == 53 and data["total_contributions"] > 0
+
+
+def test_recording_replays_the_same_recv_boundaries(standin_server, tmp_path):
+    standin_server.shape(chunk_size=700)
+    path = tmp_path / "calls.json"
+    with network.Cassette(path) as cassette:  # "once": nothing on disk yet
+        assert cassette.mode == "record"
+        recorded = _exchange("hc911server.com", "/api/calls")
+    # once recorded, the server is not needed any more
+    for host in standin_server.hosts:
+        network.unroute(host)
+
+    with network.Cassette(path) as cassette:
+        assert cassette.mode == "replay"
+        replayed = _exchange("hc911server.com", "/api/calls")
+        # replaying the same request again repeats the last recording
+        assert _exchange("hc911server.com", "/api/calls") == replayed
+    assert replayed == recorded
+    assert b"".join(replayed).endswith(b"\r\n0\r\n\r\n")
+
+
+def test_realtime_replay_keeps_the_recorded_timing():
+    count = json.loads((CASSETTES / "hc911.json").read_text())["interactions"][0]
+    recorded = count["recv"][-1][0]
+
+    started = time.perf_counter()
+    with network.Cassette(CASSETTES / "hc911.json", mode="replay", realtime=True):
+        body = b"".join(_exchange("hc911server.com", "/api/count"))
+    assert time.perf_counter() - started >= recorded
+    assert b"412873" in body
+
+
+def test_unrecorded_requests_fail_like_network_errors():
+    with network.Cassette(CASSETTES / "hc911.json", mode="replay"), pytest.raises(OSError, match="no recorded response"):
+        _exchange("hc911server.com", "/api/missing")
+    with pytest.raises(ValueError):
+        network.Cassette(CASSETTES / "hc911.json", mode="rewind")
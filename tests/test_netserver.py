@@ -0,0 +1,107 @@
+import importlib
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from types import SimpleNamespace
+
+import network
+import pytest
+import urequest
+from conftest import prepare_app_import
+from netserver import PRESETS, Shaping
+
+
+def _get(server, path, host="hc911server.com"):
+    """Raw HTTP/1.1 GET against the plain listener; returns (head, body) bytes."""
+    with socket.create_connection(server.http_address) as s:
+        s.sendall(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        data = b""
+        while chunk := s.recv(65536):
+            data += chunk
+    head, _, body = data.partition(b"\r\n\r\n")
+    return head, body
+
+
+def test_hc911_fetches_recorded_payloads_over_tls(standin_server):
+    prepare_app_import("hc911")
+    hc911 = importlib.import_module("badge.apps.hc911")
+    hc911.wlan = SimpleNamespace(isconnected=lambda: True)
+
+    hc911.fetch_incidents()
+
+    assert (hc911.yearly_total, hc911.daily_total, hc911.active_incidents) == (412873, 1096, 37)
+    assert [(e.host, e.path, e.status) for e in standin_server.log] == [
+        ("hc911server.com", "/api/count", 200),
+        ("hc911server.com", "/api/calls", 200),
+    ]
+
+
+def test_routes_serve_chunked_payloads_and_404():
+    # the recorded hc911 responses are chunked 1024 bytes at a time
+    from netserver import StandInServer
+
+    with StandInServer() as server:
+        head, body = _get(server, "/api/calls")
+        assert b"Transfer-Encoding: chunked" in head
+        assert body.startswith(b"400\r\n") and body.endswith(b"\r\n0\r\n\r\n")
+
+        head, body = _get(server, "/users/octocat", host="api.github.com")
+        assert b"Content-Length" in head and json.loads(body)["login"] == "octocat"
+
+        head, _ = _get(server, "/nope")
+        assert head.startswith(b"HTTP/1.1 404")
+
+
+def test_urlopen_reads_routed_https_hosts(standin_server):
+    response = urequest.urlopen("https://github.com/octocat.contribs", headers={"User-Agent": "test"})
+    data = json.loads(response.read())
+    assert len(data["weeks"]) == 53
+
+    # only hostnames the server knows are routed
+    assert network.getaddrinfo("wsrv.nl", 443)[0][-1] == standin_server.https_address
+    network.unroute("wsrv.nl")
+    assert ("wsrv.nl", 443) not in network._routes
+
+
+def test_urlopen_reports_redirects_as_os_errors():
+    class Moved(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(302)
+            self.send_header("Location", "http://example.com/")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Moved)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    network.route("moved.example", 80, server.server_address)
+    try:
+        with pytest.raises(OSError, match="Redirects not yet supported"):
+            urequest.urlopen("http://moved.example/")
+    finally:
+        network.unroute("moved.example")
+        server.shutdown()
+        server.server_close()
+
+
+def test_shaping_adds_latency_caps_bandwidth_and_drops(standin_server):
+    standin_server.shape(latency=0.1, bandwidth=50_000)
+    started = time.perf_counter()
+    avatar = urequest.urlopen("https://wsrv.nl/?url=x&w=75&output=png").read()
+    elapsed = time.perf_counter() - started
+    assert avatar.startswith(b"\x89PNG")
+    exchange = standin_server.log[-1]
+    assert exchange.ttfb >= 0.1
+    assert elapsed >= 0.1 + len(avatar) / 50_000 * 0.9
+
+    standin_server.shaping = Shaping(disconnect_after=100)
+    assert len(urequest.urlopen("http://wsrv.nl/").read()) == 100
+    assert standin_server.log[-1].disconnected
+
+
+def test_presets_describe_network_conditions():
+    assert PRESETS["lan"] == Shaping()
+    assert PRESETS["flaky"].disconnect_after and PRESETS["conference"].latency > 0
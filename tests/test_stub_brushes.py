@@ -0,0 +1,31 @@
+from badgeware import brushes, screen, shapes
+from badgeware._brushes import XorColor, pack_color
+from badgeware._framebuffer import Framebuffer
+
+
+def _pixel(fb, x, y):
+    i = (y * fb.width + x) * 4
+    return tuple(fb.pixels[i:i + 4])
+
+
+def test_alpha_overlay_blends_every_channel():
+    fb = Framebuffer(8, 4)
+    fb.clear(bytes((200, 100, 0, 255)))
+    fb.fill_rect(0, 0, 8, 4, pack_color(brushes.color(0, 0, 0, 180)))
+    assert {_pixel(fb, x, y) for x in range(8) for y in range(4)} == {(58, 29, 0, 255)}
+    fb.fill_span(1, 2, 5, pack_color(brushes.color(255, 255, 255, 128)))
+    assert _pixel(fb, 2, 1) == (156, 142, 128, 255) and _pixel(fb, 5, 1) == (58, 29, 0, 255)
+
+
+def test_xor_brush_flips_and_restores(monkeypatch):
+    assert isinstance(pack_color(brushes.xor(40)), XorColor)
+    assert pack_color(brushes.color(1, 2, 3)) is pack_color(brushes.color(1, 2, 3))
+
+    monkeypatch.setattr(screen, "framebuffer", Framebuffer(10, 10))
+    screen.framebuffer.clear(bytes((10, 20, 30, 255)))
+    before = bytes(screen.framebuffer.pixels)
+    monkeypatch.setattr(screen, "brush", brushes.xor(255, 0, 255))
+    screen.draw(shapes.rectangle(2, 2, 3, 3))
+    assert _pixel(screen.framebuffer, 3, 3) == (245, 20, 225, 255)
+    screen.draw(shapes.rectangle(2, 2, 3, 3))
+    assert bytes(screen.framebuffer.pixels) == before
@@ -0,0 +1,58 @@
+import struct
+
+import pytest
+from badgeware import PixelFont, brushes, screen
+from badgeware._framebuffer import Framebuffer
+from badgeware._pixelfont import PixelFont as ParsedFont
+
+
+def _ppf(glyphs, width=3, height=2, name=b"Tiny"):
+    """Build a ppf from ``{char: (advance, rows)}`` with rows as bit strings."""
+    header = struct.pack(">4sIHHH32s", b"ppf!", 0, len(glyphs), width, height, name)
+    table = b"".join(struct.pack(">IH", ord(ch), adv) for ch, (adv, _) in glyphs.items())
+    bitmaps = b"".join(
+        int(row.ljust(8, "0"), 2).to_bytes(1, "big") for _, rows in glyphs.values() for row in rows
+    )
+    return header + table + bitmaps
+
+
+def test_parse_reads_advances_and_msb_first_bitmaps():
+    font = ParsedFont.parse(_ppf({"A": (4, ("110", "011")), " ": (0, ("000", "000"))}))
+    assert (font.name, font.width, font.height) == ("Tiny", 3, 2)
+    assert font.glyph("A") == (4, ((0, 0, 2), (1, 1, 2)))
+    assert font.glyph(" ")[0] > 0  # fonts store a zero advance for space
+    assert font.glyph("Z") == font.glyph(" ")  # no "?" glyph either
+    assert font.measure("AA A") == (4 * 3 + font.glyph(" ")[0], 2)
+    assert font.measure("AA A") is font.measure("AA A")
+
+    with pytest.raises(ValueError):
+        ParsedFont.parse(b"ppf?" + bytes(50))
+    with pytest.raises(ValueError):
+        ParsedFont.parse(_ppf({"A": (4, ("110", "011"))})[:-1])
+
+
+def test_text_renders_glyph_spans():
+    font = ParsedFont.parse(_ppf({"A": (4, ("110", "011"))}))
+    fb = Framebuffer(8, 2)
+    fb.text("AA", 0, 0, b"\xff\xff\xff\xff", font)
+    lit = "".join("#" if fb.pixels[i + 3] else "." for i in range(0, len(fb.pixels), 4))
+    assert lit == "##..##.." ".##..##."
+
+
+def test_screen_uses_bundled_fonts_and_falls_back_to_builtin(monkeypatch):
+    for name in ("font", "brush"):
+        monkeypatch.setattr(screen, name, getattr(screen, name))
+    monkeypatch.setattr(screen, "framebuffer", Framebuffer(160, 120))
+    nope = PixelFont.load("/system/assets/fonts/nope.ppf")
+    assert nope is PixelFont.load("/system/assets/fonts/nope.ppf")
+    assert PixelFont.load("assets/fonts/nope.ppf") is not None  # app-relative name
+    assert nope.name == "Nope 8" and nope.height == 13
+
+    screen.font = nope
+    assert screen.measure_text("Hello")[1] == 13
+    assert screen.measure_text("Hello") != screen.measure_text("Hellooo")
+
+    screen.font = PixelFont.load("/system/assets/fonts/missing.ppf")
+    assert screen.measure_text("Hi") == (12, 10)
+    screen.brush = brushes.color(255, 255, 255)
+    screen.text("Hi", 0, 0)
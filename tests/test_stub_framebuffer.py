@@ -0,0 +1,69 @@
+from badgeware import brushes, screen, shapes
+from badgeware._framebuffer import Framebuffer
+
+
+def _pixel(fb, x, y):
+    i = (y * fb.width + x) * 4
+    return tuple(fb.pixels[i:i + 4])
+
+
+def test_rectangle_fills_pixel_centres_and_clips():
+    fb = Framebuffer(160, 120)
+    fb.rectangle(-5, 118, 10, 10, bytes((255, 0, 0, 255)))
+    assert _pixel(fb, 0, 119) == (255, 0, 0, 255)
+    assert _pixel(fb, 4, 118) == (255, 0, 0, 255)
+    assert _pixel(fb, 5, 118) == (0, 0, 0, 0)
+    assert _pixel(fb, 0, 117) == (0, 0, 0, 0)
+
+
+def test_translucent_brush_blends_with_existing_pixels():
+    fb = Framebuffer(4, 4)
+    fb.clear(bytes((0, 0, 0, 255)))
+    fb.rectangle(0, 0, 4, 4, bytes((255, 255, 255, 128)))
+    assert _pixel(fb, 2, 2) == (128, 128, 128, 255)
+
+
+def test_screen_draw_and_text_rasterize_into_framebuffer(monkeypatch):
+    for name in ("font", "brush"):
+        monkeypatch.setattr(screen, name, getattr(screen, name))
+    monkeypatch.setattr(screen, "framebuffer", Framebuffer(160, 120))
+    screen.brush = brushes.color(0, 0, 0)
+    screen.draw(shapes.rectangle(0, 0, 160, 120))
+    screen.brush = brushes.color(255, 255, 255)
+    screen.font = None  # built-in font (apps imported earlier may have set one)
+    screen.text("Hi", 10, 10)
+    lit = [
+        (x, y)
+        for y in range(120)
+        for x in range(160)
+        if _pixel(screen.framebuffer, x, y)[0] == 255
+    ]
+    assert lit
+    assert all(10 <= x < 22 and 10 <= y < 20 for x, y in lit)
+
+
+def test_ppm_export_is_rgb_sized():
+    ppm = Framebuffer(160, 120).to_ppm()
+    assert ppm.startswith(b"P6 160 120 255\n")
+    assert len(ppm) == len(b"P6 160 120 255\n") + 160 * 120 * 3
+
+
+def test_window_is_a_cached_clipped_view_of_the_screen(monkeypatch):
+    monkeypatch.setattr(screen, "framebuffer", Framebuffer(16, 12))
+    floor = screen.window(0, 8, 16, 12)
+    assert floor is screen.window(0, 8, 16, 12)
+    assert floor.framebuffer.pixels is screen.framebuffer.pixels
+    assert floor.framebuffer.clip == (0, 0, 16, 4)
+
+    floor.brush = brushes.color(0, 255, 0)
+    floor.draw(shapes.rectangle(0, 0, 16, 12))  # clipped to the screen's bottom rows
+    floor.draw(shapes.circle(2, -1, 2))  # nothing above the window
+    assert _pixel(screen.framebuffer, 5, 7) == (0, 0, 0, 0)
+    assert _pixel(screen.framebuffer, 5, 8) == (0, 255, 0, 255)
+    assert _pixel(screen.framebuffer, 15, 11) == (0, 255, 0, 255)
+
+    inner = screen.window(4, 2, 4, 4)
+    inner.brush = brushes.color(255, 0, 0, 128)
+    inner.draw(shapes.rectangle(-2, -2, 20, 20))
+    lit = {(x, y) for y in range(12) for x in range(16) if _pixel(screen.framebuffer, x, y)[0]}
+    assert lit == {(x, y) for x in range(4, 8) for y in range(2, 6)}
@@ -0,0 +1,117 @@
+import os
+import struct
+import zlib
+
+from badgeware import Image, SpriteSheet, screen
+from badgeware._framebuffer import Framebuffer
+from badgeware._image import ImageCache, PixelData, image_cache
+from badgeware._png import SIGNATURE, _chunk, _paeth, decode_png, encode_png
+
+
+def _filtered_png(width, height, rgba):
+    """Encode with every PNG filter type in turn (encode_png only writes type 0)."""
+    stride = width * 4
+    prev = bytes(stride)
+    raw = bytearray()
+    for y in range(height):
+        line = rgba[y * stride:(y + 1) * stride]
+        kind = y % 5
+        out = bytearray()
+        for i, v in enumerate(line):
+            left = line[i - 4] if i >= 4 else 0
+            up_left = prev[i - 4] if i >= 4 else 0
+            predictor = (0, left, prev[i], (left + prev[i]) >> 1, _paeth(left, prev[i], up_left))[kind]
+            out.append((v - predictor) & 0xFF)
+        raw += bytes([kind]) + out
+        prev = line
+    return b"".join((
+        SIGNATURE,
+        _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)),
+        _chunk(b"IDAT", zlib.compress(bytes(raw))),
+        _chunk(b"IEND", b""),
+    ))
+
+
+def test_decode_handles_all_filter_types():
+    pixels = bytes((x * 37 + y * 11 + c * 5) & 0xFF for y in range(7) for x in range(5) for c in range(4))
+    assert decode_png(_filtered_png(5, 7, pixels)) == (5, 7, bytearray(pixels))
+
+
+def test_image_load_decodes_real_assets_and_caches():
+    icon = Image.load("/system/apps/hello/icon.png")
+    again = Image.load("/system/apps/hello/icon.png")
+    assert (icon.width, icon.height) == (36, 24)
+    assert icon.data is again.data  # one decoded buffer shared by both images
+    assert Image.load("/system/missing.png").data is None  # placeholder fallback
+
+
+def test_cache_invalidates_on_mtime_and_evicts_by_bytes(tmp_path):
+    cache = ImageCache(max_bytes=2 * 16 * 4)
+    a, b, c = (tmp_path / f"{n}.png" for n in "abc")
+    for path in (a, b, c):
+        path.write_bytes(encode_png(4, 4, b"\x00\x00\x00\xff" * 16))
+
+    cache.load(a)
+    cache.load(a)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    stat = a.stat()
+    os.utime(a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    cache.load(a)  # edited file: decoded again, replacing the old decode
+    assert cache.misses == 2
+    assert len(cache) == 1 and cache.resident_bytes == 64 and cache.evictions == 0
+
+    cache.load(b)
+    cache.load(c)
+    assert len(cache) == 2 and cache.resident_bytes == 2 * 64
+    assert cache.evictions >= 1
+    assert "hit_rate=" in cache.summary()
+
+
+def test_blit_copies_opaque_runs_and_skips_transparent_pixels():
+    red, clear, half = b"\xff\x00\x00\xff", b"\x00\x00\x00\x00", b"\x00\x00\xff\x80"
+    sprite = PixelData(3, 1, red + clear + half)
+    assert sprite.runs == [((0, 1, True), (2, 3, False))]
+
+    fb = Framebuffer(4, 1)
+    fb.clear(b"\x00\xff\x00\xff")
+    fb.blit(sprite, 1, 0)
+    assert fb.pixels[0:4] == b"\x00\xff\x00\xff"
+    assert fb.pixels[4:8] == red
+    assert fb.pixels[8:12] == b"\x00\xff\x00\xff"
+    assert fb.pixels[12:16] == bytes((0, 127, 128, 255))
+
+
+def test_scale_blit_mirrors_on_negative_width():
+    img = Image(2, 1, PixelData(2, 1, b"\xff\x00\x00\xff\x00\x00\xff\xff"))
+    screen.scale_blit(img, 0, 0, -4, 1)
+    row = bytes(screen.framebuffer.pixels[0:16])
+    assert row == b"\x00\x00\xff\xff" * 2 + b"\xff\x00\x00\xff" * 2
+
+
+def test_sprite_sheet_frames_are_cached_zero_copy_views(tmp_path):
+    # 4x2 sheet of 2x2 frames; each frame is filled with its own index
+    pixels = bytes(
+        v for y in range(4) for x in range(8) for v in ((y // 2) * 4 + x // 2, 0, 0, 255)
+    )
+    path = tmp_path / "sheet.png"
+    path.write_bytes(encode_png(8, 4, pixels))
+    sheet = SpriteSheet(str(path), 4, 2)
+
+    sprite = sheet.sprite(1, 1)
+    assert sprite is sheet.sprite(1, 1)
+    assert (sprite.width, sprite.height) == (2, 2)
+    assert isinstance(sprite.data.pixels, memoryview)
+    assert sprite.data.pixels.obj is image_cache.load(str(path)).pixels
+
+    anim = sheet.animation(2, 0, 4)  # runs on into the second row
+    assert anim is sheet.animation(2, 0, 4)
+    assert anim.count() == 4
+    assert anim.frame(2) is sheet.sprite(0, 1)
+    assert anim.frame(5.7) is anim.frame(1)
+    assert sheet.animation().count() == 4
+
+    fb = Framebuffer(3, 2)
+    fb.blit(sprite.data, 1, 0)
+    assert bytes(fb.pixels) == (bytes(4) + bytes((5, 0, 0, 255)) * 2) * 2
+    assert sprite.data.scaled(1, 1).pixels == bytes((5, 0, 0, 255))
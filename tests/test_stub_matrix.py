@@ -0,0 +1,48 @@
+import math
+
+import pytest
+from badgeware import Matrix, brushes, screen, shapes
+from badgeware._framebuffer import Framebuffer
+
+
+def _lit(fb):
+    return {(i // 4 % fb.width, i // 4 // fb.width) for i in range(0, len(fb.pixels), 4) if fb.pixels[i + 3]}
+
+
+def test_chained_transforms_apply_right_to_left():
+    m = Matrix().translate(10, 20).scale(2, 3)
+    assert m.apply(1, 1) == (12, 23)
+    assert not m.translate_only and m.axis_aligned
+
+    r = Matrix().rotate(90)
+    x, y = r.apply(1, 0)
+    assert (x, y) == pytest.approx((0, 1))
+    assert r.rotate_radians(-math.pi / 2).apply(3, 4) == pytest.approx((3, 4))
+    assert r.uniform_scale == pytest.approx(1)
+    assert Matrix().scale(2, 1).uniform_scale is None
+
+    combined = Matrix().translate(5, 0).multiply(Matrix().scale(2))
+    assert combined.apply(1, 1) == Matrix().translate(5, 0).scale(2).apply(1, 1)
+
+
+def test_translate_only_fast_path_and_batch_points():
+    m = Matrix().translate(3, 4).translate(1, 1)
+    assert m.translate_only
+    assert m.transform_points([(0, 0), (1, 2)]) == [(4, 5), (5, 7)]
+    assert Matrix().scale(2).translate(1, 1).transform_points([(0, 0)]) == [(2, 2)]
+
+
+def test_screen_draws_shapes_through_their_transform(monkeypatch):
+    monkeypatch.setattr(screen, "framebuffer", Framebuffer(20, 20))
+    monkeypatch.setattr(screen, "brush", brushes.color(255, 255, 255))
+    rect = shapes.rectangle(0, 0, 1, 1)
+    rect.transform = Matrix().translate(4, 6).scale(3, 2)
+    screen.draw(rect)
+    assert _lit(screen.framebuffer) == {(x, y) for x in range(4, 7) for y in range(6, 8)}
+
+    monkeypatch.setattr(screen, "framebuffer", Framebuffer(20, 20))
+    rect = shapes.rectangle(-2, -2, 4, 4)
+    rect.transform = Matrix().translate(10, 10).rotate(45)
+    screen.draw(rect)
+    lit = _lit(screen.framebuffer)
+    assert {(10, 8), (10, 11), (8, 10), (11, 10)} <= lit and (8, 8) not in lit  # a diamond
@@ -0,0 +1,84 @@
+import importlib.util
+
+import pytest
+from badgeware._memory import BudgetExceeded, MemoryBudget
+
+APP = '''\
+sheet = bytearray(64 * 1024)  # decoded at import
+frames = 0
+
+
+def update():
+    global frames
+    frames += 1
+    if frames == 3:
+        resp = b""
+        for _ in range(8):
+            resp += bytes(32 * 1024)  # a whole response buffered in memory
+'''
+
+
+def _app(tmp_path):
+    app_dir = tmp_path / "fakeapp"
+    app_dir.mkdir()
+    (app_dir / "__init__.py").write_text(APP)
+    spec = importlib.util.spec_from_file_location("fakeapp", app_dir / "__init__.py")
+    return app_dir, spec
+
+
+def _load(spec):
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def test_import_and_frame_peaks_are_attributed_to_the_app(tmp_path):
+    app_dir, spec = _app(tmp_path)
+    budget = MemoryBudget(app_dir, budget=1024 * 1024).install()
+    try:
+        app = _load(spec)
+        imported = budget.end_frame("import")
+        update = budget.wrap(app.update)
+        for _ in range(4):
+            update()
+    finally:
+        budget.uninstall()
+
+    assert imported.app >= 64 * 1024
+    assert imported.sites[0][0] == "fakeapp/__init__.py:1"
+    peaks = [frame.peak - frame.heap for frame in budget.frames[1:]]
+    # the buffered response is transient: it shows in frame 2's peak only
+    assert peaks[2] >= 256 * 1024 > max(peaks[:2] + peaks[3:])
+    assert budget.peak == budget.frames[3].peak
+    assert "peak heap" in budget.report()
+
+
+def test_frames_over_budget_fail_with_their_sites(tmp_path):
+    app_dir, spec = _app(tmp_path)
+    budget = MemoryBudget(app_dir, budget=200 * 1024).install()
+    try:
+        app = _load(spec)
+        budget.end_frame("import")
+        update = budget.wrap(app.update)
+        update()
+        update()
+        with pytest.raises(BudgetExceeded, match="frame 3: peak heap .* over the 200.0KB budget") as exc:
+            update()
+    finally:
+        budget.uninstall()
+
+    assert "fakeapp/__init__.py:1" in str(exc.value)
+    assert len(budget.frames) == 4
+
+
+def test_errors_in_update_are_not_replaced_by_the_budget_check(tmp_path):
+    app_dir, _spec = _app(tmp_path)
+    budget = MemoryBudget(app_dir, budget=1).install()
+    try:
+        update = budget.wrap(lambda: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            update()
+    finally:
+        budget.uninstall()
+
+    assert budget.frames == []
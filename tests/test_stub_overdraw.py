@@ -0,0 +1,82 @@
+import pytest
+from badgeware import Image, brushes, screen, shapes
+from badgeware._framebuffer import Framebuffer
+from badgeware._image import PixelData
+from badgeware._overdraw import OverdrawAnalyzer
+
+
+@pytest.fixture(autouse=True)
+def scratch_screen(monkeypatch):
+    # the frames below repaint the shared screen with their own brushes
+    monkeypatch.setattr(screen, "brush", screen.brush)
+    monkeypatch.setattr(screen, "framebuffer", Framebuffer(160, 120))
+
+
+def _frame():
+    screen.brush = brushes.color(0, 0, 0)
+    screen.clear()
+    screen.brush = brushes.color(255, 0, 0)
+    screen.draw(shapes.rectangle(10, 10, 4, 4))  # painted over below
+    screen.draw(shapes.rectangle(500, 10, 4, 4))  # entirely off screen
+    screen.brush = brushes.color(0, 0, 255)
+    screen.draw(shapes.rectangle(8, 8, 8, 8))
+
+
+def test_overdraw_finds_covered_and_invisible_commands():
+    analyzer = OverdrawAnalyzer().install()
+    try:
+        analyzer.wrap(_frame)()
+        analyzer.wrap(_frame)()
+    finally:
+        analyzer.uninstall()
+
+    first, second = analyzer.frames
+    assert first.commands == 4
+    assert (first.invisible, first.covered) == (1, 1)
+    assert first.touched == 160 * 120
+    assert first.writes == 160 * 120 + 16 + 64
+    assert first.max_writes == 3
+    assert second.identical == 1.0
+
+    sites = {op for op, _ in analyzer.hidden_sites}
+    assert sites == {"screen.draw"}
+    assert all("test_stub_overdraw.py" in site for _, site in analyzer.hidden_sites)
+    assert "covered/frame=1.0" in analyzer.report()
+
+
+def test_translucent_draw_keeps_underlying_command_visible():
+    analyzer = OverdrawAnalyzer().install()
+    try:
+        def frame():
+            screen.brush = brushes.color(0, 0, 0)
+            screen.clear()
+            screen.brush = brushes.color(255, 255, 255, 128)
+            screen.clear()
+
+        result = analyzer.wrap(frame)()
+    finally:
+        analyzer.uninstall()
+
+    assert result is None
+    assert analyzer.frames[0].covered == 0
+
+
+def test_blits_are_recorded_and_cover_what_they_draw_over():
+    sprite = Image(4, 4, PixelData(4, 4, bytes((0, 255, 0, 255)) * 16))
+    analyzer = OverdrawAnalyzer().install()
+    try:
+        def frame():
+            screen.brush = brushes.color(255, 0, 0)
+            screen.draw(shapes.rectangle(20, 20, 4, 4))  # hidden by the sprite
+            screen.blit(sprite, 20, 20)
+            screen.scale_blit(sprite, 40, 20, 8, 8)
+            screen.blit(sprite, 500, 20)  # entirely off screen
+
+        analyzer.wrap(frame)()
+    finally:
+        analyzer.uninstall()
+
+    result = analyzer.frames[0]
+    assert result.writes == 16 + 16 + 64
+    assert (result.invisible, result.covered) == (1, 1)
+    assert {op for op, _ in analyzer.hidden_sites} == {"screen.draw", "screen.blit"}
@@ -0,0 +1,44 @@
+import badgeware as bw
+from badgeware._framebuffer import Framebuffer
+from badgeware._profiler import Profiler
+
+
+def test_profiler_counts_primitives_per_frame(monkeypatch):
+    monkeypatch.setattr(bw.screen, "brush", bw.screen.brush)
+    monkeypatch.setattr(bw.screen, "framebuffer", Framebuffer(160, 120))
+    profiler = Profiler().install()
+    try:
+        def update():
+            # names bound before install (like app imports) are still counted
+            for i in range(3):
+                rect = bw.shapes.rectangle(i, 0, 2, 2)
+                rect.transform = bw.Matrix().translate(i, 0)
+                bw.screen.draw(rect)
+            bw.screen.brush = bw.brushes.color(255, 255, 255)
+            bw.screen.text("hi", 0, 0)
+
+        profiled = profiler.wrap(update, "demo")
+        profiled()
+        profiled()
+    finally:
+        profiler.uninstall()
+
+    calls = profiler.calls()
+    assert calls["Matrix()"] == (6, 3.0, 3)
+    assert calls["screen.draw"][0] == 6
+    assert calls["shapes.rectangle"][0] == 6
+    assert calls["brushes.color"][0] == 2
+    assert calls["screen.text"][0] == 2
+    assert len(profiler.update_times["demo"]) == 2
+    assert sum(count for _, count in profiler.histogram("demo")) == 2
+    assert "Matrix()" in profiler.report()
+
+
+def test_uninstall_restores_stub():
+    original = type(bw.screen).draw
+    profiler = Profiler().install()
+    assert type(bw.screen).draw is not original
+    profiler.uninstall()
+    assert type(bw.screen).draw is original
+    bw.screen.draw(bw.shapes.rectangle(0, 0, 1, 1))
+    assert profiler.frames == []
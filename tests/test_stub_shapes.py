@@ -0,0 +1,59 @@
+import pytest
+from badgeware import Image, Matrix, brushes, screen, shapes
+from badgeware._framebuffer import Framebuffer
+from badgeware._geometry import outline
+
+
+@pytest.fixture
+def canvas(monkeypatch):
+    monkeypatch.setattr(screen, "framebuffer", Framebuffer(40, 40))
+    monkeypatch.setattr(screen, "brush", brushes.color(255, 255, 255))
+    monkeypatch.setattr(screen, "antialias", Image.OFF)
+    screen.framebuffer.clear(b"\x00\x00\x00\xff")
+    return screen.framebuffer
+
+
+def _alpha(fb, x, y):
+    # white drawn over black: the red channel is the coverage
+    return fb.pixels[(y * fb.width + x) * 4]
+
+
+@pytest.mark.parametrize("kind, args", [
+    ("rounded_rectangle", (5, 5, 30, 30, 6)),
+    ("squircle", (20, 20, 15)),
+    ("pie", (21, 20, 15, 0, 180)),
+    ("line", (5, 5, 35, 35, 3)),
+    ("regular_polygon", (20, 20, 15, 5)),
+    ("circle", (20, 20, 15)),
+])
+def test_every_shape_rasterizes(canvas, kind, args):
+    screen.draw(getattr(shapes, kind)(*args))
+    assert _alpha(canvas, 20, 20) == 255
+    assert _alpha(canvas, 0, 0) == 0
+
+
+def test_rounded_corners_and_pie_orientation(canvas):
+    screen.draw(shapes.rounded_rectangle(0, 0, 20, 20, 8))
+    assert _alpha(canvas, 0, 0) == 0 and _alpha(canvas, 10, 0) == 255
+    # 0 degrees points down and angles run clockwise: 0..90 is the lower left
+    screen.draw(shapes.pie(30, 30, 8, 0, 90))
+    assert _alpha(canvas, 26, 33) == 255 and _alpha(canvas, 33, 33) == 0
+
+
+def test_antialias_blends_edges_and_fills_interior(canvas):
+    screen.antialias = Image.X2
+    screen.draw(shapes.rectangle(2.5, 2, 10, 4))
+    assert _alpha(canvas, 2, 3) == 128  # half covered
+    assert _alpha(canvas, 3, 3) == 255 and _alpha(canvas, 12, 3) == 128
+
+    screen.draw(shapes.circle(25, 25, 8))
+    edge = [_alpha(canvas, x, 25) for x in range(15, 35)]
+    assert 0 < edge[2] < 255 and edge[10] == 255
+
+
+def test_outline_follows_transform_scale(canvas):
+    assert len(outline("circle", (0, 0, 1), scale=40)) > len(outline("circle", (0, 0, 1)))
+    shape = shapes.squircle(0, 0, 1, 6)
+    shape.transform = Matrix().translate(20, 20).scale(10)
+    screen.draw(shape)
+    assert _alpha(canvas, 28, 28) == 255  # squircles fill their corners
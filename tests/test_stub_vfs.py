@@ -0,0 +1,61 @@
+import pytest
+from badgeware._paths import VirtualFS
+
+
+@pytest.fixture
+def fs(tmp_path):
+    system = tmp_path / "badge"
+    (system / "apps" / "demo").mkdir(parents=True)
+    (system / "apps" / "demo" / "icon.png").write_bytes(b"icon")
+    (system / "assets").mkdir()
+    (system / "assets" / "font.ppf").write_bytes(b"font")
+    (system / "main.py").write_text("")
+    return VirtualFS(system=system, root=tmp_path / "root")
+
+
+def test_mounts_map_system_paths_onto_the_repo(fs, tmp_path):
+    assert fs.resolve("/system/apps/demo/icon.png") == str(tmp_path / "badge/apps/demo/icon.png")
+    assert fs.resolve("/system/assets/font.ppf") == str(tmp_path / "badge/assets/font.ppf")
+    assert fs.isfile("/system/main.py") and fs.isdir("/system/apps")
+    assert not fs.exists("/avatar.png")
+    assert fs.listdir("/") == ["system"]
+    assert fs.listdir("/system") == ["apps", "assets", "main.py"]
+    with pytest.raises(FileNotFoundError):
+        fs.listdir("/nope")
+
+
+def test_relative_paths_follow_the_virtual_cwd(fs):
+    fs.chdir("/system/apps/demo")
+    assert fs.getcwd() == "/system/apps/demo"
+    assert fs.exists("icon.png") and fs.exists("../../assets/font.ppf")
+    with fs.open("icon.png", "rb") as f:
+        assert f.read() == b"icon"
+    with pytest.raises(FileNotFoundError):
+        fs.chdir("/system/apps/missing")
+
+
+def test_writes_go_to_the_overlay_and_refresh_the_cache(fs, tmp_path):
+    assert not fs.exists("/contrib_data.json")
+    with fs.open("/contrib_data.json", "w") as f:
+        f.write("{}")
+    assert fs.isfile("/contrib_data.json")
+    assert (tmp_path / "root" / "contrib_data.json").read_text() == "{}"
+    assert fs.listdir("/") == ["contrib_data.json", "system"]
+
+    # appending to a mounted file copies it up; the repo copy is untouched
+    with fs.open("/system/main.py", "a") as f:
+        f.write("x = 1\n")
+    assert fs.resolve("/system/main.py") == str(tmp_path / "root" / "system" / "main.py")
+    assert (tmp_path / "badge" / "main.py").read_text() == ""
+
+    fs.remove("/contrib_data.json")
+    assert not fs.exists("/contrib_data.json")
+
+
+def test_host_paths_pass_through(fs, tmp_path):
+    host = tmp_path / "real.txt"
+    assert not fs.exists(host)
+    host.write_text("real")  # host results are never cached
+    assert fs.is_virtual(str(host)) is False
+    assert fs.resolve(str(host)) == str(host)
+    assert fs.isfile(str(host))
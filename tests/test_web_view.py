@@ -0,0 +1,70 @@
+import json
+import struct
+import urllib.request
+
+from badgeware._framebuffer import Framebuffer
+from web_view import WebView, apply_delta, encode_delta, rle
+
+WHITE = bytes((255, 255, 255, 255))
+
+
+def _black():
+    # what a page holds before its first message
+    return bytearray(b"\x00\x00\x00\xff" * (160 * 120))
+
+
+def _rgb(pixels):
+    rgb = bytearray(pixels)
+    del rgb[3::4]
+    return rgb
+
+
+def test_deltas_round_trip_and_stay_small():
+    fb = Framebuffer(160, 120)
+    fb.rectangle(10, 10, 50, 40, bytes((200, 30, 90, 255)))
+    first = bytes(fb.pixels)
+    fb.rectangle(40, 100, 3, 2, WHITE)
+
+    page = _black()
+    full = encode_delta(None, first, 160, 120)
+    apply_delta(page, 160, full[4:])
+    assert _rgb(page) == _rgb(first)
+    delta = encode_delta(first, fb.pixels, 160, 120)
+    assert apply_delta(page, 160, delta[4:]) == [(32, 100, 48, 102)]
+    assert _rgb(page) == fb.rgb_bytes()
+    assert struct.unpack("<I", delta[:4])[0] == len(delta) - 4 < 60
+
+
+def test_rle_collapses_zero_runs():
+    assert rle(bytes(300)) == bytes((0xFF, 0xFF, 0x80 | 43))
+    assert rle(b"\x01\x00\x00\x02") == b"\x03\x01\x00\x00\x02"
+
+
+def test_browser_stream_and_input():
+    fb = Framebuffer(160, 120)
+    with WebView(fb) as web:
+        page = urllib.request.urlopen(web.url, timeout=5).read()
+        assert b'width="160"' in page
+
+        fb.rectangle(0, 0, 160, 120, bytes((0, 0, 255, 255)))
+        web.present()
+        stream = urllib.request.urlopen(web.url + "frames", timeout=5)
+        pixels = _black()
+        length = struct.unpack("<I", stream.read(4))[0]
+        apply_delta(pixels, 160, stream.read(length))
+        assert pixels == fb.pixels
+
+        fb.rectangle(70, 60, 1, 1, WHITE)
+        web.present()
+        web.present()  # unchanged: nothing is sent
+        length = struct.unpack("<I", stream.read(4))[0]
+        apply_delta(pixels, 160, stream.read(length))
+        assert pixels == fb.pixels and length < 40
+
+        for event in ({"button": "A", "action": "press"}, {"button": "UP", "action": "down"}):
+            request = urllib.request.Request(web.url + "input", data=json.dumps(event).encode(), method="POST")
+            assert urllib.request.urlopen(request, timeout=5).status == 204
+        assert web.drain_input() == [("A", "press"), ("UP", "down")]
+        assert web.drain_input() == []
+        stream.close()
+    assert web.frames_sent == 2
@@ -0,0 +1,156 @@
+"""
+App discovery and isolated loading for the desktop emulator.
+
+On the badge only one app is imported per boot, and ``badge/main.py`` deletes
+``sys.modules["ui"]``/``["icon"]`` so the next app can import its own. In
+the emulator apps are switched at runtime. Several apps also define
+same-named sibling modules (``ui`` in menu, monapet, sketch and quest;
+``mona`` in flappy and monapet).
+
+``AppLoader`` gives every app its own module namespace:
+
+- while an app is imported or running, its directory is first on
+  ``sys.path`` and only its own sibling modules are in ``sys.modules``
+- on switching away, those modules are taken out of ``sys.modules`` and
+  cached with the app, so switching back is a dictionary swap, not a
+  fresh import
+"""
+from __future__ import annotations
+
+import importlib
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+
+APPS_DIR = Path(__file__).resolve().parents[1] / "badge" / "apps"
+PACKAGE = "badge.apps"
+# system apps the emulator's own menu stands in for (as on the badge menu)
+SYSTEM_APPS = ("menu", "startup")
+
+
+def discover_apps(apps_dir: Path = APPS_DIR, exclude=SYSTEM_APPS) -> list[str]:
+    """Names of app packages (directories with ``__init__.py``), sorted."""
+    return sorted(
+        entry.name
+        for entry in apps_dir.iterdir()
+        if entry.is_dir() and (entry / "__init__.py").exists() and entry.name not in exclude
+    )
+
+
+@dataclass
+class LoadedApp:
+    name: str
+    module: ModuleType
+    directory: Path
+    # sibling modules imported by bare name ("ui", "mona"), kept out of
+    # sys.modules while another app is active
+    siblings: dict[str, ModuleType] = field(default_factory=dict)
+
+
+class AppLoader:
+    """Imports apps once each and swaps their module graphs in and out."""
+
+    def __init__(self, apps_dir: Path = APPS_DIR, package: str = PACKAGE):
+        self.apps_dir = Path(apps_dir)
+        self.package = package
+        self.active: LoadedApp | None = None
+        self._cache: dict[str, LoadedApp] = {}
+        # bare-name modules of other apps loaded outside the loader (stashed
+        # while an app runs so they cannot shadow its siblings)
+        self._stashed: dict[str, ModuleType] = {}
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._cache
+
+    def activate(self, name: str) -> ModuleType:
+        """Make ``name`` the running app, importing it on first use."""
+        if self.active is not None and self.active.name == name:
+            return self.active.module
+        self.deactivate()
+        self._stash_foreign(self.apps_dir / name)
+        app = self._cache.get(name)
+        if app is None:
+            app = self._import(name)
+            self._cache[name] = app
+        else:
+            sys.modules.update(app.siblings)
+            sys.path.insert(0, str(app.directory))
+        self.active = app
+        return app.module
+
+    def deactivate(self) -> None:
+        """Take the running app's sibling modules out of ``sys.modules``."""
+        app = self.active
+        if app is None:
+            return
+        for bare, mod in app.siblings.items():
+            if sys.modules.get(bare) is mod:
+                del sys.modules[bare]
+        _remove_path(str(app.directory))
+        self.active = None
+        for bare, mod in self._stashed.items():
+            sys.modules.setdefault(bare, mod)
+        self._stashed = {}
+
+    def _stash_foreign(self, directory: Path) -> None:
+        root = str(self.apps_dir.resolve())
+        for mod_name, mod in list(sys.modules.items()):
+            if mod_name.startswith(self.package + "."):
+                continue
+            path = getattr(mod, "__file__", None) or ""
+            if path.startswith(root) and not _defined_in(mod, directory):
+                self._stashed[mod_name] = sys.modules.pop(mod_name)
+
+    def forget(self, name: str) -> None:
+        """Drop a cached app so the next ``activate`` imports it from scratch."""
+        if self.active is not None and self.active.name == name:
+            self.deactivate()
+        app = self._cache.pop(name, None)
+        if app is not None:
+            prefix = f"{self.package}.{name}"
+            for mod_name in [n for n in sys.modules if n == prefix or n.startswith(prefix + ".")]:
+                del sys.modules[mod_name]
+
+    def _import(self, name: str) -> LoadedApp:
+        directory = self.apps_dir / name
+        before = set(sys.modules)
+        path_before = list(sys.path)
+        sys.path.insert(0, str(directory))
+        try:
+            module = importlib.import_module(f"{self.package}.{name}")
+        except BaseException:
+            # leave nothing half-imported behind for the next app
+            for mod_name in set(sys.modules) - before:
+                if _defined_in(sys.modules[mod_name], directory):
+                    del sys.modules[mod_name]
+            sys.path[:] = path_before
+            for bare, mod in self._stashed.items():
+                sys.modules.setdefault(bare, mod)
+            self._stashed = {}
+            raise
+        # apps prepend their on-device directory (/system/apps/<name>); drop it
+        sys.path[:] = [str(directory)] + path_before
+        siblings = {
+            mod_name: sys.modules[mod_name]
+            for mod_name in set(sys.modules) - before
+            if not mod_name.startswith(self.package + ".") and _defined_in(sys.modules[mod_name], directory)
+        }
+        return LoadedApp(name, module, directory, siblings)
+
+
+def _defined_in(module: ModuleType, directory: Path) -> bool:
+    path = getattr(module, "__file__", None)
+    if not path:
+        return False
+    try:
+        return Path(path).resolve().parent == directory.resolve()
+    except OSError:
+        return False
+
+
+def _remove_path(entry: str) -> None:
+    try:
+        sys.path.remove(entry)
+    except ValueError:
+        pass
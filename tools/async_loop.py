@@ -0,0 +1,190 @@
+"""
+asyncio main loop for the desktop emulators.
+
+Rendering and input are one task on the event loop; each app's ``update()``
+runs on its own single worker thread. A frame whose deadline passes while
+the app is still inside ``update()`` (a synchronous fetch, a WLAN scan) is
+counted as a stall and the window keeps presenting the last finished
+frame, so a slow network call shows up as measurable latency instead of a
+frozen window. While the loop runs, the ``network`` stub awaits DNS lookups
+and scans from app threads on it.
+
+Several apps can be driven at once for network stress tests. They share
+``screen`` and ``io``, so their pixels mix; only the timings are meaningful.
+One simulated clock moves ``io.ticks`` a frame forward per frame for all of
+them, including frames an app stalled through.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from frame_scheduler import FrameScheduler
+from headless import RunStats, SimulatedClock
+
+
+@dataclass
+class AppStats(RunStats):
+    """``RunStats`` plus frames that were due while ``update()`` was still running."""
+
+    name: str = ""
+    stalled: int = 0
+    # longest run of consecutive stalled frames
+    longest_stall: int = 0
+
+    def summary(self) -> str:
+        return f"[{self.name}] {super().summary()} stalled={self.stalled} longest_stall={self.longest_stall}"
+
+
+@dataclass
+class AppTask:
+    """One app driven by the loop; ``update`` runs on a private worker thread.
+
+    ``clock`` is the loop's shared clock; the task only sets ``ticks_delta``
+    to the time since its own last update, which spans any stalled frames.
+    """
+
+    name: str
+    update: Callable[[], None]
+    clock: SimulatedClock
+    # called on the loop thread right before each update (input, tracing)
+    before_update: Callable[[], None] | None = None
+    # called on the loop thread after each update finishes
+    after_update: Callable[[], None] | None = None
+    stats: AppStats = field(default_factory=AppStats)
+    _pending: asyncio.Future | None = None
+    _stall_run: int = 0
+    _last_ticks: int = 0
+
+    def __post_init__(self):
+        self.stats.name = self.name
+        self._last_ticks = self.clock.io.ticks
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix=f"app-{self.name}")
+
+    @property
+    def busy(self) -> bool:
+        return self._pending is not None and not self._pending.done()
+
+    def ready(self) -> bool:
+        """Finish the last update, or count a stall if it is still running."""
+        if self.busy:
+            self.stats.stalled += 1
+            self._stall_run += 1
+            self.stats.longest_stall = max(self.stats.longest_stall, self._stall_run)
+            return False
+        self.collect()
+        self._stall_run = 0
+        return True
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start the update for the frame the clock has just advanced to."""
+        io = self.clock.io
+        io.ticks_delta = io.ticks - self._last_ticks
+        self._last_ticks = io.ticks
+        if self.before_update is not None:
+            self.before_update()
+        self._pending = loop.run_in_executor(self._executor, self._timed_update)
+
+    def _timed_update(self) -> None:
+        started = time.perf_counter()
+        try:
+            self.update()
+        finally:
+            self.stats.update_times.append(time.perf_counter() - started)
+            self.stats.frames += 1
+
+    def collect(self) -> None:
+        """Report a finished update: re-raise its error or run ``after_update``."""
+        if self._pending is None or not self._pending.done():
+            return
+        pending, self._pending = self._pending, None
+        pending.result()
+        if self.after_update is not None:
+            self.after_update()
+
+    async def drain(self) -> None:
+        """Wait for the running update (if any) and release the worker."""
+        try:
+            if self._pending is not None:
+                await asyncio.wait([self._pending])
+                self.collect()
+        finally:
+            self._executor.shutdown(wait=False)
+
+
+class AsyncLoop:
+    """Paces frames for every added app and presents once per pass."""
+
+    def __init__(self, frame_ms: int = 33, time_scale: float = 1.0):
+        self.frame_ms = frame_ms
+        self.scheduler = FrameScheduler(frame_ms, time_scale)
+        self.apps: list[AppTask] = []
+        # one clock for every app, created with the first one's ``io``
+        self.clock: SimulatedClock | None = None
+        self._stop = False
+
+    def add(self, name: str, update: Callable[[], None], io, **hooks) -> AppTask:
+        if self.clock is None:
+            self.clock = SimulatedClock(io, self.frame_ms, start_ticks=io.ticks)
+        elif io is not self.clock.io:
+            raise ValueError("every app in one loop must share the same io")
+        app = AppTask(name, update, self.clock, **hooks)
+        self.apps.append(app)
+        return app
+
+    def stop(self) -> None:
+        """End ``run`` after the current pass."""
+        self._stop = True
+
+    async def run(self, frames: int | None = None, present=None) -> list[AppStats]:
+        """Drive the apps until ``stop()`` or until the first app ran ``frames`` updates.
+
+        ``present`` is called (on the loop) once per pass after the due
+        frames have been started; it may return an awaitable.
+        """
+        import network
+
+        loop = asyncio.get_running_loop()
+        network.attach_loop(loop)
+        self._stop = False
+        started = time.perf_counter()
+        try:
+            while not self._stop:
+                for step in range(await self.scheduler.wait_async()):
+                    if step:
+                        # catch-up frames run back to back; an update only
+                        # stalls one if it needs more than a frame period
+                        await self._settle(self.scheduler.period)
+                    # stalls are decided (and finished frames reported)
+                    # before time moves on to the new frame
+                    ready = [app for app in self.apps if app.ready()]
+                    if self.clock is not None:
+                        self.clock.tick()
+                    for app in ready:
+                        app.start(loop)
+                # let finished updates report before presenting
+                await asyncio.sleep(0)
+                for app in self.apps:
+                    app.collect()
+                if present is not None:
+                    result = present()
+                    if asyncio.iscoroutine(result):
+                        await result
+                if frames is not None and self.apps and self.apps[0].stats.frames >= frames:
+                    break
+        finally:
+            for app in self.apps:
+                await app.drain()
+            network.attach_loop(None)
+            wall = time.perf_counter() - started
+            for app in self.apps:
+                app.stats.wall_time = wall
+        return [app.stats for app in self.apps]
+
+    async def _settle(self, timeout: float) -> None:
+        running = [app._pending for app in self.apps if app._pending is not None and not app._pending.done()]
+        if running:
+            await asyncio.wait(running, timeout=timeout)
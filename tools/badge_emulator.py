@@ -10,39 +10,53 @@ Emulates the complete badge experience with:
 
 Usage:
     python tools/badge_emulator.py
+    python tools/badge_emulator.py --time-scale 10   # fast-forward simulated time
 """
 from __future__ import annotations
 
-import importlib
+import argparse
+import asyncio
 import sys
 import time
-from pathlib import Path
 from types import ModuleType
 
 # Ensure repo root and test stubs are importable
-REPO = Path(__file__).resolve().parents[1]
-STUBS = REPO / "tests" / "_stubs"
-if str(STUBS) not in sys.path:
-    sys.path.insert(0, str(STUBS))
-if str(REPO) not in sys.path:
-    sys.path.insert(0, str(REPO))
-
-# Import the stubbed badgeware
+import stub_paths  # noqa: F401
+
+# isort: split
+
+# Import the stubbed badgeware, the network and socket stubs (so WiFi and
+# HC911 work with real network on desktop) and the emulator helpers that
+# live next to this script
+import socket  # type: ignore
+
 import badgeware as bw  # type: ignore
+import network  # type: ignore
+from app_loader import AppLoader, discover_apps
+from async_loop import AsyncLoop
+from badgeware._framebuffer import Framebuffer  # type: ignore
+from badgeware._paths import vfs  # type: ignore
+from frame_export import FrameExporter, open_encoder
+from framebuffer_view import FramebufferView
+
 io = bw.io
 
-# Also ensure network and socket are available from stubs
-# This allows WiFi and HC911 apps to work with real network on desktop
-import network  # type: ignore
-import socket  # type: ignore
+# Apps chdir into /system/apps/<name> and read /system/assets; map those
+# onto the repo (writes go to $BADGE_ROOT) for badge code only
+vfs.install()
+
 sys.modules['network'] = network
 sys.modules['socket'] = socket
+# Badge code's socket/ssl/urllib.urequest go through network.route
+network.install()
 
 # Import secrets and make it available for apps that import from root
 # Apps try to do: sys.path.insert(0, "/"); from secrets import ...
 try:
     from badge import secrets  # type: ignore
     sys.modules['secrets'] = secrets
+    # the desktop "radio" can see the configured network
+    network.visible_ssids.append(secrets.WIFI_SSID)
     print(f"Loaded WiFi credentials: SSID='{secrets.WIFI_SSID}'")
 except Exception as e:
     print(f"Warning: Could not load secrets: {e}")
@@ -60,37 +74,19 @@ pressed_queue: set[int] = set()
 held_keys: set[int] = set()
 escape_pressed = False  # ESC key to return to menu
 
-# Available apps (mimics menu structure)
-# Note: Many apps require /system/ filesystem paths that only exist on hardware
-# These desktop-compatible apps work in the emulator:
-APPS = [
-    ("hello", "Hello World"),
-    ("life", "Game of Life"),
-    ("wifi", "WiFi Diagnostics"),
-    ("hc911", "HC 911 Incidents"),
-    # Require hardware filesystem (commented out for desktop emulator):
-    # ("badge", "Badge Info"),
-    # ("snake", "Snake"),
-    # ("flappy", "Flappy Mona"),
-    # ("monapet", "Mona Pet"),
-    # ("sketch", "Sketch Pad"),
-    # ("quest", "Quest Game"),
-    # ("commits", "GitHub Commits"),
-    # ("gallery", "Image Gallery"),
-]
+# Available apps: every package under badge/apps except the system menu and
+# startup animation (mimics the badge menu). Each entry is (name, title).
+# Apps that need hardware report why when launched.
+APPS = [(name, name) for name in discover_apps()]
+# Menu rows that fit between the title and the instructions
+MENU_ROWS = 8
 
 # State
 current_app_index = 0
 current_app_module = None
 in_menu = True
-
-
-def _to_hex(color):
-    """Convert RGB tuple to hex color string."""
-    if not isinstance(color, (tuple, list)):
-        return "#ffffff"
-    r, g, b = int(color[0]), int(color[1]), int(color[2])
-    return f"#{r:02x}{g:02x}{b:02x}"
+# Keeps each app's modules separate and cached between launches
+loader = AppLoader()
 
 
 try:
@@ -99,96 +95,19 @@ except Exception:
     tk = None
 
 
-class _VisualShape:
-    def __init__(self, kind: str, *args):
-        self.kind = kind
-        self.args = args
-
-
-class VisualShapes:
-    def circle(self, x: int, y: int, r: int):
-        return _VisualShape("circle", x, y, r)
-
-    def rectangle(self, x: int, y: int, w: int, h: int):
-        return _VisualShape("rectangle", x, y, w, h)
-
-    def rounded_rectangle(self, x: int, y: int, w: int, h: int, r: int = 5):
-        return _VisualShape("rounded_rectangle", x, y, w, h, r)
-
-
-class VisualScreen:
-    def __init__(self, canvas, x=0, y=0, w=WIDTH, h=HEIGHT, scale=SCALE):
-        self.width = w
-        self.height = h
-        self._canvas = canvas
-        self._origin_x = x
-        self._origin_y = y
-        self._scale = scale
-        self.brush = bw.brushes.color(255, 255, 255)
-        self.font = None
-
-    def _sx(self, x):
-        return (self._origin_x + x) * self._scale
-
-    def _sy(self, y):
-        return (self._origin_y + y) * self._scale
-
-    def draw(self, shape: _VisualShape):
-        if tk is None or not isinstance(shape, _VisualShape):
-            return None
-        color = _to_hex(self.brush)
-        if shape.kind == "circle":
-            x, y, r = shape.args
-            x0, y0 = self._sx(x - r), self._sy(y - r)
-            x1, y1 = self._sx(x + r), self._sy(y + r)
-            self._canvas.create_oval(x0, y0, x1, y1, outline=color, fill=color)
-        elif shape.kind == "rectangle":
-            x, y, w, h = shape.args
-            self._canvas.create_rectangle(self._sx(x), self._sy(y), self._sx(x + w), self._sy(y + h), outline=color, fill=color)
-        elif shape.kind == "rounded_rectangle":
-            x, y, w, h, r = shape.args
-            # Simple approximation with rectangles
-            self._canvas.create_rectangle(self._sx(x), self._sy(y), self._sx(x + w), self._sy(y + h), outline=color, fill=color)
-        return None
-
-    def clear(self):
-        if tk is None:
-            return None
-        self._canvas.delete("all")
-        self._canvas.create_rectangle(0, 0, self._sx(self.width), self._sy(self.height), outline=_to_hex(self.brush), fill=_to_hex(self.brush))
-        return None
-
-    def text(self, text: str, x: int, y: int):
-        if tk is None:
-            return None
-        self._canvas.create_text(self._sx(x), self._sy(y), anchor="nw", text=str(text), fill=_to_hex(self.brush), font=("TkFixedFont", 10))
-        return None
-
-    def measure_text(self, text: str):
-        return (max(0, len(text)) * 6, 10)
-
-    def blit(self, _img, x: int, y: int):
-        self._canvas.create_rectangle(self._sx(x), self._sy(y), self._sx(x + 16), self._sy(y + 16), outline=_to_hex(self.brush))
-        return None
-
-    def scale_blit(self, _img, x: int, y: int, w: int, h: int):
-        self._canvas.create_rectangle(self._sx(x), self._sy(y), self._sx(x + w), self._sy(y + h), outline=_to_hex(self.brush))
-        return None
-
-    def window(self, x, y, w, h):
-        return VisualScreen(self._canvas, self._origin_x + x, self._origin_y + y, w, h, self._scale)
-
-    def load_into(self, _filename: str):
-        return None
-
 
 def _load_app(app_name: str) -> ModuleType | None:
-    """Load an app module by name."""
+    """Load an app module by name (instant if it was launched before)."""
     try:
-        mod = importlib.import_module(f"badge.apps.{app_name}")
+        cached = loader.is_loaded(app_name)
+        started = time.perf_counter()
+        mod = loader.activate(app_name)
         if not hasattr(mod, "update"):
             print(f"App {app_name} has no update() function")
+            loader.deactivate()
             return None
+        how = "resumed" if cached else "imported"
+        print(f"{how} {app_name} in {(time.perf_counter() - started) * 1000:.1f}ms")
         return mod
     except ModuleNotFoundError as e:
         print(f"App {app_name} not found: {e}")
@@ -209,9 +128,10 @@ def _draw_menu():
     bw.screen.brush = bw.brushes.color(201, 209, 217)
     bw.screen.text("UniverseBadge Menu", 5, 5)
     
-    # Draw app list
+    # Draw the page of the app list that contains the selection
+    first = current_app_index - current_app_index % MENU_ROWS
     y = 25
-    for i, (app_name, app_title) in enumerate(APPS):
+    for i, (_app_name, app_title) in enumerate(APPS[first:first + MENU_ROWS], start=first):
         if i == current_app_index:
             # Highlight selected
             bw.screen.brush = bw.brushes.color(46, 160, 67)
@@ -220,8 +140,6 @@ def _draw_menu():
             bw.screen.brush = bw.brushes.color(88, 96, 105)
             bw.screen.text(f"  {app_title}", 5, y)
         y += 10
-        if y > 105:
-            break
     
     # Instructions
     bw.screen.brush = bw.brushes.color(255, 191, 0)
@@ -312,12 +230,20 @@ def _tk_controls(root):
     return info_label, hold_up_var, hold_down_var
 
 
-def main():
-    global current_app_index, current_app_module, in_menu, escape_pressed
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the full badge experience on the desktop.")
+    parser.add_argument("--frame-ms", type=int, default=33, help="simulated milliseconds per frame (default: 33)")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="simulated seconds per real second, e.g. 10 to fast-forward (default: 1)")
+    parser.add_argument("--export", metavar="PATH", help="capture every simulated frame to a .gif or a video file (ffmpeg)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
 
     # Set up Tk window
     root = None
-    canvas = None
+    view = None
     info_label = None
     hold_up_var = None
     hold_down_var = None
@@ -326,124 +252,148 @@ def main():
         root = tk.Tk()
         root.title("UniverseBadge Desktop Emulator")
         root.configure(bg="#0d1117")
-        canvas = tk.Canvas(root, width=WIDTH * SCALE, height=HEIGHT * SCALE, bg="#0d1117", highlightthickness=0)
-        canvas.pack(pady=8)
+        # Apps rasterize into the stub framebuffer; the view presents it once per frame
+        view = FramebufferView(root, bw.screen.framebuffer, SCALE, bg="#0d1117").pack(pady=8)
         _tk_bind_keys(root)
         info_label, hold_up_var, hold_down_var = _tk_controls(root)
 
-    # Patch badgeware screen & shapes
-    if canvas is not None:
-        bw.screen = VisualScreen(canvas)
-        bw.shapes = VisualShapes()
-
     print("UniverseBadge Desktop Emulator")
     print("Press ESC to return to menu from any app")
     print("Close window or Ctrl+C to quit")
 
-    last_print = 0.0
+    runner = AsyncLoop(args.frame_ms, args.time_scale)
+    # the window shows the last finished frame, never one being drawn
+    shown = Framebuffer(bw.screen.framebuffer.width, bw.screen.framebuffer.height)
+    if view is not None:
+        view.framebuffer = shown
+    exporter = None
+    if args.export:
+        exporter = FrameExporter(open_encoder(args.export, shown.width, shown.height, args.frame_ms))
+    # frames run on a worker thread; Tk widgets are only touched from the loop
+    info_text = None
+
+    def read_input():
+        # Handle input
+        io.pressed.clear()
+        if root is not None:
+            # Update held from toggles
+            try:
+                if hold_up_var and hold_up_var.get():
+                    held_keys.add(io.BUTTON_UP)
+                else:
+                    held_keys.discard(io.BUTTON_UP)
+                if hold_down_var and hold_down_var.get():
+                    held_keys.add(io.BUTTON_DOWN)
+                else:
+                    held_keys.discard(io.BUTTON_DOWN)
+            except Exception:
+                pass
+
+            # Transfer queued button presses
+            if pressed_queue:
+                io.pressed.update(pressed_queue)
+                pressed_queue.clear()
+
+            # Apply held keys
+            if held_keys:
+                io.held = set(held_keys)
+                io.pressed.update(held_keys)
+            else:
+                io.held = set()
+
+    def frame():
+        global current_app_index, current_app_module, in_menu, escape_pressed
+        nonlocal info_text
+        # Menu or app logic
+        if in_menu:
+            # Handle menu navigation
+            if io.BUTTON_UP in io.pressed:
+                current_app_index = (current_app_index - 1) % len(APPS)
+            if io.BUTTON_DOWN in io.pressed:
+                current_app_index = (current_app_index + 1) % len(APPS)
+            if io.BUTTON_A in io.pressed:
+                # Launch app
+                app_name, app_title = APPS[current_app_index]
+                current_app_module = _load_app(app_name)
+                if current_app_module:
+                    in_menu = False
+                    info_text = f"App: {app_title} (ESC:Menu)"
+                    print(f"Launched: {app_title}")
+                else:
+                    print(f"Failed to load: {app_title}")
 
-    try:
-        while True:
-            # Update ticks
-            io.ticks += 33
-
-            # Handle input
-            io.pressed.clear()
-            if root is not None:
-                # Update held from toggles
+            # Draw menu
+            _draw_menu()
+        else:
+            # Run current app
+            if escape_pressed:
+                # Return to menu (ESC key pressed)
+                escape_pressed = False
+                in_menu = True
+                current_app_module = None
+                loader.deactivate()
+                info_text = "Badge Menu"
+                print("Returned to menu")
+            elif current_app_module:
                 try:
-                    if hold_up_var and hold_up_var.get():
-                        held_keys.add(io.BUTTON_UP)
-                    else:
-                        held_keys.discard(io.BUTTON_UP)
-                    if hold_down_var and hold_down_var.get():
-                        held_keys.add(io.BUTTON_DOWN)
-                    else:
-                        held_keys.discard(io.BUTTON_DOWN)
-                except Exception:
-                    pass
-
-                # Transfer queued button presses
-                if pressed_queue:
-                    io.pressed.update(pressed_queue)
-                    pressed_queue.clear()
-
-                # Apply held keys
-                if held_keys:
-                    io.held = set(held_keys)
-                    io.pressed.update(held_keys)
-                else:
-                    io.held = set()
+                    result = current_app_module.update()
+                    # If app returns non-None, it might signal exit
+                    if result is not None and hasattr(result, '__iter__'):
+                        # Some apps return (next_app, params) - just go to menu
+                        in_menu = True
+                        current_app_module = None
+                        loader.deactivate()
+                        info_text = "Badge Menu"
+                except Exception as e:
+                    print(f"App error: {e}")
+                    # Don't crash, just show error
+                    bw.screen.brush = bw.brushes.color(248, 81, 73)
+                    bw.screen.text(f"Error: {str(e)[:30]}", 5, 50)
+
+    def capture():
+        shown.pixels[:] = bw.screen.framebuffer.pixels
+        # one exported frame per simulated frame, however often the window shows
+        if exporter is not None:
+            exporter.submit(shown.pixels)
+
+    task = runner.add("badge", frame, io, before_update=read_input, after_update=capture)
+    last_print = 0.0
 
-            # Menu or app logic
+    def present():
+        nonlocal info_text, last_print
+        # Update window
+        if root is not None:
+            if info_label and info_text is not None:
+                info_label.config(text=info_text)
+                info_text = None
+            view.present()
+            root.update_idletasks()
+            root.update()
+
+        # Print state occasionally
+        now = time.time()
+        if now - last_print > 5.0:
+            last_print = now
             if in_menu:
-                # Handle menu navigation
-                if io.BUTTON_UP in io.pressed:
-                    current_app_index = (current_app_index - 1) % len(APPS)
-                if io.BUTTON_DOWN in io.pressed:
-                    current_app_index = (current_app_index + 1) % len(APPS)
-                if io.BUTTON_A in io.pressed:
-                    # Launch app
-                    app_name, app_title = APPS[current_app_index]
-                    current_app_module = _load_app(app_name)
-                    if current_app_module:
-                        in_menu = False
-                        if info_label:
-                            info_label.config(text=f"App: {app_title} (ESC:Menu)")
-                        print(f"Launched: {app_title}")
-                    else:
-                        print(f"Failed to load: {app_title}")
-                
-                # Draw menu
-                _draw_menu()
+                print(f"[menu] Selected: {APPS[current_app_index][1]}")
             else:
-                # Run current app
-                if escape_pressed:
-                    # Return to menu (ESC key pressed)
-                    escape_pressed = False
-                    in_menu = True
-                    current_app_module = None
-                    if info_label:
-                        info_label.config(text="Badge Menu")
-                    print("Returned to menu")
-                elif current_app_module:
-                    try:
-                        result = current_app_module.update()
-                        # If app returns non-None, it might signal exit
-                        if result is not None and hasattr(result, '__iter__'):
-                            # Some apps return (next_app, params) - just go to menu
-                            in_menu = True
-                            current_app_module = None
-                            if info_label:
-                                info_label.config(text="Badge Menu")
-                    except Exception as e:
-                        print(f"App error: {e}")
-                        # Don't crash, just show error
-                        bw.screen.brush = bw.brushes.color(248, 81, 73)
-                        bw.screen.text(f"Error: {str(e)[:30]}", 5, 50)
-
-            # Update window
-            if root is not None:
-                root.update_idletasks()
-                root.update()
-
-            # Print state occasionally
-            now = time.time()
-            if now - last_print > 5.0:
-                last_print = now
-                if in_menu:
-                    print(f"[menu] Selected: {APPS[current_app_index][1]}")
-                else:
-                    print(f"[app] Running: {APPS[current_app_index][1]}")
-
-            # Frame delay ~30 FPS
-            time.sleep(0.033)
+                print(f"[app] Running: {APPS[current_app_index][1]}")
+            if task.stats.stalled:
+                print(f"[stall] {task.stats.stalled} frames, longest {task.stats.longest_stall}")
+            if runner.scheduler.dropped:
+                print(f"[sched] frames={runner.scheduler.frames} dropped={runner.scheduler.dropped}")
 
+    try:
+        asyncio.run(runner.run(present=present))
     except KeyboardInterrupt:
         print("\nExiting...")
     except tk.TclError:
         print("\nWindow closed")
-
+    finally:
+        print(task.stats.summary())
+        if exporter is not None:
+            exporter.close()
+            print(f"[export] {args.export}: {exporter.summary()}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,242 @@
+"""
+JSON-lines control socket for driving a badge app from another process.
+
+The app only runs when told to: ``step`` advances it on the simulated clock
+(no sleeping), so perf scenarios are repeatable and as fast as the CPU
+allows. Each request is one line holding a command object, or a JSON array
+of them to batch many commands into one round-trip; the reply is one line
+with a result object (or an array of them, stopping at the first error)::
+
+    {"cmd": "press", "button": "A"}               next stepped frame only
+    {"cmd": "hold", "button": "UP", "down": true} until released
+    {"cmd": "step", "frames": 1000}               timings and io.ticks
+    {"cmd": "get_state", "names": ["score"]}      app globals (all JSON ones by default)
+    {"cmd": "screenshot", "format": "ppm"}        base64 frame ("ppm" or "rgb"), or "path" to save it
+    {"cmd": "quit"}                               stop the server
+
+Results carry ``"ok": true`` or ``"ok": false`` with an ``"error"``, and echo
+the request's ``"id"`` when it has one. ``run_app.py --control PORT`` serves
+an app this way.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import socketserver
+import threading
+from types import FunctionType, ModuleType
+from typing import Self
+
+import headless
+
+
+class ControlError(Exception):
+    """A command that cannot be carried out; reported to the client."""
+
+
+def _jsonable(value) -> bool:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class Controller:
+    """Runs control commands against one loaded app module."""
+
+    def __init__(self, mod: ModuleType, io, framebuffer, frame_ms: int = 33, update=None):
+        self.mod = mod
+        self.io = io
+        self.framebuffer = framebuffer
+        self.frame_ms = frame_ms
+        self.update = update or mod.update
+        self.pressed: set[int] = set()
+        self.held: set[int] = set()
+        self.frames = 0
+        self.quit = threading.Event()
+        # one client's batch at a time
+        self._lock = threading.Lock()
+
+    def execute(self, request):
+        """Run one command object, or a list of them; return the result(s)."""
+        with self._lock:
+            if isinstance(request, list):
+                results = []
+                for command in request:
+                    results.append(self._run(command))
+                    if not results[-1]["ok"]:
+                        break
+                return results
+            return self._run(request)
+
+    def _run(self, command) -> dict:
+        ident = command.get("id") if isinstance(command, dict) else None
+        try:
+            result = {"ok": True, **self._dispatch(command)}
+        except ControlError as exc:
+            result = {"ok": False, "error": str(exc)}
+        if ident is not None:
+            result["id"] = ident
+        return result
+
+    def _dispatch(self, command) -> dict:
+        if not isinstance(command, dict):
+            raise ControlError("a command must be a JSON object")
+        name = command.get("cmd")
+        handler = getattr(self, f"_cmd_{name}", None) if isinstance(name, str) else None
+        if handler is None:
+            raise ControlError(f"unknown command {name!r}")
+        args = {key: value for key, value in command.items() if key not in ("cmd", "id")}
+        try:
+            return handler(**args)
+        except TypeError as exc:  # unexpected or missing arguments
+            raise ControlError(f"{name}: {exc}") from None
+
+    def _button(self, button) -> int:
+        if isinstance(button, int):
+            return button
+        code = getattr(self.io, f"BUTTON_{str(button).upper()}", None)
+        if code is None:
+            raise ControlError(f"unknown button {button!r}")
+        return code
+
+    # --- commands --------------------------------------------------------
+    def _cmd_press(self, button) -> dict:
+        self.pressed.add(self._button(button))
+        return {}
+
+    def _cmd_hold(self, button, down: bool = True) -> dict:
+        code = self._button(button)
+        if down:
+            self.held.add(code)
+        else:
+            self.held.discard(code)
+        return {}
+
+    def _cmd_step(self, frames: int = 1) -> dict:
+        if not isinstance(frames, int) or frames < 1:
+            raise ControlError("step: frames must be a positive integer")
+        held = frozenset(self.held)
+        # presses land on the first stepped frame; holds repeat like the window's
+        inputs = [(self.pressed | held, held)] + [(held, held)] * (frames - 1)
+        self.pressed = set()
+        try:
+            stats = headless.run_headless(self.update, self.io, frames, self.frame_ms, inputs)
+        except Exception as exc:
+            raise ControlError(f"step: update() raised {exc!r}") from exc
+        self.frames += frames
+        return {
+            "frames": self.frames,
+            "ticks": self.io.ticks,
+            "mean_ms": round(stats.mean_ms, 3),
+            "p99_ms": round(stats.p99_ms, 3),
+            "max_ms": round(stats.max_ms, 3),
+        }
+
+    def _cmd_get_state(self, names=None) -> dict:
+        values = vars(self.mod)
+        if names is None:
+            names = [
+                name for name, value in values.items()
+                if not name.startswith("_") and not isinstance(value, (ModuleType, FunctionType, type))
+                and _jsonable(value)
+            ]
+        state = {}
+        for name in names:
+            if name not in values:
+                raise ControlError(f"get_state: {self.mod.__name__} has no global {name!r}")
+            value = values[name]
+            state[name] = value if _jsonable(value) else repr(value)
+        return {"state": state}
+
+    def _cmd_screenshot(self, format: str = "ppm", path: str | None = None) -> dict:
+        fb = self.framebuffer
+        if format == "ppm":
+            data = fb.to_ppm()
+        elif format == "rgb":
+            data = fb.rgb_bytes()
+        else:
+            raise ControlError(f"screenshot: unknown format {format!r}")
+        result = {"width": fb.width, "height": fb.height, "format": format}
+        if path is not None:
+            try:
+                with open(path, "wb") as f:
+                    f.write(data)
+            except OSError as exc:
+                raise ControlError(f"screenshot: {exc}") from None
+            result["path"] = path
+        else:
+            result["data"] = base64.b64encode(data).decode("ascii")
+        return result
+
+    def _cmd_quit(self) -> dict:
+        self.quit.set()
+        return {}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        controller = self.server.controller
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as exc:
+                reply = {"ok": False, "error": f"bad JSON: {exc}"}
+            else:
+                reply = controller.execute(request)
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            if controller.quit.is_set():
+                return
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    controller: Controller
+
+
+class ControlServer:
+    """Serve ``controller`` on a local TCP port until ``quit`` or ``stop()``."""
+
+    def __init__(self, controller: Controller, host: str = "127.0.0.1", port: int = 0):
+        self.controller = controller
+        self.host = host
+        self.port = port
+        self._server: _Server | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        if self._server is None:
+            raise RuntimeError("the control server is not running")
+        host, port = self._server.server_address[:2]
+        return str(host), port
+
+    def start(self) -> Self:
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.controller = self.controller
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), name="control", daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until a client sends ``quit``; False if ``timeout`` ran out."""
+        return self.controller.quit.wait(timeout)
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,242 @@
+"""
+Background frame export for the desktop emulators.
+
+``FrameExporter.submit`` copies a finished frame into a bounded queue and
+returns immediately; a daemon thread drains the queue into an encoder. The
+emulators submit every simulated frame (not every window refresh), so an
+export plays back at simulated speed whatever ``--time-scale`` or stalls did
+to the window. When encoding falls behind and the queue is full, new frames
+are dropped (and counted) instead of stalling the app loop.
+
+Encoders:
+
+- ``.gif``: each frame is encoded and appended to the file as it arrives,
+  so memory use does not grow with the length of the recording
+- anything else (``.mp4``, ``.webm``, ...): raw RGBA frames piped to ``ffmpeg``
+"""
+from __future__ import annotations
+
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+
+try:
+    from PIL import Image  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    Image = None
+
+_STOP = object()
+# GIF LZW codes are at most 12 bits
+_MAX_CODES = 4096
+
+
+def _rgb332_palette() -> bytes:
+    return bytes(
+        channel
+        for i in range(256)
+        for channel in ((i >> 5) * 255 // 7, (i >> 2 & 7) * 255 // 7, (i & 3) * 255 // 3)
+    )
+
+
+def _quantize(rgba: bytes, size: tuple[int, int]) -> tuple[bytes, bytes]:
+    """A 256 colour palette (packed RGB) and one palette index per pixel.
+
+    Frames with at most 256 colours (most badge frames) are exact. Busier
+    ones are quantized by Pillow when it is installed, else mapped to a
+    fixed 3-3-2 bit palette.
+    """
+    opaque = bytearray(rgba)
+    opaque[3::4] = b"\xff" * (len(opaque) // 4)
+    pixels = memoryview(opaque).cast("I")
+    colours = set(pixels)
+    if len(colours) <= 256:
+        lookup = {colour: i for i, colour in enumerate(colours)}
+        palette = b"".join(colour.to_bytes(4, sys.byteorder)[:3] for colour in colours)
+    elif Image is not None:
+        image = Image.frombytes("RGBA", size, rgba).convert("RGB").quantize(colors=256)
+        return bytes(image.getpalette()[:768]).ljust(768, b"\0"), image.tobytes()
+    else:
+        lookup = {}
+        for colour in colours:
+            r, g, b, _ = colour.to_bytes(4, sys.byteorder)
+            lookup[colour] = (r & 0xE0) | (g >> 3 & 0x1C) | b >> 6
+        palette = _rgb332_palette()
+    return palette.ljust(768, b"\0"), bytes(map(lookup.__getitem__, pixels))
+
+
+def _lzw(indices: bytes, min_size: int = 8) -> bytes:
+    """GIF LZW compression of ``indices``, packed LSB first."""
+    clear = 1 << min_size
+    out = bytearray()
+    acc = nbits = 0
+
+    def emit(code: int, size: int) -> None:
+        nonlocal acc, nbits
+        acc |= code << nbits
+        nbits += size
+        while nbits >= 8:
+            out.append(acc & 0xFF)
+            acc >>= 8
+            nbits -= 8
+
+    size = min_size + 1
+    table: dict[int, int] = {}
+    next_code = clear + 2
+    emit(clear, size)
+    if indices:
+        prefix = indices[0]
+        for index in indices[1:]:
+            key = prefix << 8 | index
+            code = table.get(key)
+            if code is not None:
+                prefix = code
+                continue
+            emit(prefix, size)
+            if next_code < _MAX_CODES:
+                table[key] = next_code
+                next_code += 1
+                # the decoder's table runs one code behind ours
+                if next_code > 1 << size and size < 12:
+                    size += 1
+            else:
+                emit(clear, size)
+                table.clear()
+                next_code = clear + 2
+                size = min_size + 1
+            prefix = index
+        emit(prefix, size)
+    emit(clear + 1, size)
+    if nbits:
+        out.append(acc & 0xFF)
+    return bytes(out)
+
+
+def _sub_blocks(data: bytes) -> bytes:
+    blocks = bytearray()
+    for i in range(0, len(data), 255):
+        chunk = data[i:i + 255]
+        blocks.append(len(chunk))
+        blocks += chunk
+    blocks.append(0)
+    return bytes(blocks)
+
+
+class GifEncoder:
+    """Writes an animated GIF, appending each frame to the file as it arrives."""
+
+    def __init__(self, path, width: int, height: int, frame_ms: int = 33):
+        self.path = str(path)
+        self.size = (width, height)
+        self.frame_ms = int(frame_ms)
+        self.frames = 0
+        self._file = open(self.path, "wb")  # noqa: SIM115 - stays open until close()
+        dims = width.to_bytes(2, "little") + height.to_bytes(2, "little")
+        # no global colour table: every frame carries its own palette
+        self._file.write(b"GIF89a" + dims + b"\x00\x00\x00")
+        # loop forever
+        self._file.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+        delay = max(1, round(self.frame_ms / 10)).to_bytes(2, "little")
+        self._frame_header = b"\x21\xf9\x04\x00" + delay + b"\x00\x00" + b"\x2c\x00\x00\x00\x00" + dims + b"\x87"
+
+    def write(self, rgba: bytes) -> None:
+        # quantize and compress on the encoder thread
+        palette, indices = _quantize(rgba, self.size)
+        self._file.write(self._frame_header + palette + b"\x08" + _sub_blocks(_lzw(indices)))
+        self.frames += 1
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.write(b"\x3b")
+        self._file.close()
+
+
+class PipeEncoder:
+    """Streams raw RGBA frames to an ``ffmpeg`` process."""
+
+    def __init__(self, path, width: int, height: int, frame_ms: int = 33, ffmpeg: str = "ffmpeg"):
+        exe = shutil.which(ffmpeg)
+        if exe is None:
+            raise RuntimeError(f"{ffmpeg!r} not found; install ffmpeg or export to .gif")
+        fps = 1000 / frame_ms
+        self._proc = subprocess.Popen(
+            [
+                exe, "-y", "-loglevel", "error",
+                "-f", "rawvideo", "-pix_fmt", "rgba",
+                "-s", f"{width}x{height}", "-framerate", f"{fps:g}",
+                "-i", "-",
+                "-pix_fmt", "yuv420p",
+                str(path),
+            ],
+            stdin=subprocess.PIPE,
+        )
+        assert self._proc.stdin is not None  # stdin=PIPE
+        self._stdin = self._proc.stdin
+
+    def write(self, rgba: bytes) -> None:
+        self._stdin.write(rgba)
+
+    def close(self) -> None:
+        self._stdin.close()
+        self._proc.wait()
+
+
+def open_encoder(path, width: int, height: int, frame_ms: int = 33):
+    """Pick an encoder from the output file extension."""
+    if str(path).lower().endswith(".gif"):
+        return GifEncoder(path, width, height, frame_ms)
+    return PipeEncoder(path, width, height, frame_ms)
+
+
+class FrameExporter:
+    """Feeds frames to ``encoder`` from a background thread via a bounded queue."""
+
+    def __init__(self, encoder, max_queue: int = 120):
+        self.encoder = encoder
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.error: BaseException | None = None
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._drain, name="frame-export", daemon=True)
+        self._thread.start()
+
+    def submit(self, pixels) -> bool:
+        """Queue a copy of ``pixels``; returns False if the frame was dropped."""
+        self.submitted += 1
+        if self.error is None:
+            try:
+                self._queue.put_nowait(bytes(pixels))
+                return True
+            except queue.Full:
+                pass
+        self.dropped += 1
+        return False
+
+    def _drain(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is _STOP:
+                return
+            if self.error is not None:
+                continue
+            try:
+                self.encoder.write(frame)
+                self.written += 1
+            except Exception as e:  # noqa: BLE001 - stop encoding but keep the app running
+                self.error = e
+
+    def close(self) -> None:
+        """Flush queued frames, then finish the file."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        if self.error is None:
+            self.encoder.close()
+
+    def summary(self) -> str:
+        text = f"frames={self.submitted} written={self.written} dropped={self.dropped}"
+        if self.error is not None:
+            text += f" error={self.error!r}"
+        return text
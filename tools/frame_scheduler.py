@@ -0,0 +1,85 @@
+"""
+Deadline-based frame pacing for the desktop emulators.
+
+The badge advances ``io.ticks`` by a fixed step per frame. On the desktop the
+scheduler paces those simulated frames against absolute deadlines on a
+monotonic clock rather than sleeping a fixed delay after each frame. The frame
+period therefore does not drift with update or Tk time. When the loop falls
+behind it runs several updates back to back to catch up. A backlog larger
+than ``max_lag`` is dropped, so a stall (a slow network fetch, a dragged
+window) does not cause a long burst of updates afterwards.
+
+``time_scale`` shortens the real time between simulated frames, e.g. 10 runs
+ten 33 ms updates per 33 ms of wall time. ``io.ticks`` still advances by
+exactly ``frame_ms`` per update, so apps see a consistent clock at any speed.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class FrameScheduler:
+    """Decides how many simulated frames are due at each pass of a main loop."""
+
+    def __init__(
+        self,
+        frame_ms: int = 33,
+        time_scale: float = 1.0,
+        max_lag: float = 0.25,
+        clock=time.perf_counter,
+        sleep=time.sleep,
+    ):
+        if frame_ms <= 0:
+            raise ValueError("frame_ms must be positive")
+        if time_scale <= 0:
+            raise ValueError("time_scale must be positive")
+        self.frame_ms = int(frame_ms)
+        self.time_scale = float(time_scale)
+        # real seconds between simulated frames
+        self.period = self.frame_ms / 1000 / self.time_scale
+        # never run more than this many frames in one pass
+        self.max_steps = max(1, int(max_lag / self.period))
+        self._clock = clock
+        self._sleep = sleep
+        self._deadline: float | None = None
+        self.frames = 0
+        self.dropped = 0
+
+    def due(self) -> int:
+        """Return how many frames are due now (0 if the next deadline is ahead)."""
+        now = self._clock()
+        if self._deadline is None:
+            self._deadline = now
+        if now < self._deadline:
+            return 0
+        steps = int((now - self._deadline) / self.period) + 1
+        if steps > self.max_steps:
+            # too far behind to catch up: drop the backlog and re-anchor
+            self.dropped += steps - self.max_steps
+            steps = self.max_steps
+            self._deadline = now + self.period
+        else:
+            self._deadline += steps * self.period
+        self.frames += steps
+        return steps
+
+    def delay(self) -> float:
+        """Seconds until the next deadline (0 when a frame is already due)."""
+        if self._deadline is None:
+            return 0.0
+        return max(0.0, self._deadline - self._clock())
+
+    def wait(self) -> int:
+        """Sleep until the next deadline, then return the number of frames due."""
+        remaining = self.delay()
+        if remaining > 0:
+            self._sleep(remaining)
+        return self.due()
+
+    async def wait_async(self) -> int:
+        """Like ``wait`` but yields to the asyncio loop instead of sleeping."""
+        remaining = self.delay()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return self.due()
@@ -0,0 +1,105 @@
+"""
+Tk presenter for the stub badgeware framebuffer.
+
+Apps rasterize into ``badgeware.screen.framebuffer`` (a 160x120 RGBA buffer);
+this view keeps one persistent canvas image zoomed by an integer ``scale``
+and, each frame, pushes only the rectangles that changed since the previous
+frame. Presenting an almost static screen therefore costs one buffer compare.
+"""
+from __future__ import annotations
+
+try:
+    import tkinter as tk  # type: ignore
+except ImportError:  # pragma: no cover - optional
+    tk = None  # type: ignore[assignment]
+
+# Dirty rows are narrowed to columns of this many pixels
+TILE = 16
+
+
+def dirty_rects(previous, current, width: int, height: int, tile: int = TILE):
+    """Return ``(x0, y0, x1, y1)`` rectangles where two RGBA frames differ.
+
+    Consecutive changed rows are merged into bands, and each band is trimmed
+    to the span of ``tile``-pixel columns that actually changed.
+    """
+    if previous == current:
+        return []
+    prev = memoryview(previous)
+    cur = memoryview(current)
+    stride = width * 4
+    step = tile * 4
+    rects = []
+    band = None  # [x0, y0, x1, y1]
+    for y in range(height):
+        row = y * stride
+        if prev[row:row + stride] == cur[row:row + stride]:
+            if band:
+                rects.append(tuple(band))
+                band = None
+            continue
+        end = row + stride
+        first = row
+        while prev[first:min(end, first + step)] == cur[first:min(end, first + step)]:
+            first += step
+        last = end
+        while prev[max(row, last - step):last] == cur[max(row, last - step):last]:
+            last -= step
+        x0, x1 = (first - row) // 4, (last - row) // 4
+        if band:
+            band[0] = min(band[0], x0)
+            band[2] = max(band[2], x1)
+            band[3] = y + 1
+        else:
+            band = [x0, y, x1, y + 1]
+    if band:
+        rects.append(tuple(band))
+    return rects
+
+
+class FramebufferView:
+    """Canvas showing a framebuffer scaled up by an integer ``scale``."""
+
+    def __init__(self, root, framebuffer, scale: int, **canvas_options):
+        self.framebuffer = framebuffer
+        self.scale = int(scale)
+        width, height = framebuffer.width, framebuffer.height
+        self.canvas = tk.Canvas(
+            root,
+            width=width * self.scale,
+            height=height * self.scale,
+            highlightthickness=0,
+            **canvas_options,
+        )
+        # 1:1 staging image that receives changed pixels, plus the persistent
+        # zoomed image shown on the canvas
+        self._photo = tk.PhotoImage(width=width, height=height)
+        self._zoomed = tk.PhotoImage(width=width * self.scale, height=height * self.scale)
+        self.canvas.create_image(0, 0, anchor="nw", image=self._zoomed)
+        self._presented: bytes | None = None  # copy of the last frame pushed to Tk
+        self.last_dirty: list[tuple[int, int, int, int]] = []
+
+    def pack(self, **options):
+        self.canvas.pack(**options)
+        return self
+
+    def present(self) -> None:
+        """Push the parts of the current frame that changed to the canvas."""
+        fb = self.framebuffer
+        if self._presented is None:
+            rects = [(0, 0, fb.width, fb.height)]
+        else:
+            rects = dirty_rects(self._presented, fb.pixels, fb.width, fb.height)
+        self.last_dirty = rects
+        if not rects:
+            return
+        s = self.scale
+        for x0, y0, x1, y1 in rects:
+            self._photo.put(fb.to_ppm(x0, y0, x1, y1), to=(x0, y0))
+            self._zoomed.tk.call(
+                self._zoomed, "copy", self._photo,
+                "-from", x0, y0, x1, y1,
+                "-to", x0 * s, y0 * s,
+                "-zoom", s, s,
+            )
+        self._presented = bytes(fb.pixels)
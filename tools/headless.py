@@ -0,0 +1,100 @@
+"""
+Headless, faster-than-realtime driver for badge apps.
+
+Runs an app's ``update()`` back to back against a simulated ``io.ticks`` clock
+(no Tk, no sleeping) and collects per-frame update timings, so apps can be
+soak-tested and benchmarked in seconds.
+"""
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RunStats:
+    """Timing results from a headless run (all durations in seconds)."""
+
+    frames: int = 0
+    wall_time: float = 0.0
+    update_times: list[float] = field(default_factory=list)
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.wall_time if self.wall_time > 0 else 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        if not self.update_times:
+            return 0.0
+        return sum(self.update_times) / len(self.update_times) * 1000
+
+    def percentile_ms(self, pct: float) -> float:
+        if not self.update_times:
+            return 0.0
+        ordered = sorted(self.update_times)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index] * 1000
+
+    @property
+    def p99_ms(self) -> float:
+        return self.percentile_ms(99)
+
+    @property
+    def max_ms(self) -> float:
+        return max(self.update_times, default=0.0) * 1000
+
+    def summary(self) -> str:
+        return (
+            f"frames={self.frames} wall={self.wall_time:.3f}s fps={self.fps:.0f} "
+            f"update mean={self.mean_ms:.3f}ms p99={self.p99_ms:.3f}ms max={self.max_ms:.3f}ms"
+        )
+
+
+class SimulatedClock:
+    """Advances ``io.ticks``/``io.ticks_delta`` by a fixed step per frame."""
+
+    def __init__(self, io, frame_ms: int = 33, start_ticks: int = 0):
+        self.io = io
+        self.frame_ms = int(frame_ms)
+        io.ticks = int(start_ticks)
+        io.ticks_delta = self.frame_ms
+
+    def tick(self) -> None:
+        self.io.ticks += self.frame_ms
+        self.io.ticks_delta = self.frame_ms
+
+
+def seed(value: int) -> None:
+    """Seed ``random`` so app behaviour (and import-time state) is repeatable."""
+    random.seed(value)
+
+
+def run_headless(update, io, frames: int, frame_ms: int = 33, inputs=None) -> RunStats:
+    """Call ``update()`` ``frames`` times as fast as possible.
+
+    ``inputs`` is an optional sequence of ``(pressed, held)`` button sets, one
+    per frame (see ``input_trace.InputTrace.inputs``). Without it the input
+    sets are cleared every frame, so apps see no button activity.
+    """
+    clock = SimulatedClock(io, frame_ms, start_ticks=io.ticks)
+    stats = RunStats()
+    times = stats.update_times
+    perf = time.perf_counter
+    started = perf()
+    for i in range(frames):
+        clock.tick()
+        io.pressed.clear()
+        if inputs is not None:
+            pressed, held = inputs[i]
+            io.pressed.update(pressed)
+            io.held = set(held)
+        else:
+            io.held = set()
+        t0 = perf()
+        update()
+        times.append(perf() - t0)
+    stats.wall_time = perf() - started
+    stats.frames = frames
+    return stats
@@ -0,0 +1,135 @@
+"""
+Hot reload for a running badge app.
+
+``AppReloader`` watches the files of every loaded module that lives in the
+app's package directory. That covers the package itself and sibling modules,
+whether they were imported as ``badge.apps.flappy.mona`` or by their bare
+name (``mona``). When files change, only those modules are re-executed with
+``importlib.reload``, then the app package itself, so its
+``from mona import Mona`` style bindings pick up the new code.
+
+With ``keep_state`` the package's data globals (counters, game objects,
+loaded images) survive the reload. Preserved instances of classes the reload
+redefined are moved onto the new class, so edited methods take effect
+immediately. A failing reload (syntax error, exception at import) is
+reported and the previous code keeps running until the file changes again.
+"""
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import time
+import traceback
+from pathlib import Path
+from types import FunctionType, ModuleType
+
+
+class AppReloader:
+    """Reloads an app package and its sibling modules when their files change."""
+
+    def __init__(self, module: ModuleType, keep_state: bool = False, interval: float = 0.25):
+        self.module = module
+        self.keep_state = keep_state
+        self.interval = interval
+        if module.__file__ is None:
+            raise ValueError(f"{module.__name__} has no source file to watch")
+        self.app_dir = Path(module.__file__).resolve().parent
+        self.reloads = 0
+        self._next_check = 0.0
+        self._mtimes: dict[str, int] = {}
+        for name, mod in self._app_modules():
+            self._mtimes[name] = self._mtime(mod)
+
+    def _app_modules(self):
+        """``(name, module)`` for loaded modules whose file is in the app directory."""
+        found = []
+        for name, mod in list(sys.modules.items()):
+            path = getattr(mod, "__file__", None)
+            if not path:
+                continue
+            try:
+                if Path(path).resolve().parent == self.app_dir:
+                    found.append((name, mod))
+            except OSError:
+                continue
+        return found
+
+    @staticmethod
+    def _mtime(mod: ModuleType) -> int:
+        try:
+            return os.stat(mod.__file__ or "").st_mtime_ns
+        except OSError:
+            return 0
+
+    def changed(self) -> list[tuple[str, ModuleType]]:
+        """Modules whose source changed since they were last loaded."""
+        out = []
+        for name, mod in self._app_modules():
+            mtime = self._mtime(mod)
+            if self._mtimes.get(name) != mtime:
+                out.append((name, mod))
+        return out
+
+    def poll(self) -> bool:
+        """Reload changed modules (at most every ``interval`` seconds).
+
+        Returns True if the app package was reloaded, i.e. callers should
+        fetch ``module.update`` again.
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + self.interval
+        changed = self.changed()
+        if not changed:
+            return False
+        for name, mod in changed:
+            self._mtimes[name] = self._mtime(mod)
+        started = time.perf_counter()
+        try:
+            # siblings first (a module object can be registered under two names)
+            seen = {id(self.module)}
+            for _, mod in changed:
+                if id(mod) not in seen:
+                    seen.add(id(mod))
+                    importlib.reload(mod)
+            self._reload_package()
+        except Exception:  # noqa: BLE001 - any error in the edited code keeps the old code
+            print(f"[reload] failed, still running the previous code:\n{traceback.format_exc()}")
+            return False
+        self.reloads += 1
+        names = ", ".join(sorted({name for name, _ in changed}))
+        print(f"[reload] {names} in {(time.perf_counter() - started) * 1000:.0f}ms")
+        return True
+
+    def _reload_package(self) -> None:
+        namespace = self.module.__dict__
+        saved = {}
+        if self.keep_state:
+            saved = {
+                name: value
+                for name, value in namespace.items()
+                if not name.startswith("__")
+                and not isinstance(value, (ModuleType, FunctionType, type))
+            }
+        try:
+            importlib.reload(self.module)
+        except Exception:
+            # re-executing the module may have half-overwritten its globals
+            namespace.update(saved)
+            raise
+        for name, value in saved.items():
+            namespace[name] = _adopt_new_class(value, namespace)
+
+
+def _adopt_new_class(value, namespace):
+    """Point ``value`` at the reloaded version of its class, if there is one."""
+    cls = type(value)
+    new_cls = namespace.get(cls.__name__)
+    if isinstance(new_cls, type) and new_cls is not cls and new_cls.__module__ == cls.__module__:
+        try:
+            value.__class__ = new_cls
+        except TypeError:
+            pass
+    return value
@@ -0,0 +1,107 @@
+"""
+Compact binary input traces for repeatable emulator sessions.
+
+A trace stores the RNG seed, the simulated frame length and, for every frame,
+the ``io.pressed``/``io.held`` button sets as 16-bit masks (bit ``n`` is the
+button whose code is ``n``). Runs of identical frames are run-length encoded,
+so long idle stretches cost a few bytes.
+
+File layout (little endian)::
+
+    b"UBTR" version:u8 seed:i64 frame_ms:u16 frames:u32
+    then records of  pressed:u16 held:u16 count:u16
+"""
+from __future__ import annotations
+
+import struct
+
+MAGIC = b"UBTR"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sBqHI")
+_RECORD = struct.Struct("<HHH")
+_MAX_RUN = 0xFFFF
+
+
+def pack_buttons(buttons) -> int:
+    """Return the bit mask for a set of button codes (0-15)."""
+    mask = 0
+    for code in buttons:
+        if not 0 <= code < 16:
+            raise ValueError(f"button code {code!r} does not fit in a trace")
+        mask |= 1 << code
+    return mask
+
+
+def unpack_buttons(mask: int) -> frozenset[int]:
+    return frozenset(code for code in range(16) if mask >> code & 1)
+
+
+class InputTrace:
+    """Per-frame ``(pressed, held)`` masks plus what is needed to replay them."""
+
+    def __init__(self, seed: int = 0, frame_ms: int = 33):
+        self.seed = int(seed)
+        self.frame_ms = int(frame_ms)
+        self.frames: list[tuple[int, int]] = []
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def record(self, pressed, held) -> None:
+        """Append one frame of input."""
+        self.frames.append((pack_buttons(pressed), pack_buttons(held)))
+
+    def inputs(self) -> list[tuple[frozenset[int], frozenset[int]]]:
+        """Return the frames as ``(pressed, held)`` button sets."""
+        cache: dict[int, frozenset[int]] = {}
+
+        def buttons(mask):
+            found = cache.get(mask)
+            if found is None:
+                found = cache[mask] = unpack_buttons(mask)
+            return found
+
+        return [(buttons(p), buttons(h)) for p, h in self.frames]
+
+    # --- serialization ---------------------------------------------------
+    def to_bytes(self) -> bytes:
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.seed, self.frame_ms, len(self.frames)))
+        run_frame = (0, 0)
+        run = 0
+        for frame in self.frames:
+            if frame == run_frame and run < _MAX_RUN:
+                run += 1
+                continue
+            if run:
+                out += _RECORD.pack(run_frame[0], run_frame[1], run)
+            run_frame, run = frame, 1
+        if run:
+            out += _RECORD.pack(run_frame[0], run_frame[1], run)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> InputTrace:
+        if len(data) < _HEADER.size or (len(data) - _HEADER.size) % _RECORD.size:
+            raise ValueError("input trace is truncated")
+        magic, version, seed, frame_ms, count = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("not an input trace")
+        if version != VERSION:
+            raise ValueError(f"unsupported input trace version {version}")
+        trace = cls(seed, frame_ms)
+        frames = trace.frames
+        for pressed, held, run in _RECORD.iter_unpack(data[_HEADER.size:]):
+            frames.extend([(pressed, held)] * run)
+        if len(frames) != count:
+            raise ValueError(f"input trace has {len(frames)} frames, header says {count}")
+        return trace
+
+    def save(self, path) -> None:
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path) -> InputTrace:
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
@@ -0,0 +1,314 @@
+"""
+Local stand-in for the web services badge apps talk to.
+
+``hc911`` fetches ``hc911server.com/api/{count,calls}`` and the badge app
+downloads from ``api.github.com``, ``github.com/<user>.contribs`` and
+``wsrv.nl``. ``StandInServer`` serves recorded payloads for those endpoints
+(``tests/payloads/manifest.json``) over plain HTTP and over TLS with a
+self-signed certificate, so network code can be exercised and timed offline.
+
+Responses can be shaped to look like a crowded conference network:
+
+- ``latency``: seconds before the response starts
+- ``bandwidth``: cap in bytes per second
+- ``chunk_size``: send the body with ``Transfer-Encoding: chunked``
+- ``disconnect_after``: drop the connection after this many body bytes
+
+Every exchange is logged with its timings (``ttfb`` is time to first byte),
+so fetch latency and UI stalls can be measured against known conditions.
+Point the ``network`` stub at a running server with ``network.route`` (the
+``standin_server`` test fixture and ``run_app.py --net`` do this).
+
+Usage: ``python tools/netserver.py --preset conference``
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import ssl
+import threading
+import time
+from dataclasses import dataclass, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Self
+from urllib.parse import urlsplit
+
+PAYLOADS = Path(__file__).resolve().parents[1] / "tests" / "payloads"
+MANIFEST = PAYLOADS / "manifest.json"
+# self-signed certificate (and key) valid for every routed hostname
+CERTFILE = PAYLOADS / "standin.pem"
+# body bytes written per send when no chunking or bandwidth cap applies
+WRITE_SIZE = 4096
+# a bandwidth-capped body is paced in slices of this many seconds
+PACE_SECONDS = 0.02
+
+
+@dataclass(frozen=True)
+class Shaping:
+    """Network conditions applied to every response."""
+
+    latency: float = 0.0
+    bandwidth: int | None = None
+    chunk_size: int | None = None
+    disconnect_after: int | None = None
+
+
+PRESETS = {
+    "lan": Shaping(),
+    "conference": Shaping(latency=0.3, bandwidth=24_000, chunk_size=1024),
+    "flaky": Shaping(latency=0.8, bandwidth=6_000, chunk_size=512, disconnect_after=4096),
+}
+
+
+@dataclass
+class Route:
+    """A recorded payload served for ``host`` paths matching ``path`` (a glob)."""
+
+    host: str
+    path: str
+    body: bytes
+    content_type: str = "application/octet-stream"
+    # how the real service chunks this response (None: Content-Length)
+    chunk_size: int | None = None
+    status: int = 200
+
+    def matches(self, host: str, path: str) -> bool:
+        return host == self.host and fnmatch.fnmatchcase(path, self.path)
+
+
+@dataclass
+class Exchange:
+    """One request served by the stand-in, with ``time.perf_counter`` stamps."""
+
+    host: str
+    path: str
+    status: int
+    started: float
+    first_byte: float | None = None
+    finished: float | None = None
+    sent: int = 0
+    disconnected: bool = False
+
+    @property
+    def ttfb(self) -> float | None:
+        return None if self.first_byte is None else self.first_byte - self.started
+
+    @property
+    def duration(self) -> float | None:
+        return None if self.finished is None else self.finished - self.started
+
+
+def load_routes(manifest: Path | str = MANIFEST) -> list[Route]:
+    """Routes described by a payload manifest (files relative to it)."""
+    manifest = Path(manifest)
+    spec = json.loads(manifest.read_text())
+    return [
+        Route(
+            host=entry["host"],
+            path=entry["path"],
+            body=(manifest.parent / entry["file"]).read_bytes(),
+            content_type=entry.get("type", "application/octet-stream"),
+            chunk_size=entry.get("chunk_size"),
+            status=entry.get("status", 200),
+        )
+        for entry in spec["routes"]
+    ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "BadgeStandIn/1.0"
+
+    def do_GET(self):
+        self.server.standin._respond(self)
+
+    def log_message(self, format, *args):  # keep test output quiet
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    standin: StandInServer
+
+
+class StandInServer:
+    """Serve ``routes`` on loopback over HTTP and HTTPS until ``stop()``."""
+
+    def __init__(self, routes: list[Route] | None = None, shaping: Shaping | None = None,
+                 certfile: Path | str = CERTFILE, host: str = "127.0.0.1"):
+        self.routes = load_routes() if routes is None else routes
+        self.shaping = shaping or Shaping()
+        self.certfile = str(certfile)
+        self.host = host
+        self.log: list[Exchange] = []
+        self._lock = threading.Lock()
+        self._servers: dict[str, _Server] = {}
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def hosts(self) -> set[str]:
+        return {route.host for route in self.routes}
+
+    @property
+    def http_address(self) -> tuple[str, int]:
+        host, port = self._servers["http"].server_address[:2]
+        return str(host), port
+
+    @property
+    def https_address(self) -> tuple[str, int]:
+        host, port = self._servers["https"].server_address[:2]
+        return str(host), port
+
+    def start(self) -> Self:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(self.certfile)
+        for scheme in ("http", "https"):
+            httpd = _Server((self.host, 0), _Handler)
+            httpd.standin = self
+            if scheme == "https":
+                # handshake in the request thread, not the accept loop
+                httpd.socket = context.wrap_socket(httpd.socket, server_side=True, do_handshake_on_connect=False)
+            thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), name=f"standin-{scheme}", daemon=True)
+            thread.start()
+            self._servers[scheme] = httpd
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        for httpd in self._servers.values():
+            httpd.shutdown()
+            httpd.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._servers.clear()
+        self._threads.clear()
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def shape(self, **changes) -> None:
+        """Change the network conditions for subsequent requests."""
+        self.shaping = replace(self.shaping, **changes)
+
+    # --- serving -------------------------------------------------------
+    def _match(self, host: str, path: str) -> Route | None:
+        for route in self.routes:
+            if route.matches(host, path):
+                return route
+        return None
+
+    def _respond(self, handler: BaseHTTPRequestHandler) -> None:
+        host = (handler.headers.get("Host") or "").split(":", 1)[0].lower()
+        path = urlsplit(handler.path).path
+        route = self._match(host, path)
+        status = route.status if route else 404
+        exchange = Exchange(host, path, status, time.perf_counter())
+        with self._lock:
+            self.log.append(exchange)
+
+        shaping = self.shaping
+        if shaping.latency:
+            time.sleep(shaping.latency)
+        body = route.body if route else b"not found"
+        chunk_size = shaping.chunk_size or (route.chunk_size if route else None)
+        if handler.request_version < "HTTP/1.1":
+            chunk_size = None  # HTTP/1.0 clients cannot decode chunks
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", route.content_type if route else "text/plain")
+        if chunk_size:
+            handler.send_header("Transfer-Encoding", "chunked")
+        else:
+            handler.send_header("Content-Length", str(len(body)))
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+        handler.close_connection = True
+        exchange.first_byte = time.perf_counter()
+
+        try:
+            self._send_body(handler, body, chunk_size, shaping, exchange)
+        except (BrokenPipeError, ConnectionResetError, ssl.SSLError):
+            exchange.disconnected = True
+        exchange.finished = time.perf_counter()
+
+    def _send_body(self, handler, body: bytes, chunk_size: int | None, shaping: Shaping, exchange: Exchange) -> None:
+        limit = shaping.disconnect_after
+        if shaping.bandwidth:
+            step = chunk_size or max(1, int(shaping.bandwidth * PACE_SECONDS))
+        else:
+            step = chunk_size or WRITE_SIZE
+        began = time.perf_counter()
+        for start in range(0, len(body), step):
+            piece = body[start:start + step]
+            if limit is not None and exchange.sent + len(piece) > limit:
+                piece = piece[:limit - exchange.sent]
+            data = b"%x\r\n%s\r\n" % (len(piece), piece) if chunk_size else piece
+            handler.wfile.write(data)
+            exchange.sent += len(piece)
+            if limit is not None and exchange.sent >= limit:
+                exchange.disconnected = True
+                self._drop(handler)
+                return
+            if shaping.bandwidth:
+                # sleep until this much of the body is due at the capped rate
+                delay = began + exchange.sent / shaping.bandwidth - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        if chunk_size:
+            handler.wfile.write(b"0\r\n\r\n")
+
+    @staticmethod
+    def _drop(handler) -> None:
+        # close without finishing the body (or TLS close_notify)
+        try:
+            handler.connection.shutdown(2)
+        except OSError:
+            pass
+
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded badge network payloads locally.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="lan", help="network conditions (default: lan)")
+    parser.add_argument("--latency", type=float, help="seconds before each response starts")
+    parser.add_argument("--bandwidth", type=int, help="cap in bytes per second")
+    parser.add_argument("--chunk-size", type=int, help="send bodies chunked in pieces of this many bytes")
+    parser.add_argument("--disconnect-after", type=int, help="drop connections after this many body bytes")
+    return parser.parse_args(argv)
+
+
+def shaping_from_args(args) -> Shaping:
+    """The ``--preset`` shaping with any explicit overrides applied."""
+    changes = {
+        name: getattr(args, name)
+        for name in ("latency", "bandwidth", "chunk_size", "disconnect_after")
+        if getattr(args, name, None) is not None
+    }
+    return replace(PRESETS[args.preset], **changes)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    server = StandInServer(shaping=shaping_from_args(args)).start()
+    print(f"http  on {server.http_address[0]}:{server.http_address[1]}")
+    print(f"https on {server.https_address[0]}:{server.https_address[1]} (cert {server.certfile})")
+    print("hosts: " + ", ".join(sorted(server.hosts)))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        for ex in server.log:
+            ttfb = f"{ex.ttfb * 1000:.0f}ms" if ex.ttfb is not None else "-"
+            print(f"{ex.status} {ex.host}{ex.path} ttfb={ttfb} sent={ex.sent}{' (dropped)' if ex.disconnected else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
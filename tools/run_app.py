@@ -2,7 +2,7 @@
 Desktop runner for badge apps using the test stubs, with a simple visual screen and interactive buttons.
 
 - Uses tests/_stubs/badgeware to emulate the badgeware API
-- Provides a Tkinter window to visualize drawing (text and simple shapes)
+- Apps rasterize into the stub's 160x120 RGBA framebuffer, shown in a Tkinter window
 - Calls app.update() in a loop
 - Maps keyboard keys to io.BUTTON_* (A/B/C and arrows)
 - Adds clickable on-screen buttons for A, B, C, Up, Down
@@ -13,39 +13,88 @@ Press ESC in the console to quit (or close the window).
 Usage:
     python tools/run_app.py badge.apps.hc911
     python tools/run_app.py badge.apps.wifi
+    python tools/run_app.py --reload --keep-state badge.apps.life   # hot reload on save
+
+Fast-forward (10 simulated frames per real frame period, io.ticks stays consistent):
+    python tools/run_app.py --time-scale 10 badge.apps.life
+
+Headless benchmark (no window, simulated clock, as fast as the CPU allows):
+    python tools/run_app.py --headless --frames 100000 badge.apps.life
+    python tools/run_app.py --headless --profile badge.apps.life   # draw calls per frame
+    python tools/run_app.py --headless --overdraw badge.apps.commits   # wasted drawing
+    python tools/run_app.py --headless --memory badge.apps.monapet   # 512 KB SRAM budget
+
+In a browser instead of a Tk window (--web-host 0.0.0.0 to open it from a phone):
+    python tools/run_app.py --web 8000 badge.apps.life
+
+Record a play session, then replay the exact same input headlessly:
+    python tools/run_app.py --record session.trace badge.apps.flappy
+    python tools/run_app.py --replay session.trace badge.apps.flappy
+
+Drive the app from a test or script over a JSON-lines socket (see tools/control_socket.py):
+    python tools/run_app.py --control 7007 badge.apps.life
+
+Offline network (recorded payloads from a local server, shaped like conference WiFi):
+    python tools/run_app.py --net conference badge.apps.hc911
 """
 from __future__ import annotations
 
+import argparse
+import asyncio
 import importlib
+import importlib.util
 import sys
 import time
+from pathlib import Path
 from types import ModuleType
 
 # Ensure repo root and test stubs are importable
-from pathlib import Path
-REPO = Path(__file__).resolve().parents[1]
-STUBS = REPO / "tests" / "_stubs"
-if str(STUBS) not in sys.path:
-    sys.path.insert(0, str(STUBS))
-if str(REPO) not in sys.path:
-    sys.path.insert(0, str(REPO))
-
-# Now we can import the stubbed badgeware (module object)
+import stub_paths  # noqa: F401
+
+# isort: split
+
+# Now we can import the stubbed badgeware (module object), the network and
+# socket stubs (so WiFi and HC911 work with real network on desktop) and the
+# desktop helpers that live next to this script
+import socket  # type: ignore
+
 import badgeware as bw  # type: ignore
+import headless
+import network  # type: ignore
+from app_loader import AppLoader
+from async_loop import AsyncLoop
+from badgeware._framebuffer import Framebuffer  # type: ignore
+from badgeware._image import image_cache  # type: ignore
+from badgeware._memory import DEVICE_BUDGET, BudgetExceeded, MemoryBudget  # type: ignore
+from badgeware._overdraw import OverdrawAnalyzer  # type: ignore
+from badgeware._paths import vfs  # type: ignore
+from badgeware._profiler import Profiler  # type: ignore
+from control_socket import Controller, ControlServer
+from frame_export import FrameExporter, open_encoder
+from framebuffer_view import FramebufferView
+from hot_reload import AppReloader
+from input_trace import InputTrace
+from netserver import PRESETS
+from web_view import WebView
+
 io = bw.io  # shorthand
 
-# Also ensure network and socket are available from stubs
-# This allows WiFi and HC911 apps to work with real network on desktop
-import network  # type: ignore
-import socket  # type: ignore
+# Apps chdir into /system/apps/<name> and read /system/assets; map those
+# onto the repo (writes go to $BADGE_ROOT) for badge code only
+vfs.install()
+
 sys.modules['network'] = network
 sys.modules['socket'] = socket
+# Badge code's socket/ssl/urllib.urequest go through network.route
+network.install()
 
 # Import secrets and make it available for apps that import from root
 # Apps try to do: sys.path.insert(0, "/"); from secrets import ...
 try:
     from badge import secrets  # type: ignore
     sys.modules['secrets'] = secrets
+    # the desktop "radio" can see the configured network
+    network.visible_ssids.append(secrets.WIFI_SSID)
     print(f"Loaded WiFi credentials: SSID='{secrets.WIFI_SSID}'")
 except Exception as e:
     print(f"Warning: Could not load secrets: {e}")
@@ -57,11 +106,16 @@ except Exception as e:
     sys.modules['secrets'] = _Secrets
 
 # Default app
-APP_MODULE = sys.argv[1] if len(sys.argv) > 1 else "badge.apps.hc911"
+DEFAULT_APP = "badge.apps.hc911"
 
 
 def _load_app(modname: str) -> ModuleType:
-    mod = importlib.import_module(modname)
+    package, _, name = modname.rpartition(".")
+    if package == loader.package:
+        # apps import siblings by bare name ("ui", "mona") from their directory
+        mod = loader.activate(name)
+    else:
+        mod = importlib.import_module(modname)
     if not hasattr(mod, "update"):
         raise RuntimeError(f"Module {modname} has no update()")
     return mod
@@ -75,98 +129,13 @@ pressed_queue: set[int] = set()
 held_keys: set[int] = set()
 
 
-def _to_hex(color):
-    # Accept (r,g,b[,a]) tuple from brushes.color
-    if not isinstance(color, (tuple, list)):
-        return "#ffffff"
-    r, g, b = int(color[0]), int(color[1]), int(color[2])
-    return f"#{r:02x}{g:02x}{b:02x}"
-
-
 try:
     import tkinter as tk  # type: ignore
 except Exception:  # pragma: no cover - optional
     tk = None
 
-
-class _VisualShape:
-    def __init__(self, kind: str, *args):
-        self.kind = kind
-        self.args = args
-
-
-class VisualShapes:
-    def circle(self, x: int, y: int, r: int):
-        return _VisualShape("circle", x, y, r)
-
-    def rectangle(self, x: int, y: int, w: int, h: int):
-        return _VisualShape("rectangle", x, y, w, h)
-
-
-class VisualScreen:
-    def __init__(self, canvas, x=0, y=0, w=WIDTH, h=HEIGHT, scale=SCALE):
-        self.width = w
-        self.height = h
-        self._canvas = canvas
-        self._origin_x = x
-        self._origin_y = y
-        self._scale = scale
-        self.brush = bw.brushes.color(255, 255, 255)
-        self.font = None
-
-    def _sx(self, x):
-        return (self._origin_x + x) * self._scale
-
-    def _sy(self, y):
-        return (self._origin_y + y) * self._scale
-
-    def draw(self, shape: _VisualShape):
-        if tk is None or not isinstance(shape, _VisualShape):
-            return None
-        color = _to_hex(self.brush)
-        if shape.kind == "circle":
-            x, y, r = shape.args
-            x0, y0 = self._sx(x - r), self._sy(y - r)
-            x1, y1 = self._sx(x + r), self._sy(y + r)
-            self._canvas.create_oval(x0, y0, x1, y1, outline=color, fill=color)
-        elif shape.kind == "rectangle":
-            x, y, w, h = shape.args
-            self._canvas.create_rectangle(self._sx(x), self._sy(y), self._sx(x + w), self._sy(y + h), outline=color, fill=color)
-        return None
-
-    def clear(self):
-        if tk is None:
-            return None
-        # fill with current brush color
-        self._canvas.delete("all")
-        self._canvas.create_rectangle(0, 0, self._sx(self.width), self._sy(self.height), outline=_to_hex(self.brush), fill=_to_hex(self.brush))
-        return None
-
-    def text(self, text: str, x: int, y: int):
-        if tk is None:
-            return None
-        self._canvas.create_text(self._sx(x), self._sy(y), anchor="nw", text=str(text), fill=_to_hex(self.brush), font=("TkFixedFont", 8 * self._scale // 2))
-        return None
-
-    def measure_text(self, text: str):
-        # simple fixed-size metrics (unscaled units)
-        return (max(0, len(text)) * 6, 10)
-
-    def blit(self, _img, x: int, y: int):
-        # draw a placeholder rectangle for images
-        self._canvas.create_rectangle(self._sx(x), self._sy(y), self._sx(x + 16), self._sy(y + 16), outline=_to_hex(self.brush))
-        return None
-
-    def scale_blit(self, _img, x: int, y: int, w: int, h: int):
-        self._canvas.create_rectangle(self._sx(x), self._sy(y), self._sx(x + w), self._sy(y + h), outline=_to_hex(self.brush))
-        return None
-
-    def window(self, x, y, w, h):
-        # Return a view into the same canvas with offset
-        return VisualScreen(self._canvas, self._origin_x + x, self._origin_y + y, w, h, self._scale)
-
-    def load_into(self, _filename: str):
-        return None
+# Keeps each app's sibling modules importable and separate (see --also)
+loader = AppLoader()
 
 
 def _windows_key_input():
@@ -280,38 +249,212 @@ def _print_state(mod: ModuleType):
         print("[state] ", ", ".join(fields))
 
 
-def main():
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a badge app on the desktop using the test stubs.")
+    parser.add_argument("app", nargs="?", default=DEFAULT_APP, help=f"app module to run (default: {DEFAULT_APP})")
+    parser.add_argument("--headless", action="store_true", help="run without a window as fast as possible and report timings")
+    parser.add_argument("--frames", type=int, default=1000, help="frames to run in headless mode (default: 1000)")
+    parser.add_argument("--frame-ms", type=int, default=33, help="simulated milliseconds per frame (default: 33)")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="simulated seconds per real second, e.g. 10 to fast-forward (default: 1)")
+    parser.add_argument("--reload", action="store_true", help="reload the app when its files change")
+    parser.add_argument("--keep-state", action="store_true", help="with --reload, keep the app's global state across reloads")
+    parser.add_argument("--export", metavar="PATH", help="capture every simulated frame to a .gif or a video file (ffmpeg)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for random so runs are repeatable (default: 0)")
+    parser.add_argument("--record", metavar="PATH", help="record per-frame input and the seed to a trace file")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recorded trace headlessly (implies --headless)")
+    parser.add_argument("--profile", action="store_true", help="count draw calls per frame and print update() histograms")
+    parser.add_argument("--overdraw", action="store_true", help="analyze overdraw and redundant draws in headless mode")
+    parser.add_argument("--memory", action="store_true", help="trace heap use in headless mode and fail over --memory-budget")
+    parser.add_argument("--memory-budget", metavar="KB", type=int, help="heap budget for --memory (default: the badge's 512 KB SRAM)")
+    parser.add_argument("--net", choices=sorted(PRESETS), help="serve the apps' web services locally under these network conditions")
+    parser.add_argument("--also", metavar="APP", action="append", default=[], help="run another app concurrently on the same loop (network stress; repeatable)")
+    parser.add_argument("--web", metavar="PORT", type=int, help="show the badge in a browser on this port instead of a Tk window")
+    parser.add_argument("--control", metavar="PORT", type=int, help="pause the app and drive it from a JSON-lines control socket on this port")
+    parser.add_argument("--web-host", default="127.0.0.1", help="address for --web (default: 127.0.0.1; 0.0.0.0 to open it from a phone on the LAN)")
+    args = parser.parse_args(argv)
+    if args.also and (args.headless or args.replay):
+        parser.error("--also runs on the window loop, not with --headless/--replay")
+    if args.web is not None and (args.headless or args.replay):
+        parser.error("--web runs on the window loop, not with --headless/--replay")
+    if args.control is not None and (args.headless or args.replay or args.also or args.web is not None):
+        parser.error("--control drives the app itself; it does not combine with --headless/--replay/--also/--web")
+    if (args.overdraw or args.memory) and not (args.headless or args.replay):
+        parser.error("--overdraw/--memory require --headless (or --replay)")
+    if args.memory_budget is not None and not args.memory:
+        parser.error("--memory-budget sets the budget for --memory")
+    if args.memory_budget is None:
+        args.memory_budget = DEVICE_BUDGET // 1024
+    return args
+
+
+def _run_headless(args) -> None:
+    inputs = None
+    if args.replay:
+        # the trace carries the seed and frame length of the recorded session
+        trace = InputTrace.load(args.replay)
+        args.seed, args.frame_ms, args.frames = trace.seed, trace.frame_ms, len(trace)
+        inputs = trace.inputs()
+    # Seed before importing: several apps randomize their state at import time
+    headless.seed(args.seed)
+    budget = None
+    if args.memory:
+        # trace from before the import so sprite sheets loaded at import count
+        spec = importlib.util.find_spec(args.app)
+        if spec is None or spec.origin is None:
+            raise SystemExit(f"No module named {args.app!r}")
+        app_dir = Path(spec.origin).parent
+        budget = MemoryBudget(app_dir, args.memory_budget * 1024).install()
+    try:
+        mod = _load_app(args.app)
+        if budget is not None:
+            budget.end_frame("import")
+    except BudgetExceeded as exc:
+        _budget_failed(budget, exc)
+    update = mod.update
+    profiler = None
+    if args.profile:
+        profiler = Profiler().install()
+        update = profiler.wrap(update, args.app)
+    overdraw = None
+    if args.overdraw:
+        overdraw = OverdrawAnalyzer().install()
+        update = overdraw.wrap(update)
+    source = f"replaying {args.replay}" if args.replay else "headless"
+    print(f"Running {args.app} {source} for {args.frames} frames (seed={args.seed}, {args.frame_ms}ms/frame)")
+    if budget is not None:
+        update = budget.wrap(update)
+    try:
+        stats = headless.run_headless(update, io, args.frames, args.frame_ms, inputs)
+    except BudgetExceeded as exc:
+        _budget_failed(budget, exc)
+    print(f"[bench] {stats.summary()}")
+    print(f"[images] {image_cache.summary()}")
+    if profiler is not None:
+        profiler.uninstall()
+        print(profiler.report())
+    if overdraw is not None:
+        overdraw.uninstall()
+        print(overdraw.report())
+    if budget is not None:
+        budget.uninstall()
+        print(f"[memory] {budget.report()}")
+    _print_state(mod)
+
+
+def _run_controlled(args) -> None:
+    headless.seed(args.seed)
+    mod = _load_app(args.app)
+    controller = Controller(mod, io, bw.screen.framebuffer, args.frame_ms)
+    server = ControlServer(controller, port=args.control).start()
+    host, port = server.address
+    print(f"Control socket for {args.app} on {host}:{port} (JSON lines; send {{\"cmd\": \"quit\"}} to stop)")
+    try:
+        server.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"[control] {controller.frames} frames stepped")
+    _print_state(mod)
+
+
+def _budget_failed(budget, exc) -> None:
+    budget.uninstall()
+    print(f"[memory] {budget.report()}")
+    raise SystemExit(f"[memory] over budget: {exc}")
+
+
+def _start_standin(preset: str):
+    """Serve recorded payloads locally and route the apps' hostnames to them."""
+    from netserver import StandInServer
+
+    server = StandInServer(shaping=PRESETS[preset]).start()
+    for host in server.hosts:
+        network.route(host, 80, server.http_address)
+        network.route(host, 443, server.https_address, cafile=server.certfile)
+    print(f"Network: {', '.join(sorted(server.hosts))} served locally ({preset})")
+    return server
+
+
+def _report_standin(server) -> None:
+    server.stop()
+    network.unroute()
+    for ex in server.log:
+        ttfb = f"{ex.ttfb * 1000:.0f}ms" if ex.ttfb is not None else "-"
+        dropped = " dropped" if ex.disconnected else ""
+        print(f"  {ex.status} {ex.host}{ex.path}: ttfb {ttfb}, {ex.sent} bytes{dropped}")
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    standin = _start_standin(args.net) if args.net else None
+    try:
+        _run(args)
+    finally:
+        if standin is not None:
+            _report_standin(standin)
+
+
+def _run(args):
+    if args.headless or args.replay:
+        _run_headless(args)
+        return
+    if args.control is not None:
+        _run_controlled(args)
+        return
+
+    APP_MODULE = args.app
+
     # Set up Tk window if available
     root = None
-    canvas = None
-    if tk is not None:
+    view = None
+    if tk is not None and args.web is None:
         root = tk.Tk()
         root.title(f"UniverseBadge Emulator - {APP_MODULE}")
-        canvas = tk.Canvas(root, width=WIDTH * SCALE, height=HEIGHT * SCALE, bg="#0d1117")
-        canvas.pack()
+        # Apps rasterize into the stub framebuffer; the view presents it once per frame
+        view = FramebufferView(root, bw.screen.framebuffer, SCALE, bg="#0d1117").pack()
         _tk_bind_keys(root)
-        frm, hold_up_var, hold_down_var = _tk_controls(root)
+        _frm, hold_up_var, hold_down_var = _tk_controls(root)
 
-    # Patch badgeware screen & shapes with visual versions if we have a canvas
-    if canvas is not None:
-        bw.screen = VisualScreen(canvas)
-        bw.shapes = VisualShapes()
+    trace = None
+    if args.record:
+        # Recorded sessions are seeded so a replay sees the same random state
+        headless.seed(args.seed)
+        trace = InputTrace(args.seed, args.frame_ms)
 
     mod = _load_app(APP_MODULE)
-
-    print(f"Running {APP_MODULE}. Press ESC to quit. Keys: A/B/C, arrows.")
-    last_print = 0.0
-    try:
-        while True:
-            # Update ticks
-            io.ticks += 33
-
-            # Handle keys
-            io.pressed.clear()
-            # Prefer Tk bindings if available; otherwise use console keys
-            if root is not None:
-                # Update held from toggles
-                try:
+    update = mod.update
+    profiler = None
+    if args.profile:
+        profiler = Profiler().install()
+        update = profiler.wrap(update, APP_MODULE)
+    reloader = AppReloader(mod, keep_state=args.keep_state) if args.reload else None
+
+    print(f"Running {APP_MODULE} at {args.time_scale:g}x. Press ESC to quit. Keys: A/B/C, arrows.")
+    runner = AsyncLoop(args.frame_ms, args.time_scale)
+    # the window shows the last frame update() finished, never one in progress
+    shown = Framebuffer(bw.screen.framebuffer.width, bw.screen.framebuffer.height)
+    if view is not None:
+        view.framebuffer = shown
+    web = None
+    if args.web is not None:
+        web = WebView(shown, args.web_host, args.web).start()
+        print(f"Serving the badge at {web.url}")
+    exporter = None
+    if args.export:
+        exporter = FrameExporter(open_encoder(args.export, shown.width, shown.height, args.frame_ms))
+
+    def read_input():
+        # Handle keys
+        io.pressed.clear()
+        if web is not None:
+            for name, action in web.drain_input():
+                _web_input(name, action)
+        # Prefer Tk bindings (or the browser) if available; otherwise use console keys
+        if root is not None or web is not None:
+            # Update held from toggles
+            try:
+                if root is not None:
                     if hold_up_var and hold_up_var.get():
                         held_keys.add(io.BUTTON_UP)
                     else:
@@ -320,40 +463,101 @@ def main():
                         held_keys.add(io.BUTTON_DOWN)
                     else:
                         held_keys.discard(io.BUTTON_DOWN)
-                except Exception:
-                    pass
-                # Transfer queued button presses for this frame
-                if pressed_queue:
-                    io.pressed.update(pressed_queue)
-                    pressed_queue.clear()
-                # Apply held keys as repeated presses
-                if held_keys:
-                    io.held = set(held_keys)
-                    io.pressed.update(held_keys)
-                else:
-                    io.held = set()
+            except Exception:
+                pass
+            # Transfer queued button presses for this frame
+            if pressed_queue:
+                io.pressed.update(pressed_queue)
+                pressed_queue.clear()
+            # Apply held keys as repeated presses
+            if held_keys:
+                io.held = set(held_keys)
+                io.pressed.update(held_keys)
             else:
-                if not _windows_key_input():
-                    break
-
-            # Run one update frame
-            mod.update()
+                io.held = set()
+        elif not _windows_key_input():
+            runner.stop()
+
+        if trace is not None:
+            trace.record(io.pressed, io.held)
+
+    def capture():
+        shown.pixels[:] = bw.screen.framebuffer.pixels
+        # one exported frame per simulated frame, however often the window shows
+        if exporter is not None:
+            exporter.submit(shown.pixels)
+
+    app = runner.add(APP_MODULE, update, io, before_update=read_input, after_update=capture)
+    # extra apps share the loop (and the screen) to load the network concurrently
+    for name in args.also:
+        runner.add(name, _load_app(name).update, io)
+    if args.also:
+        # the main app's siblings are the ones left in sys.modules
+        _load_app(APP_MODULE)
 
-            # Update the window
-            if root is not None:
-                root.update_idletasks()
-                root.update()
+    last_print = 0.0
 
-            # Print state once per second
-            now = time.time()
-            if now - last_print > 1.0:
-                last_print = now
-                _print_state(mod)
+    def present():
+        nonlocal update, last_print
+        # Update the window once per pass, however many frames ran
+        if root is not None:
+            view.present()
+            root.update_idletasks()
+            root.update()
+        if web is not None:
+            web.present()
+
+        # Pick up edits to the app without restarting (framebuffer is kept)
+        if reloader is not None and not app.busy and reloader.poll():
+            update = mod.update
+            if profiler is not None:
+                update = profiler.wrap(update, APP_MODULE)
+            app.update = update
+
+        # Print state once per second
+        now = time.time()
+        if now - last_print > 1.0:
+            last_print = now
+            _print_state(mod)
+            for stats in (a.stats for a in runner.apps):
+                if stats.stalled:
+                    print(f"[stall] {stats.name}: {stats.stalled} frames, longest {stats.longest_stall}")
+            if runner.scheduler.dropped:
+                print(f"[sched] frames={runner.scheduler.frames} dropped={runner.scheduler.dropped}")
 
-            # Frame delay ~30 FPS
-            time.sleep(0.033)
+    try:
+        asyncio.run(runner.run(present=present))
     except KeyboardInterrupt:
         pass
+    finally:
+        for task in runner.apps:
+            print(task.stats.summary())
+        if trace is not None:
+            trace.save(args.record)
+            print(f"Recorded {len(trace)} frames to {args.record}")
+        if exporter is not None:
+            exporter.close()
+            print(f"[export] {args.export}: {exporter.summary()}")
+        if profiler is not None:
+            profiler.uninstall()
+            print(profiler.report())
+        if web is not None:
+            web.stop()
+            print(f"[web] {web.summary()}")
+
+
+def _web_input(name: str, action: str) -> None:
+    """Apply a browser button event like the matching Tk binding would."""
+    fallback = {"LEFT": io.BUTTON_UP, "RIGHT": io.BUTTON_DOWN}.get(name)
+    button = getattr(io, f"BUTTON_{name}", fallback)
+    if button is None:
+        return
+    if action == "press":
+        pressed_queue.add(button)
+    elif action == "down":
+        held_keys.add(button)
+    else:
+        held_keys.discard(button)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,16 @@
+"""
+Puts the repo root and the test stubs (tests/_stubs) on ``sys.path``.
+
+The desktop runners import this before ``badgeware``, ``network`` and the
+``badge`` package, so those resolve to the stubs and the repo checkout.
+"""
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+STUBS = REPO / "tests" / "_stubs"
+
+# the repo root ends up first, ahead of the stubs
+for path in (STUBS, REPO):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
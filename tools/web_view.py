@@ -0,0 +1,390 @@
+"""
+Browser presenter for the stub badgeware framebuffer.
+
+For machines without a usable Tk (build boxes, remote dev machines) or to
+show the badge on a phone: ``WebView`` serves a small HTML page from a
+stdlib HTTP server and streams frames to it over one long-lived response.
+Button presses come back as ``POST /input`` and are queued until the loop
+collects them with ``drain_input()``.
+
+Each frame is sent as a delta against the last frame that client received:
+the ``dirty_rects`` of the change, each carrying the XOR of the old and new
+RGB bytes, run-length encoded. Unchanged pixels XOR to zero and collapse
+into runs, so a frame where a few rows change costs a few hundred bytes and
+a static screen costs nothing. A client that connects (or falls behind)
+gets a delta against black, i.e. a full frame.
+
+Stream format, little-endian, one message per frame::
+
+    u32 length of the rest of the message
+    u16 rect count, then per rect u16 x0, y0, x1, y1
+    per rect, RLE of (x1 - x0) * (y1 - y0) * 3 XOR bytes:
+        control byte c < 0x80: c + 1 literal bytes follow
+        control byte c >= 0x80: (c & 0x7f) + 1 zero bytes
+"""
+from __future__ import annotations
+
+import json
+import re
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Self
+
+from framebuffer_view import dirty_rects
+
+# longest run one RLE control byte describes
+MAX_RUN = 128
+# shorter zero runs are cheaper inside a literal than split around it
+_ZERO_RUN = re.compile(rb"\x00{3,}")
+BUTTONS = ("A", "B", "C", "UP", "DOWN", "LEFT", "RIGHT")
+
+
+def _rgb(pixels, width: int, rect) -> bytes:
+    x0, y0, x1, y1 = rect
+    stride = width * 4
+    rgb = bytearray()
+    for y in range(y0, y1):
+        rgb += pixels[y * stride + x0 * 4:y * stride + x1 * 4]
+    del rgb[3::4]
+    return bytes(rgb)
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+def _literal(out: bytearray, data: bytes) -> None:
+    for start in range(0, len(data), MAX_RUN):
+        piece = data[start:start + MAX_RUN]
+        out.append(len(piece) - 1)
+        out += piece
+
+
+def rle(data: bytes) -> bytes:
+    """Run-length encode ``data``, collapsing runs of zero bytes."""
+    out = bytearray()
+    pos = 0
+    for run in _ZERO_RUN.finditer(data):
+        _literal(out, data[pos:run.start()])
+        zeros = run.end() - run.start()
+        while zeros:
+            step = min(zeros, MAX_RUN)
+            out.append(0x80 | (step - 1))
+            zeros -= step
+        pos = run.end()
+    _literal(out, data[pos:])
+    return bytes(out)
+
+
+def encode_delta(previous, current, width: int, height: int) -> bytes:
+    """Return the stream message turning ``previous`` into ``current`` (RGBA).
+
+    ``previous=None`` encodes the whole frame against black.
+    """
+    if previous is None:
+        previous = bytes(len(current))
+        rects = [(0, 0, width, height)]
+    else:
+        rects = dirty_rects(previous, current, width, height)
+    body = bytearray(struct.pack("<H", len(rects)))
+    for rect in rects:
+        body += struct.pack("<4H", *rect)
+    for rect in rects:
+        body += rle(_xor(_rgb(previous, width, rect), _rgb(current, width, rect)))
+    return struct.pack("<I", len(body)) + body
+
+
+def apply_delta(pixels: bytearray, width: int, message: bytes) -> list[tuple[int, int, int, int]]:
+    """Apply one stream message (without its length prefix) to RGBA ``pixels``.
+
+    This is what the page's script does; it returns the rectangles touched.
+    """
+    (count,) = struct.unpack_from("<H", message)
+    rects = [struct.unpack_from("<4H", message, 2 + 8 * i) for i in range(count)]
+    pos = 2 + 8 * count
+    for x0, y0, x1, y1 in rects:
+        xor = bytearray()
+        total = (x1 - x0) * (y1 - y0) * 3
+        while len(xor) < total:
+            control = message[pos]
+            pos += 1
+            if control & 0x80:
+                xor += bytes((control & 0x7F) + 1)
+            else:
+                xor += message[pos:pos + control + 1]
+                pos += control + 1
+        span = (x1 - x0) * 3
+        for row, y in enumerate(range(y0, y1)):
+            start = (y * width + x0) * 4
+            line = xor[row * span:(row + 1) * span]
+            for i, value in enumerate(line):
+                if value:
+                    pixels[start + i // 3 * 4 + i % 3] ^= value
+    return rects
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "BadgeWebView/1.0"
+
+    def do_GET(self):
+        if self.path == "/frames":
+            self.server.view._stream(self)
+        elif self.path in ("/", "/index.html"):
+            body = PAGE.replace("__WIDTH__", str(self.server.view.framebuffer.width))
+            body = body.replace("__HEIGHT__", str(self.server.view.framebuffer.height)).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if self.path != "/input":
+            self.send_error(404)
+            return
+        try:
+            event = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)))
+            self.server.view._queue_input(event["button"], event["action"])
+        except (ValueError, KeyError, TypeError):
+            self.send_error(400)
+            return
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):  # keep the console for app output
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    view: WebView
+
+
+class WebView:
+    """Serve ``framebuffer`` to browsers until ``stop()``; call ``present()`` per frame."""
+
+    def __init__(self, framebuffer, host: str = "127.0.0.1", port: int = 0):
+        self.framebuffer = framebuffer
+        self.host = host
+        self.port = port
+        # bytes on the wire vs. what raw RGB frames would have cost
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.raw_bytes = 0
+        self._changed = threading.Condition()
+        self._frame: bytes | None = None
+        self._seq = 0
+        self._closed = False
+        # the last delta encoded, shared by clients at the same frame
+        self._cached: tuple[int, int, bytes] | None = None
+        self._input: list[tuple[str, str]] = []
+        self._httpd: _Server | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        if self._httpd is None:
+            raise RuntimeError("the web view is not running")
+        host, port = self._httpd.server_address[:2]
+        return str(host), port
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"http://{'localhost' if host in ('127.0.0.1', '0.0.0.0') else host}:{port}/"
+
+    def start(self) -> Self:
+        self._httpd = _Server((self.host, self.port), _Handler)
+        self._httpd.view = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, args=(0.05,), name="web-view", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def present(self) -> None:
+        """Publish the current frame to connected browsers if it changed."""
+        pixels = self.framebuffer.pixels
+        if self._frame is not None and self._frame == pixels:
+            return
+        with self._changed:
+            self._frame = bytes(pixels)
+            self._seq += 1
+            self._changed.notify_all()
+
+    def drain_input(self) -> list[tuple[str, str]]:
+        """Return and clear the ``(button, action)`` events received so far.
+
+        ``action`` is ``"press"`` (one frame), ``"down"`` or ``"up"`` (held).
+        """
+        with self._changed:
+            events, self._input = self._input, []
+        return events
+
+    def summary(self) -> str:
+        ratio = self.bytes_sent / self.raw_bytes * 100 if self.raw_bytes else 0.0
+        return f"frames={self.frames_sent} sent={self.bytes_sent / 1024:.1f}KB ({ratio:.1f}% of raw RGB)"
+
+    # --- serving -------------------------------------------------------
+    def _queue_input(self, button: str, action: str) -> None:
+        if button not in BUTTONS or action not in ("press", "down", "up"):
+            raise ValueError(f"unknown input {button!r} {action!r}")
+        with self._changed:
+            self._input.append((button, action))
+
+    def _delta(self, sent_seq: int, sent: bytes | None, seq: int, frame: bytes) -> bytes:
+        cached = self._cached
+        if cached is not None and cached[:2] == (sent_seq, seq):
+            return cached[2]
+        fb = self.framebuffer
+        message = encode_delta(sent, frame, fb.width, fb.height)
+        self._cached = (sent_seq, seq, message)
+        return message
+
+    def _stream(self, handler: BaseHTTPRequestHandler) -> None:
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/octet-stream")
+        handler.send_header("Cache-Control", "no-store")
+        handler.end_headers()
+        handler.close_connection = True
+        fb = self.framebuffer
+        sent_seq, sent = 0, None
+        while True:
+            with self._changed:
+                self._changed.wait_for(lambda last=sent_seq: self._closed or (self._frame is not None and self._seq != last))
+                if self._closed:
+                    return
+                seq, frame = self._seq, self._frame
+            if frame is None:
+                continue
+            message = self._delta(sent_seq, sent, seq, frame)
+            try:
+                handler.wfile.write(message)
+            except OSError:  # the page was closed or reloaded
+                return
+            with self._changed:
+                self.frames_sent += 1
+                self.bytes_sent += len(message)
+                self.raw_bytes += fb.width * fb.height * 3
+            sent_seq, sent = seq, frame
+
+
+PAGE = """<!doctype html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>UniverseBadge Emulator</title>
+<style>
+  body { background: #0d1117; color: #c9d1d9; font-family: sans-serif; margin: 0;
+         display: flex; flex-direction: column; align-items: center; }
+  canvas { width: min(96vw, 640px); image-rendering: pixelated; margin: 8px; }
+  .pad { display: flex; gap: 6px; flex-wrap: wrap; justify-content: center; }
+  button { min-width: 56px; min-height: 44px; font-size: 16px; touch-action: none; }
+</style>
+</head>
+<body>
+<canvas id="screen" width="__WIDTH__" height="__HEIGHT__"></canvas>
+<div class="pad">
+  <button data-hold="LEFT">Left</button><button data-hold="UP">Up</button>
+  <button data-hold="DOWN">Down</button><button data-hold="RIGHT">Right</button>
+  <button data-press="A">A</button><button data-press="B">B</button><button data-press="C">C</button>
+</div>
+<script>
+const W = __WIDTH__, H = __HEIGHT__;
+const ctx = document.getElementById("screen").getContext("2d");
+const image = ctx.createImageData(W, H);
+const px = image.data;
+
+function send(button, action) {
+  fetch("input", {method: "POST", body: JSON.stringify({button, action})});
+}
+
+function apply(msg) {
+  const view = new DataView(msg.buffer, msg.byteOffset, msg.byteLength);
+  const count = view.getUint16(0, true);
+  let p = 2 + count * 8;
+  for (let r = 0; r < count; r++) {
+    const x0 = view.getUint16(2 + r * 8, true), y0 = view.getUint16(4 + r * 8, true);
+    const x1 = view.getUint16(6 + r * 8, true), y1 = view.getUint16(8 + r * 8, true);
+    const w = x1 - x0, total = w * (y1 - y0) * 3;
+    let i = 0;
+    while (i < total) {
+      const c = msg[p++];
+      if (c & 0x80) { i += (c & 0x7f) + 1; continue; }
+      for (let k = 0; k <= c; k++, i++) {
+        const n = (i / 3) | 0;
+        px[((y0 + ((n / w) | 0)) * W + x0 + n % w) * 4 + i % 3] ^= msg[p++];
+      }
+    }
+  }
+  ctx.putImageData(image, 0, 0);
+}
+
+async function stream() {
+  // each connection starts from black; the first message is a full frame
+  for (let i = 0; i < px.length; i++) px[i] = i % 4 == 3 ? 255 : 0;
+  try {
+    const reader = (await fetch("frames")).body.getReader();
+    let buf = new Uint8Array(0);
+    for (;;) {
+      const {value, done} = await reader.read();
+      if (done) break;
+      const joined = new Uint8Array(buf.length + value.length);
+      joined.set(buf);
+      joined.set(value, buf.length);
+      buf = joined;
+      while (buf.length >= 4) {
+        const len = new DataView(buf.buffer, buf.byteOffset).getUint32(0, true);
+        if (buf.length < 4 + len) break;
+        apply(buf.subarray(4, 4 + len));
+        buf = buf.subarray(4 + len);
+      }
+    }
+  } catch (e) {}
+  setTimeout(stream, 1000);
+}
+
+for (const b of document.querySelectorAll("[data-press]")) {
+  b.addEventListener("pointerdown", () => send(b.dataset.press, "press"));
+}
+for (const b of document.querySelectorAll("[data-hold]")) {
+  b.addEventListener("pointerdown", () => send(b.dataset.hold, "down"));
+  for (const ev of ["pointerup", "pointerleave", "pointercancel"]) {
+    b.addEventListener(ev, () => send(b.dataset.hold, "up"));
+  }
+}
+const keys = {a: "A", b: "B", c: "C", ArrowUp: "UP", ArrowDown: "DOWN", ArrowLeft: "LEFT", ArrowRight: "RIGHT"};
+addEventListener("keydown", (e) => {
+  const button = keys[e.key.length == 1 ? e.key.toLowerCase() : e.key];
+  if (!button || e.repeat) return;
+  send(button, e.key.startsWith("Arrow") ? "down" : "press");
+  e.preventDefault();
+});
+addEventListener("keyup", (e) => {
+  if (keys[e.key] && e.key.startsWith("Arrow")) send(keys[e.key], "up");
+});
+stream();
+</script>
+</body>
+</html>
+"""